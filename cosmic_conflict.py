@@ -1,61 +1,2256 @@
 # Import required libraries
+import time    # For high-resolution timing of engine metrics
+STARTUP_MARKS = {"start": time.perf_counter()}  # Cold start phase marks
+
 import pygame  # Main game library
 import json    # For reading JSON files
 import random  # For random number generation
 import os      # For file system operations
+import sys     # For the command line entry point
+import subprocess  # For cold start benchmarks in a fresh interpreter
+import argparse    # For command line options
+import struct  # For packing input records
+import socket  # For network input sources
+import tracemalloc  # For memory benchmarks
+import sqlite3     # For the score database
+import threading   # For background workers
+import multiprocessing  # For encoder processes
+from multiprocessing import shared_memory  # For frames shared with encoder processes
+import queue       # For handing work to background workers
+import heapq       # For delayed datagrams on simulated network links
+import mmap        # For reading replay archives in place
+import gzip        # For compressed telemetry logs
+import tempfile    # For benchmark scratch files
+import shutil      # For finding a local video encoder
 from os import path  # For path manipulations
+from array import array  # Compact typed storage for effect tables
+from collections import deque  # Rolling frame statistics
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED  # For parallel asset loading
+np = None  # NumPy, imported by load_numpy() only when the vector enemy engine is used
+
+STARTUP_MARKS["imports"] = time.perf_counter()
+
+ROOT = path.dirname(path.abspath(__file__))  # Directory holding assets/ and data/
+
+def asset_path(relative):
+    """Returns the absolute path of a file shipped with the game."""
+    return path.join(ROOT, relative)
+
+def load_numpy():
+    """Imports the optional NumPy on first use; returns None when it isn't installed."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        np = numpy
+    return np
+
+def init_pygame(mode="play"):
+    """
+    Initialises only the pygame subsystems a mode needs.
+
+    Args:
+        mode (str): "play" for display and font, "headless" for none (logic and
+                    in-memory surfaces only; fonts initialise on first use)
+    """
+    if mode == "play":
+        pygame.display.init()
+        pygame.font.init()
+    elif mode != "headless":
+        raise ValueError(f"Unknown mode {mode!r}")
+
+def display_format(surface, alpha=True):
+    """Converts a surface to the display format when there is a display to match."""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+class LazyAsset():
+    """
+    Class attribute that loads its value on first access.
+    The loaded value then replaces the descriptor on the defining class, so later
+    reads are plain attribute lookups. Loads can also be started ahead of time on
+    a thread pool with preload(); the value is still finished (converted to the
+    display format) on the thread that first reads it.
+    """
+    REGISTRY = []  # (owner class, attribute name, kind) of every lazy asset
+    PRIORITY = ("MENU", "ARMOURY", "PLAY")  # States in the order their assets are needed
+
+    def __init__(self, loader, kind, state="PLAY"):
+        """
+        Args:
+            loader (callable): Returns the loaded value
+            kind (str): "font", "image" or "data"
+            state (str): First game state that needs the asset, one of PRIORITY
+        """
+        self.loader = loader
+        self.kind = kind
+        self.state = state
+        self.future = None  # Pending background load, if preloaded
+
+    def __set_name__(self, owner, name):
+        self.owner = owner
+        self.name = name
+        LazyAsset.REGISTRY.append((owner, name, self.kind))
+
+    def __get__(self, instance, owner):
+        value = self.future.result() if self.future else self.loader()
+        value = LazyAsset.finish(value)
+        setattr(self.owner, self.name, value)
+        return value
+
+    @staticmethod
+    def finish(value):
+        """Converts every surface in a loaded value (a surface, list or dict) to the display format."""
+        if isinstance(value, pygame.Surface):
+            return display_format(value)
+        if isinstance(value, list):
+            return [LazyAsset.finish(item) for item in value]
+        if isinstance(value, dict):
+            return {key: LazyAsset.finish(item) for key, item in value.items()}
+        return value
+
+    @staticmethod
+    def pending(kinds=None):
+        """Returns the descriptors not loaded yet, of the given kinds, in PRIORITY order."""
+        assets = [owner.__dict__[name] for owner, name, kind in LazyAsset.REGISTRY
+                  if isinstance(owner.__dict__.get(name), LazyAsset) and (kinds is None or kind in kinds)]
+        return sorted(assets, key=lambda asset: LazyAsset.PRIORITY.index(asset.state))
+
+    @staticmethod
+    def preload(pool, kinds=("image", "data")):
+        """
+        Starts loading every pending asset of the given kinds on a thread pool.
+        Fonts are left out: they load fast and SDL_ttf isn't thread safe.
+
+        Returns:
+            list: The descriptors being loaded, in PRIORITY order
+        """
+        assets = LazyAsset.pending(kinds)
+        for asset in assets:
+            if asset.future is None:
+                asset.future = pool.submit(asset.loader)
+        return assets
+
+    @staticmethod
+    def load_all(kind=None):
+        """Loads every pending asset, or only those of one kind."""
+        for owner, name, asset_kind in LazyAsset.REGISTRY:
+            if kind is None or asset_kind == kind:
+                getattr(owner, name)
 
-# initialise all pygame modules
-pygame.init()
+def load_image(relative):
+    """Loads an image shipped with the game."""
+    return pygame.image.load(asset_path(relative))
+
+def load_images(pattern, numbers):
+    """Loads a numbered image sequence, e.g. load_images("assets/misc/heart{}.png", range(1, 3))."""
+    return [load_image(pattern.format(i)) for i in numbers]
+
+def load_font(size):
+    """Loads the game font at a size, initialising the font module if needed."""
+    if not pygame.font.get_init():
+        pygame.font.init()
+    return pygame.font.Font(asset_path("assets/8-BIT WONDER.TTF"), size)
+
+class AlphaRamp():
+    """
+    Opacity variants of a shared surface, so fades never call set_alpha on an image
+    other sprites are drawing too. Opacity is quantized to LEVELS steps; each variant
+    is made once, with the opacity baked into its per-pixel alpha so drawing it is a
+    plain alpha blit, and is then shared by everything that asks for that level.
+    """
+    LEVELS = 32
+    RAMPS = {}  # id(source surface) -> AlphaRamp
+
+    def __init__(self, source, levels=LEVELS):
+        """
+        Args:
+            source (pygame.Surface): Fully opaque image (kept, so its id stays valid)
+            levels (int): Opacity steps from transparent to opaque
+        """
+        self.source = source
+        self.levels = levels
+        self.variants = [None] * levels  # Built on first use
+        self.variants[-1] = source
+
+    @staticmethod
+    def of(source):
+        """Returns the shared ramp for a surface, creating it on first use."""
+        ramp = AlphaRamp.RAMPS.get(id(source))
+        if ramp is None:
+            ramp = AlphaRamp.RAMPS[id(source)] = AlphaRamp(source)
+        return ramp
+
+    def variant(self, alpha):
+        """Returns the source at the nearest level to an opacity of 0-255."""
+        level = min(max(round(alpha * (self.levels - 1) / 255), 0), self.levels - 1)
+        variant = self.variants[level]
+        if variant is None:
+            variant = self.source.copy()
+            alpha = level * 255 // (self.levels - 1)
+            if variant.get_flags() & pygame.SRCALPHA:
+                variant.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+            else:
+                variant.set_alpha(alpha)  # No per-pixel alpha to bake into; the copy has its own
+            self.variants[level] = variant
+        return variant
 #-----------------------------------------------------------------------------------------------------------------------------------------------
 
 class Data():
     """
-    Handles loading and storing high score data.
-    Uses a text file to persist high scores between game sessions.
+    Handles loading and storing score data.
+    Every finished run is kept in a SQLite database (WAL mode) with an indexed runs
+    table. Inserts are batched by a background writer thread, and the menu and HUD
+    read the high score and leaderboards from an in-memory cache.
+    """
+    hs_file = "highscore.txt"  # Legacy high score file, migrated once
+    db_file = "scores.db"      # Score database
+    CACHE_SIZE = 10            # Runs kept in memory per leaderboard
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            ship TEXT,
+            score INTEGER NOT NULL,
+            waves INTEGER,
+            duration REAL,
+            seed INTEGER,
+            timestamp REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+        CREATE INDEX IF NOT EXISTS runs_by_ship ON runs (ship, score DESC);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
     """
-    hs_file = "highscore.txt"  # File to store the high score  
+    COLUMNS = ("ship", "score", "waves", "duration", "seed", "timestamp")
 
-    def __init__(self):  
+    def __init__(self, data_dir=None):  
         """
-        initialises the Data object and loads high score data.
+        initialises the Data object, the database and the score cache.
         Creates data directory if it doesn't exist.
+
+        Args:
+            data_dir (str): Directory for score files (the game's data/ folder by default)
         """
-        root = path.dirname(__file__)  # Gets the directory where the script is located  
-        self.data_dir = path.join(root, "data")  # Path to data directory
-        self.load_data()  # Load existing high score
+        self.data_dir = data_dir or path.join(ROOT, "data")  # Path to data directory
+        self.db_path = path.join(self.data_dir, Data.db_file)
+        self.load_data()  # Load existing scores
+
+        # Background writer
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self.write_runs, name="score-writer", daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        """Opens a connection to the score database."""
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
 
     def load_data(self):  
         """
-        Loads high score data from file.
-        Creates new file with default high score (0) if file doesn't exist.
-        Handles corrupt data (non-integer values) by resetting to 0.
+        Creates the database if needed, migrates highscore.txt once and fills the cache.
         """
         os.makedirs(self.data_dir, exist_ok=True)  # Creates 'data' folder if it doesn't exist
-     
-        try:  
-            # Try to open and read the high score file  
-            with open(path.join(self.data_dir, Data.hs_file), "r+") as f: 
-                contents = f.read()
-                if not contents.isdigit():  # Check if content is a valid number
-                    self.highscore = 0  # Default to 0 if file is corrupt
-                else:
-                    self.highscore = int(contents)  # Store valid high score
-        except (FileNotFoundError, ValueError):  
-            # If file doesn't exist or error occurs, create new file
-            with open(path.join(self.data_dir, Data.hs_file), 'w') as f:  
-                self.highscore = 0  # initialise with default value
+
+        with self.connect() as connection:
+            connection.executescript(Data.SCHEMA)
+            self.migrate_highscore(connection)
+
+            # In-memory leaderboards: overall and per ship
+            self.top = {None: self.query_top(connection, Data.CACHE_SIZE)}
+            for ship, in connection.execute("SELECT DISTINCT ship FROM runs WHERE ship IS NOT NULL"):
+                self.top[ship] = self.query_top(connection, Data.CACHE_SIZE, ship)
+        connection.close()
+
+        self.highscore = self.top[None][0]["score"] if self.top[None] else 0
+
+    def migrate_highscore(self, connection):
+        """Imports the legacy highscore.txt value as a run, the first time only."""
+        if connection.execute("SELECT 1 FROM meta WHERE key = 'highscore_migrated'").fetchone():
+            return
+        filename = path.join(self.data_dir, Data.hs_file)
+        try:
+            with open(filename, "r") as f:
+                contents = f.read().strip()
+            if contents.isdigit() and int(contents) > 0:  # Corrupt content is skipped, not reset
+                connection.execute("INSERT INTO runs (score, timestamp) VALUES (?, ?)",
+                                   (int(contents), path.getmtime(filename)))
+        except FileNotFoundError:
+            pass
+        connection.execute("INSERT INTO meta (key, value) VALUES ('highscore_migrated', '1')")
+
+    @staticmethod
+    def query_top(connection, n, ship=None):
+        """Runs a top-N query, overall or for one ship."""
+        columns = ", ".join(Data.COLUMNS)
+        if ship is None:
+            rows = connection.execute(f"SELECT {columns} FROM runs ORDER BY score DESC LIMIT ?", (n,))
+        else:
+            rows = connection.execute(f"SELECT {columns} FROM runs WHERE ship = ? ORDER BY score DESC LIMIT ?",
+                                      (ship, n))
+        return [dict(zip(Data.COLUMNS, row)) for row in rows]
+
+    def top_scores(self, n=CACHE_SIZE, ship=None):
+        """
+        Returns the best runs, overall or for one ship.
+        Served from the cache when n fits in it; otherwise queries the database.
+
+        Args:
+            n (int): Number of runs
+            ship (str): Ship ID (e.g. "SHIP1"), or None for all ships
+        """
+        if n <= Data.CACHE_SIZE:
+            return self.top.get(ship, [])[:n]
+        self.flush()
+        connection = self.connect()
+        try:
+            return self.query_top(connection, n, ship)
+        finally:
+            connection.close()
   
     def write_highscore(self):
         """
-        Updates high score file if current score exceeds stored high score.
-        Prevents overflow by capping high score at 99999.
+        Updates the cached high score if current score exceeds it.
+        The score itself is stored when the run is recorded.
         """
         if Game.instance.player.score > self.highscore:
             self.highscore = Game.instance.player.score
-            if self.highscore < 99999:  # Prevent overflow
-                with open(path.join(self.data_dir, Data.hs_file), "w") as f:
-                    f.write(str(self.highscore))  # Write new high score
+
+    def record_run(self, ship, score, waves, duration, seed):
+        """
+        Queues a finished run for the database and updates the cache.
+
+        Args:
+            ship (str): Ship ID
+            score (int): Final score
+            waves (int): Waves completed
+            duration (float): Seconds spent playing
+            seed (int): Random seed of the run
+        """
+        run = {"ship": ship, "score": score, "waves": waves, "duration": duration,
+               "seed": seed, "timestamp": time.time()}
+        self.pending.put(run)
+
+        for key in (None, ship):
+            board = self.top.setdefault(key, [])
+            board.append(run)
+            board.sort(key=lambda entry: entry["score"], reverse=True)
+            del board[Data.CACHE_SIZE:]
+        self.highscore = max(self.highscore, score)
+
+    def write_runs(self):
+        """Writer thread: inserts queued runs in batches until it receives None."""
+        connection = self.connect()
+        running = True
+        while running:
+            batch = [self.pending.get()]
+            while True:  # Take everything already queued
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            runs = [run for run in batch if isinstance(run, dict)]
+            if runs:
+                with connection:
+                    connection.executemany(
+                        f"INSERT INTO runs ({', '.join(Data.COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                        [tuple(run[column] for column in Data.COLUMNS) for run in runs])
+
+            for item in batch:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    item.set()  # Flush request
+            for _ in batch:
+                self.pending.task_done()
+        connection.close()
+
+    def flush(self):
+        """Blocks until every queued run has been written."""
+        if self.writer.is_alive():
+            done = threading.Event()
+            self.pending.put(done)
+            done.wait()
+
+    def close(self):
+        """Writes any queued runs and stops the writer thread."""
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+
+class ConfigWatcher():
+    """
+    Reloads the game's JSON data files while it runs.
+    A background thread polls each file's modification time and size, and only
+    re-parses a file when they change. Parsed files are validated against a schema
+    and queued; the game swaps them in between frames with apply(). Files that fail
+    to read, parse or validate are reported and the previous config is kept.
+    """
+    POLL_INTERVAL = 0.5  # Seconds between checks
+
+    # Expected shapes: a type, [item schema], {key: schema} or {"*": schema for every value}
+    SHIP_SCHEMA = {"*": {"name": str, "speed": int, "lives": int, "ammo": int,
+                         "fire rate": int, "bullet speed": int, "type": str}}
+    TEXT_SCHEMA = {"help_text": [{"title": str, "content": [str]}]}
+
+    def __init__(self, files=None):
+        """
+        Records each file's current state and starts the polling thread.
+
+        Args:
+            files (dict): Game attribute -> (filename, schema); the ship and text data by default
+        """
+        self.files = files or {
+            "SHIP_DATA": (asset_path("data/ship_data.json"), ConfigWatcher.SHIP_SCHEMA),
+            "GAME_TEXT": (asset_path("data/game_text.json"), ConfigWatcher.TEXT_SCHEMA)
+        }
+        self.seen = {name: self.stamp(filename) for name, (filename, _) in self.files.items()}
+        self.changes = queue.Queue()  # (attribute, parsed config) ready to swap in
+
+        self.stopped = threading.Event()
+        self.poller = threading.Thread(target=self.poll, name="config-watcher", daemon=True)
+        self.poller.start()
+
+    @staticmethod
+    def stamp(filename):
+        """Returns what identifies a file's version: modification time and size."""
+        try:
+            stat = os.stat(filename)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    @staticmethod
+    def validate(value, schema, where="config"):
+        """
+        Checks a parsed value against a schema.
+
+        Raises:
+            ValueError: Naming the first part that doesn't match
+        """
+        if isinstance(schema, type):
+            if not isinstance(value, schema) or (schema is int and isinstance(value, bool)):
+                raise ValueError(f"{where} should be {schema.__name__}, not {type(value).__name__}")
+        elif isinstance(schema, list):
+            if not isinstance(value, list):
+                raise ValueError(f"{where} should be a list")
+            for i, item in enumerate(value):
+                ConfigWatcher.validate(item, schema[0], f"{where}[{i}]")
+        else:
+            if not isinstance(value, dict):
+                raise ValueError(f"{where} should be an object")
+            if "*" in schema:
+                for key, item in value.items():
+                    ConfigWatcher.validate(item, schema["*"], f"{where}.{key}")
+            for key, item_schema in schema.items():
+                if key != "*":
+                    if key not in value:
+                        raise ValueError(f"{where} is missing {key!r}")
+                    ConfigWatcher.validate(value[key], item_schema, f"{where}.{key}")
+
+    def check(self):
+        """Parses and queues every file whose stamp changed since it was last seen."""
+        for name, (filename, schema) in self.files.items():
+            stamp = self.stamp(filename)
+            if stamp is None or stamp == self.seen[name]:
+                continue
+            self.seen[name] = stamp
+            try:
+                config = Game.load_json_text(filename)
+                ConfigWatcher.validate(config, schema, path.basename(filename))
+            except (OSError, ValueError) as error:  # Replaced since the stat, or invalid JSON
+                print(f"Not reloading {path.basename(filename)}: {error}", file=sys.stderr)
+                continue
+            self.changes.put((name, config))
+
+    def poll(self):
+        """Polling thread: checks the files until stopped."""
+        while not self.stopped.wait(ConfigWatcher.POLL_INTERVAL):
+            self.check()
+
+    def apply(self, game):
+        """
+        Swaps in any reloaded configs. Call between frames.
+
+        Args:
+            game (Game): The running game
+
+        Returns:
+            bool: Whether anything changed
+        """
+        changed = False
+        while True:
+            try:
+                name, config = self.changes.get_nowait()
+            except queue.Empty:
+                break
+            if name == "SHIP_DATA" and list(config) != list(Game.SHIP_DATA):
+                # Ship IDs index images, bullet patterns and snapshots
+                print("Not reloading ship data: ship IDs changed", file=sys.stderr)
+                continue
+            setattr(Game, name, config)
+            game.metrics.add("config_reloads")
+            changed = True
+
+        if changed:
+            game.selected_ship_description = Game.SHIP_DATA.get(game.player.selected_ship)
+            game.player.load_stats(game.selected_ship_description)
+            game.invalidate_screens()
+        return changed
+
+    def close(self):
+        """Stops the polling thread."""
+        self.stopped.set()
+        self.poller.join()
+
+class Metrics():
+    """
+    Named counters shared by engine subsystems.
+    Keeps running totals plus per-second rates over a rolling one second window.
+    """
+    def __init__(self):
+        """initialises empty counters and starts the first rate window."""
+        self.totals = {}  # Running totals since start
+        self.window = {}  # Totals in the current window
+        self.rates = {}   # Per-second rates from the last full window
+        self.window_start = time.perf_counter()
+
+    def add(self, name, amount=1):
+        """
+        Adds an amount to a named counter.
+
+        Args:
+            name (str): Counter name
+            amount (int/float): Amount to add
+        """
+        self.totals[name] = self.totals.get(name, 0) + amount
+        self.window[name] = self.window.get(name, 0) + amount
+
+    def tick(self):
+        """Rolls the rate window over once a second has passed. Call once per frame."""
+        now = time.perf_counter()
+        elapsed = now - self.window_start
+        if elapsed >= 1.0:
+            self.rates = {name: value / elapsed for name, value in self.window.items()}
+            self.window = {}
+            self.window_start = now
+
+    def total(self, name):
+        """Returns the running total of a counter."""
+        return self.totals.get(name, 0)
+
+    def rate(self, name):
+        """Returns the per-second rate of a counter over the last window."""
+        return self.rates.get(name, 0)
+
+class Telemetry():
+    """
+    Streaming log of gameplay events (shots, kills, despawns, hits taken, powerups, waves).
+    The game thread only appends small tuples to an in-memory buffer; the buffer is
+    handed over in bulk and a background writer encodes it to size-rotated gzip JSONL
+    or fixed-width binary files, so logging never touches the disk inside a frame.
+    """
+    # Event codes, and the names of their three integer fields
+    SHOT, KILL, HIT, POWERUP, WAVE_START, WAVE_END, DESPAWN = range(7)
+    EVENTS = ("shot", "kill", "hit", "powerup", "wave_start", "wave_end", "despawn")
+    FIELDS = (("ship", "pattern", "ammo"),   # ship number, BULLET_PATTERNS index, ammo left
+              ("enemy", "x", "y"),           # EntityStore enemy kind, position
+              ("lives", None, None),         # lives left
+              ("powerup", "lives", None),    # powerup kind, lives after
+              ("wave", "completed", None),   # wave index, waves completed
+              ("wave", "completed", None),
+              ("enemy", "reason", None))     # EntityStore enemy kind, REASONS index
+    ENEMIES = ("StandardEnemy", "DiagonalEnemy")  # Indexed by EntityStore kind
+    POWERUPS = ("LifePowerUp",)
+    OFFSCREEN, RAMMED, CLEARED = range(3)  # Why an enemy left without being shot
+    REASONS = ("offscreen", "rammed", "cleared")
+
+    RECORD = struct.Struct("<IBhhh")  # ticks, event, three fields
+    EXTENSIONS = {"jsonl": ".jsonl.gz", "binary": ".bin"}
+    FLUSH_RECORDS = 256    # Hand the buffer over once it holds this many records...
+    FLUSH_INTERVAL = 1000  # ...or this many ms have passed
+    BUDGET_MS = 0.1        # Game thread cost per frame the benchmark checks against
+
+    def __init__(self, directory=None, format="jsonl", max_bytes=1 << 20, backups=5):
+        """
+        initialises the buffer and, when a directory is given, the writer thread.
+        Without a directory telemetry is disabled and record() does nothing.
+
+        Args:
+            directory (str): Directory for log files, or None to disable
+            format (str): "jsonl" (gzip compressed) or "binary" (fixed-width records)
+            max_bytes (int): Size at which the current file is rotated
+            backups (int): Rotated files to keep
+        """
+        self.enabled = directory is not None
+        self.buffer = []  # Records not yet handed to the writer
+        self.last_flush = 0
+        self.ticks = pygame.time.get_ticks  # Event timestamps; a Game points this at its GameClock
+        if not self.enabled:
+            return
+
+        os.makedirs(directory, exist_ok=True)
+        self.format = format
+        self.filename = path.join(directory, "telemetry" + Telemetry.EXTENSIONS[format])
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+        # Background writer
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self.write_batches, name="telemetry-writer", daemon=True)
+        self.writer.start()
+
+    def record(self, event, a=0, b=0, c=0):
+        """
+        Buffers one event. Cheap enough to call from any gameplay hook.
+
+        Args:
+            event (int): Event code (Telemetry.SHOT etc.)
+            a, b, c (int): Event fields, as named in FIELDS
+        """
+        if self.enabled:
+            self.buffer.append((self.ticks(), event, a, b, c))
+
+    def end_frame(self, now):
+        """Hands the buffer to the writer when it is full or old enough. Call once per frame."""
+        if self.buffer and (len(self.buffer) >= Telemetry.FLUSH_RECORDS
+                            or now - self.last_flush >= Telemetry.FLUSH_INTERVAL):
+            self.submit(now)
+
+    def submit(self, now=0):
+        """Hands every buffered record to the writer without waiting for it."""
+        if self.buffer:
+            self.pending.put(self.buffer)
+            self.buffer = []
+        self.last_flush = now
+
+    @staticmethod
+    def decode(record):
+        """Turns a record tuple into a readable dict."""
+        ticks, event, *values = record
+        entry = {"t": ticks, "event": Telemetry.EVENTS[event]}
+        for name, value in zip(Telemetry.FIELDS[event], values):
+            if name:
+                entry[name] = value
+        if event == Telemetry.SHOT:
+            entry["ship"] = f"SHIP{entry['ship']}"
+        elif event == Telemetry.KILL:
+            entry["enemy"] = Telemetry.ENEMIES[entry["enemy"]]
+        elif event == Telemetry.DESPAWN:
+            entry["enemy"] = Telemetry.ENEMIES[entry["enemy"]]
+            entry["reason"] = Telemetry.REASONS[entry["reason"]]
+        elif event == Telemetry.POWERUP:
+            entry["powerup"] = Telemetry.POWERUPS[entry["powerup"]]
+        return entry
+
+    def encode(self, batch):
+        """Encodes a batch of records in the log's format."""
+        if self.format == "binary":
+            return b"".join(Telemetry.RECORD.pack(*record) for record in batch)
+        return "".join(json.dumps(Telemetry.decode(record), separators=(",", ":")) + "\n"
+                       for record in batch).encode()
+
+    def open_file(self):
+        """Opens the current log file for appending."""
+        raw = open(self.filename, "ab")
+        if self.format == "jsonl":
+            return raw, gzip.GzipFile(fileobj=raw, mode="wb")  # One gzip member per session
+        return raw, raw
+
+    def rotate(self, raw, stream):
+        """Closes the current file and shifts it to .1, .2 ... dropping the oldest."""
+        if stream is not raw:
+            stream.close()
+        raw.close()
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.filename}.{i}"
+            if path.exists(older):
+                os.replace(older, f"{self.filename}.{i + 1}")
+        if self.backups:
+            os.replace(self.filename, f"{self.filename}.1")
+        else:
+            os.remove(self.filename)
+        return self.open_file()
+
+    def write_batches(self):
+        """Writer thread: encodes and writes queued batches until it receives None."""
+        raw, stream = self.open_file()
+        running = True
+        while running:
+            item = self.pending.get()
+            if item is None:
+                running = False
+            elif isinstance(item, threading.Event):
+                item.set()  # Flush request
+            else:
+                stream.write(self.encode(item))
+                stream.flush()  # Readable up to the last batch even after a crash
+                if raw.tell() >= self.max_bytes:
+                    raw, stream = self.rotate(raw, stream)
+            self.pending.task_done()
+        if stream is not raw:
+            stream.close()
+        raw.close()
+
+    def flush(self):
+        """Hands over the buffer and blocks until everything queued is on disk."""
+        if self.enabled and self.writer.is_alive():
+            self.submit(self.last_flush)
+            done = threading.Event()
+            self.pending.put(done)
+            done.wait()
+
+    def close(self):
+        """Writes any buffered records and stops the writer thread."""
+        if self.enabled and self.writer.is_alive():
+            self.submit(self.last_flush)
+            self.pending.put(None)
+            self.writer.join()
+
+    @staticmethod
+    def read(filename):
+        """
+        Yields the events of one log file as dicts.
+
+        Args:
+            filename (str): A telemetry file or one of its rotated copies
+        """
+        if ".jsonl" in path.basename(filename):
+            with gzip.open(filename, "rt") as f:
+                for line in f:
+                    yield json.loads(line)
+        else:
+            with open(filename, "rb") as f:
+                for record in Telemetry.RECORD.iter_unpack(f.read()):
+                    yield Telemetry.decode(record)
+
+    @staticmethod
+    def benchmark(frames=600, events_per_frame=40):
+        """
+        Measures the game thread's per-frame cost at a sustained peak event rate,
+        and the size each format takes on disk.
+
+        Args:
+            frames (int): Frames to simulate
+            events_per_frame (int): Events recorded every frame (a shot plus kills)
+
+        Returns:
+            dict: Format -> (ms per frame, bytes per event)
+        """
+        results = {}
+        for format in Telemetry.EXTENSIONS:
+            with tempfile.TemporaryDirectory() as directory:
+                telemetry = Telemetry(directory, format, max_bytes=1 << 30)
+                start = time.perf_counter()
+                for frame in range(frames):
+                    telemetry.record(Telemetry.SHOT, 3, 0, 20)
+                    for i in range(events_per_frame - 1):
+                        telemetry.record(Telemetry.KILL, i & 1, 40 * (i % 10), frame % 600)
+                    telemetry.end_frame(frame * 16)
+                elapsed = (time.perf_counter() - start) * 1000
+                telemetry.close()
+                size = path.getsize(telemetry.filename)
+            results[format] = (elapsed / frames, size / (frames * events_per_frame))
+        return results
+
+class FrameCapture():
+    """
+    Records presented frames for review clips.
+    Each frame is blitted into one slot of a preallocated ring of shared memory
+    surfaces and handed to encoder processes, which save numbered PNGs, or to a
+    writer thread that pipes the raw frames to a local encoder (ffmpeg) when one
+    is installed. Slots share the usual screen's pixel layout (XRGB), so the copy
+    is a plain one, and slot indices travel through pipes rather than queues,
+    so no feeder threads compete with the game thread for the GIL.
+    Encoding stays out of the game's interpreter and runs at a lower priority,
+    so it only gets CPU time the game leaves idle: on a single core, a game running
+    flat out starves the encoders. When every slot is still waiting to be encoded,
+    the "drop" policy skips the frame and "block" waits for a slot (back-pressure,
+    for offline captures that must keep every frame, at the cost of stalled frames).
+    """
+    ENCODER = ["ffmpeg", "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "bgra",
+               "-s", "{width}x{height}", "-r", "{fps}", "-i", "-", "-pix_fmt", "yuv420p"]
+    SIZE = (800, 600)  # Largest logical screen (ARMOURY); smaller frames sit top-left
+    BLOCK_TIMEOUT = 5  # Seconds "block" waits for a slot before dropping the frame
+    NICE = 19          # Priority drop for encoder processes, so they yield the CPU to the game
+
+    def __init__(self, directory=None, encoder="auto", policy="drop", slots=8, workers=2, fps=60):
+        """
+        initialises the ring and starts the workers. Without a directory capture is
+        disabled and frame() does nothing.
+
+        Args:
+            directory (str): Directory for the PNG sequence or video, or None to disable
+            encoder (str): "png", "pipe" (ffmpeg) or "auto" (pipe when ffmpeg is found)
+            policy (str): "drop" or "block" when the ring is full
+            slots (int): Frames the ring holds
+            workers (int): PNG encoder processes (the pipe always has one writer)
+            fps (int): Frame rate given to the video encoder
+        """
+        self.enabled = directory is not None
+        self.frames = 0     # Frames offered
+        self.dropped = 0    # Frames skipped because the ring was full
+        self.overhead = []  # Game thread ms per captured frame
+        if not self.enabled:
+            return
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        if encoder == "auto":
+            encoder = "pipe" if shutil.which(FrameCapture.ENCODER[0]) else "png"
+        self.encoder = encoder
+        self.policy = policy
+
+        # Ring of reusable shared memory surfaces; slot indices circulate between the two queues
+        width, height = FrameCapture.SIZE
+        context = multiprocessing.get_context("spawn")  # Workers must not inherit SDL or threads
+        self.memories = [shared_memory.SharedMemory(create=True, size=width * height * 4) for _ in range(slots)]
+        self.slots = [pygame.image.frombuffer(memory.buf, FrameCapture.SIZE, "BGRA") for memory in self.memories]
+        for slot in self.slots:
+            slot.fill((0, 0, 0))  # Fault every page in now rather than during the first frames
+        self.sizes = [None] * slots  # Frame size last copied into each slot
+        self.free, self.freed = context.Pipe(duplex=False)  # Slot indices back from the encoders
+        for i in range(slots):
+            self.freed.send(i)
+        self.pending = context.SimpleQueue()  # (frame number, slot index, frame size), or None to stop
+        self.written = context.Value("i", 0)  # Frames encoded
+        self.failed = context.Value("i", 0)   # Frames the encoder couldn't write
+        self.started = context.Value("i", 0)  # Encoder processes up and waiting for frames
+
+        if encoder == "pipe":
+            command = [arg.format(width=width, height=height, fps=fps) for arg in FrameCapture.ENCODER]
+            self.process = subprocess.Popen(command + [path.join(directory, "capture.mp4")],
+                                            stdin=subprocess.PIPE)
+            # Frames must reach the pipe in order; writing releases the GIL
+            self.workers = [threading.Thread(target=self.pipe_frames, name="capture-pipe", daemon=True)]
+        else:
+            names = [memory.name for memory in self.memories]
+            self.workers = [context.Process(target=FrameCapture.save_frames, name=f"capture-{i}", daemon=True,
+                                            args=(directory, names, self.pending, self.freed, self.written,
+                                                  self.failed, self.started))
+                            for i in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def frame(self, surface):
+        """
+        Copies a presented frame into the ring. Call once per frame.
+
+        Args:
+            surface (pygame.Surface): The frame; anything past SIZE is clipped
+        """
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        self.frames += 1
+        if not self.free.poll(FrameCapture.BLOCK_TIMEOUT if self.policy == "block" else 0):
+            self.dropped += 1
+            return
+        index = self.free.recv()
+        width, height = surface.get_size()
+        size = (min(width, FrameCapture.SIZE[0]), min(height, FrameCapture.SIZE[1]))
+        previous = self.sizes[index]
+        if previous and (previous[0] > size[0] or previous[1] > size[1]):
+            self.slots[index].fill((0, 0, 0))  # Clear what a larger frame left behind
+        self.sizes[index] = size
+        self.slots[index].blit(surface, (0, 0))
+        self.pending.put((self.frames, index, size))
+        self.overhead.append((time.perf_counter() - start) * 1000)
+
+    @staticmethod
+    def report(failed, number, error):
+        '''Counts a frame the encoder couldn't write, reporting only the first.'''
+        with failed.get_lock():
+            failed.value += 1
+            first = failed.value == 1
+        if first:
+            print(f"Capture frame {number} not written: {error}", file=sys.stderr)
+
+    @staticmethod
+    def save_frames(directory, names, pending, freed, written, failed, started):
+        """
+        Encoder process loop: saves queued slots as PNGs and returns them to the
+        ring, even when a save fails.
+        """
+        if hasattr(os, "nice"):
+            os.nice(FrameCapture.NICE)
+        memories = [shared_memory.SharedMemory(name) for name in names]
+        slots = [pygame.image.frombuffer(memory.buf, FrameCapture.SIZE, "BGRA") for memory in memories]
+        with started.get_lock():
+            started.value += 1
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            number, index, size = item
+            try:
+                pygame.image.save(slots[index].subsurface((0, 0), size),
+                                  path.join(directory, f"frame{number:06d}.png"))
+                with written.get_lock():
+                    written.value += 1
+            except Exception as error:  # Keep encoding; one bad frame shouldn't stop the capture
+                FrameCapture.report(failed, number, error)
+            finally:
+                freed.send(index)
+        slots.clear()  # Release the buffers before closing the shared memory
+        for memory in memories:
+            memory.close()
+
+    def pipe_frames(self):
+        """Writer thread loop: pipes queued slots to the encoder and returns them to the ring."""
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            number, index, size = item
+            try:
+                self.process.stdin.write(self.memories[index].buf)
+                with self.written.get_lock():
+                    self.written.value += 1
+            except (OSError, ValueError) as error:  # Encoder exited or its pipe closed
+                FrameCapture.report(self.failed, number, error)
+            finally:
+                self.freed.send(index)
+
+    def ready(self):
+        """Returns whether every encoder has started, past its spawn at normal priority."""
+        return not self.enabled or self.encoder == "pipe" or self.started.value == len(self.workers)
+
+    def stats(self):
+        """Returns frame counts and the game thread's capture cost."""
+        captured = len(self.overhead)
+        return {"frames": self.frames, "dropped": self.dropped,
+                "written": self.written.value if self.enabled else 0,
+                "failed": self.failed.value if self.enabled else 0,
+                "mean_ms": sum(self.overhead) / captured if captured else 0,
+                "worst_ms": max(self.overhead, default=0)}
+
+    def close(self):
+        """Encodes every queued frame, then stops the workers and the encoder."""
+        if not self.enabled or not self.workers:
+            return
+        for _ in self.workers:
+            self.pending.put(None)
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+        if self.encoder == "pipe":
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass  # Encoder already gone; its error was reported
+            self.process.wait()
+        for channel in (self.free, self.freed, self.pending):
+            channel.close()
+        self.slots.clear()  # Release the buffers before freeing the shared memory
+        for memory in self.memories:
+            memory.close()
+            memory.unlink()
+
+    @staticmethod
+    def benchmark(frames=120):
+        """
+        Compares saving a PNG inside the frame with handing frames to the capture
+        workers, under each full-ring policy, against frames without capture.
+        Frame times cover the game's work too, so they show any slowdown the
+        encoders cause on the game thread. Timing starts once the encoders have
+        started. Frames run flat out, so on a single core the encoders get little
+        time: "drop" skips most frames and "block" runs at the encoders' pace.
+        Needs a Game instance.
+
+        Returns:
+            dict: Method -> capture stats, with "frame_ms" per frame on the game thread
+        """
+        game = Game.instance
+        results = {}
+
+        def frame(capture):
+            start = time.perf_counter()
+            game.global_UI_elements()
+            game.play()
+            capture(game.screen)
+            return time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as directory:
+            total = sum(frame(lambda screen: None) for _ in range(frames))
+            results["no capture"] = {"frame_ms": total * 1000 / frames}
+
+            total = sum(frame(lambda screen: pygame.image.save(screen, path.join(directory, "inline.png")))
+                        for _ in range(frames // 4))
+            results["inline save"] = {"frame_ms": total * 1000 / (frames // 4)}
+
+            for policy in ("drop", "block"):
+                capture = FrameCapture(path.join(directory, policy), "png", policy)
+                while not capture.ready():
+                    time.sleep(0.01)
+                total = sum(frame(capture.frame) for _ in range(frames))
+                capture.close()
+                results[f"ring, {policy}"] = dict(capture.stats(), frame_ms=total * 1000 / frames)
+        return results
+
+class MemoryProfiler():
+    """
+    Memory instrumentation for long sessions. At every wave transition it takes a
+    tracemalloc snapshot together with per-group entity counts and an estimate of the
+    bytes held in surfaces, diffs the snapshot against the previous wave and appends
+    the fastest growing allocation sites to a text report.
+    """
+    TOP = 10          # Growing allocation sites listed per wave
+    FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+               tracemalloc.Filter(False, "<unknown>"))
+    WARMUP = 10       # Waves the soak lets caches fill before checking growth
+    LIMIT = 2 << 20   # Traced bytes the soak allows past the warmup
+
+    def __init__(self, directory=None, top=TOP):
+        """
+        initialises the profiler. Without a directory it is disabled and wave()
+        does nothing.
+
+        Args:
+            directory (str): Directory for memory.txt, or None to disable
+            top (int): Allocation sites listed per wave
+        """
+        self.enabled = directory is not None
+        self.top = top
+        # History per wave transition, kept compact so it barely shows in its own diffs
+        self.traced = array("q")  # Traced bytes
+        self.counts = {}          # Group name -> entity counts
+        self.previous = None      # Last wave's tracemalloc snapshot
+        if not self.enabled:
+            return
+
+        os.makedirs(directory, exist_ok=True)
+        self.filename = path.join(directory, "memory.txt")
+        self.started = not tracemalloc.is_tracing()  # Only stop tracing we started
+        if self.started:
+            tracemalloc.start()
+
+    @staticmethod
+    def group_counts(game):
+        """Returns entities per gameplay group, by attribute name."""
+        return {name: len(getattr(game, name)) for name, value in vars(Game).items()
+                if isinstance(value, pygame.sprite.AbstractGroup)}
+
+    @staticmethod
+    def surface_bytes(game):
+        """
+        Estimates pixel bytes held by live sprites and the surface caches, counting
+        each shared surface once.
+
+        Returns:
+            dict: Source -> bytes
+        """
+        sources = {
+            "sprites": [getattr(sprite, "image", None) for group in game.GROUPS for sprite in group],
+            "stores": [image for store in (game.entities, game.enemy_engine) if store for image in store.sprites],
+            "fonts": [image for font in BitmapFont.FONTS.values() for image in font.composed.values()],
+            "screens": [screen.surface for screen in game.static_screens.values()],
+            "caches": [*Bullet.ROTATED.values(), *game.ship_descriptions.values(), *game.overlays.values()]
+        }
+        seen = set()
+        sizes = {}
+        for source, surfaces in sources.items():
+            sizes[source] = 0
+            for surface in surfaces:
+                if surface is not None and id(surface) not in seen:
+                    seen.add(id(surface))
+                    sizes[source] += surface.get_bytesize() * surface.get_width() * surface.get_height()
+        return sizes
+
+    def wave(self, game):
+        """Records one wave transition and writes its section of the report."""
+        if not self.enabled:
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces(MemoryProfiler.FILTERS)
+        traced = sum(stat.size for stat in snapshot.statistics("filename"))
+        counts = MemoryProfiler.group_counts(game)
+        surfaces = MemoryProfiler.surface_bytes(game)
+        self.traced.append(traced)
+        for name, count in counts.items():
+            self.counts.setdefault(name, array("I")).append(count)
+
+        lines = [f"wave {game.total_waves_completed} ({game.current_wave})  traced {traced / 1024:.1f} KiB"]
+        if self.previous is not None:
+            lines[0] += f" ({(traced - self.traced[-2]) / 1024:+.1f} KiB)"
+        lines.append("  groups   " + "  ".join(f"{name} {count}" for name, count in counts.items()))
+        lines.append("  surfaces " + "  ".join(f"{name} {size / 1024:.1f} KiB" for name, size in surfaces.items()))
+        if self.previous is not None:
+            growing = [stat for stat in snapshot.compare_to(self.previous, "lineno") if stat.size_diff > 0]
+            for stat in growing[:self.top]:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size_diff / 1024:+8.1f} KiB {stat.count_diff:+6d} blocks  "
+                             f"{path.basename(frame.filename)}:{frame.lineno}")
+        self.previous = snapshot
+        with open(self.filename, "a") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def bounded(self, warmup=WARMUP, limit=LIMIT):
+        """
+        Checks that memory stopped growing once the first waves are over: traced bytes
+        stay within the limit, and no group holds entities that never leave (its
+        fewest in the last warmup transitions is above its most just after the warmup).
+
+        Returns:
+            tuple: (bool, traced bytes gained after the warmup, names of growing groups)
+        """
+        settled = self.traced[warmup:]
+        if len(settled) < 2 * warmup:
+            return True, 0, []
+        growth = max(settled) - settled[0]
+        growing = [name for name, counts in self.counts.items()
+                   if min(counts[-warmup:]) > max(counts[warmup:2 * warmup])]
+        return growth <= limit and not growing, growth, growing
+
+    def close(self):
+        """Stops tracing if this profiler started it."""
+        if self.enabled and self.started:
+            tracemalloc.stop()
+            self.started = False
+
+    @staticmethod
+    def soak(directory, waves=200, steps_per_second=6):
+        """
+        Plays waves headless as fast as possible, keeping the player alive and
+        firing, with a wave timer tick every few steps instead of every second.
+
+        Args:
+            directory (str): Directory for the report
+            waves (int): Wave transitions to play through
+            steps_per_second (int): Simulation steps between wave timer ticks
+
+        Returns:
+            MemoryProfiler: The profiler, with traced bytes for every wave
+        """
+        profiler = MemoryProfiler(directory)
+        with BenchmarkRun() as run:
+            game = run.game(ScriptedInputSource(run.weave()), headless=True, memory_profiler=profiler)
+            game.current_state = "PLAY"
+            game.game_clock.set_timer(game.WAVE_EVENT, steps_per_second * 1000 // GameClock.FPS)
+            while len(profiler.traced) < waves:
+                game.process_events()
+                game.play()
+                run.keep_alive(game)  # Every wave is played
+        profiler.close()
+        return profiler
+
+class StressMode():
+    """
+    Endless waves for finding the engine's limits. Every wave spawns more enemies
+    that fire more often with faster bullets, each quantity following a curve of the
+    wave number, so the load keeps climbing until frames can't keep up.
+    Frame time, entity counts and collision pair tests are recorded per wave, and
+    the capacity is the entity count at which frames first average over the 60 FPS
+    budget (over WINDOW frames of one wave, so neither a single slow frame nor the
+    first frames of a wave decide it).
+    Entities are read from the sprite groups, so the game must use them.
+    """
+    BUDGET_MS = 1000 / 60
+    WINDOW = 30        # Frames averaged when looking for the capacity
+    WAVE_SECONDS = 5   # Length of every stress wave
+
+    # Per quantity: (shape, start, rate, limit). "linear" adds rate every wave,
+    # "geometric" multiplies by it; values stop at the limit in either direction.
+    CURVES = {
+        "enemies": ("geometric", 6, 1.35, 3000),          # Enemies spawned per wave
+        "shoot_interval": ("geometric", 1000, 0.88, 60),  # ms between an enemy's shots
+        "bullet_speed": ("linear", 6, 0.5, 20),           # Enemy bullet pixels per step
+        "enemy_speed": ("linear", 2, 0.1, 5),             # Enemy pixels per step
+    }
+    SHAPES = ("linear", "geometric")
+
+    def __init__(self, curves=None):
+        """
+        Args:
+            curves (dict): Replacements for some or all of CURVES
+        """
+        self.curves = dict(StressMode.CURVES)
+        for name, curve in (curves or {}).items():
+            if name not in StressMode.CURVES:
+                raise ValueError(f"Unknown stress curve {name!r}")
+            if curve[0] not in StressMode.SHAPES:
+                raise ValueError(f"Unknown curve shape {curve[0]!r} for {name}")
+            self.curves[name] = curve
+        self.waves = []        # Per wave records, oldest first
+        self.recent = deque(maxlen=StressMode.WINDOW)  # (frame ms, entities) of recent frames
+        self.capacity = None   # Entities when frames first averaged over budget
+        self.capacity_wave = None
+
+    @staticmethod
+    def parse_curve(text):
+        '''Parses NAME=SHAPE:START:RATE:LIMIT into (name, curve).'''
+        try:
+            name, spec = text.split("=")
+            shape, start, rate, limit = spec.split(":")
+            return name, (shape, float(start), float(rate), float(limit))
+        except ValueError:
+            raise ValueError(f"Expected NAME=SHAPE:START:RATE:LIMIT, got {text!r}") from None
+
+    def value(self, name, wave):
+        '''Returns a curve's value for a wave number.'''
+        shape, start, rate, limit = self.curves[name]
+        value = start + rate * wave if shape == "linear" else start * rate ** wave
+        return min(value, limit) if limit >= start else max(value, limit)
+
+    def spawn(self, game, wave):
+        '''Spawns a wave's enemies, spread above the screen so they stream in.'''
+        now = game.game_clock.ticks()
+        interval = int(self.value("shoot_interval", wave))
+        bullet_speed = int(self.value("bullet_speed", wave))
+        speed = int(self.value("enemy_speed", wave))
+        for _ in range(int(self.value("enemies", wave))):
+            enemy = StandardEnemy(random.randint(30, 370), random.randint(-400, -20))
+            enemy.speed = speed
+            enemy.bullet_speed = bullet_speed
+            enemy.shoot_interval = interval
+            enemy.next_shot_time = now + random.randint(0, interval)  # Don't fire in step
+            game.enemy_group.add(enemy)
+
+    @staticmethod
+    def collision_pairs(game):
+        '''
+        Returns the sprite pairs tested for collisions in a frame. Every bullet's
+        update tests player bullets against enemies and, when nothing hit, enemy
+        bullets against the players; every enemy tests the players against all
+        enemies; every powerup tests the players.
+        '''
+        player_bullets, enemy_bullets = len(game.bullet_player_group), len(game.bullet_enemy_group)
+        enemies, players = len(game.enemy_group), len(game.player_group)
+        return ((player_bullets + enemy_bullets) * (player_bullets * enemies + enemy_bullets * players)
+                + enemies * players * enemies + len(game.powerup_group) * players)
+
+    def record(self, game, frame_ms):
+        """
+        Adds a frame to the current wave's record.
+
+        Args:
+            game (Game): The game, just after the frame
+            frame_ms (float): The frame's work, excluding any pacing wait
+        """
+        wave = game.total_waves_completed
+        if not self.waves or self.waves[-1]["wave"] != wave:
+            if self.waves:
+                self.waves[-1]["complete"] = True
+            self.recent.clear()  # The capacity window stays within one wave
+            self.waves.append({
+                "wave": wave, "enemies": int(self.value("enemies", wave)),
+                "shoot_interval": int(self.value("shoot_interval", wave)),
+                "bullet_speed": int(self.value("bullet_speed", wave)),
+                "frames": 0, "total_ms": 0.0, "worst_ms": 0.0,
+                "entities": 0, "bullets": 0, "pairs": 0, "complete": False})
+        record = self.waves[-1]
+        bullets = len(game.bullet_player_group) + len(game.bullet_enemy_group)
+        entities = bullets + len(game.enemy_group) + len(game.powerup_group) + len(game.player_group)
+        record["frames"] += 1
+        record["total_ms"] += frame_ms
+        record["worst_ms"] = max(record["worst_ms"], frame_ms)
+        record["entities"] = max(record["entities"], entities)
+        record["bullets"] = max(record["bullets"], bullets)
+        record["pairs"] = max(record["pairs"], StressMode.collision_pairs(game))
+
+        self.recent.append((frame_ms, entities))
+        if (self.capacity is None and len(self.recent) == StressMode.WINDOW
+                and sum(ms for ms, _ in self.recent) / StressMode.WINDOW > StressMode.BUDGET_MS):
+            self.capacity = round(sum(count for _, count in self.recent) / StressMode.WINDOW)
+            self.capacity_wave = wave
+
+    def report(self):
+        '''Returns the wave records and capacity as lines of text. Waves still running are marked *.'''
+        lines = [f"{'wave':>4} {'spawned':>7} {'interval':>8} {'speed':>5} {'mean ms':>8} {'worst ms':>8} "
+                 f"{'entities':>8} {'bullets':>7} {'pairs':>12}"]
+        for record in self.waves:
+            wave = f"{record['wave']}{'' if record['complete'] else '*'}"
+            lines.append(f"{wave:>4} {record['enemies']:>7} {record['shoot_interval']:>8} "
+                         f"{record['bullet_speed']:>5} {record['total_ms'] / max(record['frames'], 1):>8.2f} "
+                         f"{record['worst_ms']:>8.2f} {record['entities']:>8} {record['bullets']:>7} "
+                         f"{record['pairs']:>12}")
+        if self.waves and not self.waves[-1]["complete"]:
+            lines.append("* stopped before the wave finished; its figures cover only part of it")
+        if self.capacity is None:
+            lines.append(f"capacity: frames stayed within {StressMode.BUDGET_MS:.1f} ms")
+        else:
+            lines.append(f"capacity: {self.capacity} entities (frames first averaged over "
+                         f"{StressMode.BUDGET_MS:.1f} ms in wave {self.capacity_wave})")
+        return lines
+
+    @staticmethod
+    def benchmark(curves=None, max_waves=40):
+        """
+        Plays stress waves unpaced with a bot that weaves and fires and is kept
+        alive, until a whole wave averages over budget or max_waves have played.
+
+        Args:
+            curves (dict): Replacements for some or all of CURVES
+            max_waves (int): Waves to play at most
+
+        Returns:
+            StressMode: The stress mode, with its wave records and capacity
+        """
+        stress = StressMode(curves)
+        with BenchmarkRun() as run:
+            game = run.game(ScriptedInputSource(run.weave(), quit_when_done=False),
+                            quality_scaling=False, stress=stress)
+            game.current_state = "PLAY"
+            while len(stress.waves) <= max_waves:
+                start = time.perf_counter()
+                game.simulate_frame()
+                game.present()
+                stress.record(game, (time.perf_counter() - start) * 1000)
+                run.keep_alive(game)
+                finished = stress.waves[:-1]
+                if finished and finished[-1]["total_ms"] / finished[-1]["frames"] > StressMode.BUDGET_MS:
+                    break
+        stress.waves.pop()  # Only the first frame of the next wave
+        return stress
+
+class GameClock():
+    """
+    Simulation time, read by every time-dependent gameplay system in place of
+    pygame.time.get_ticks(). Time only moves when the game runs a simulation step,
+    STEP_MS per step, so pausing cannot drift, headless runs never look at the wall
+    clock, and spawn and fire schedules are the same at any frame rate or time scale.
+    The time scale only changes how many steps run per displayed frame.
+    """
+    FPS = 60                # Simulation steps per second
+    STEP_MS = 1000 / FPS
+
+    def __init__(self, scale=1.0):
+        """
+        Args:
+            scale (float): Steps per displayed frame (0.5 slow motion, 4 fast-forward)
+        """
+        self.steps = 0          # Steps run so far
+        self.scale = scale
+        self.paused = False
+        self.carry = 0.0        # Fraction of a step owed to the next frame
+        self.manual = 0         # Steps requested with step(), run even while paused
+        self.timers = {}        # Event type -> [interval ms, next due ms]
+
+    def ticks(self):
+        """Returns simulation milliseconds, like pygame.time.get_ticks()."""
+        return self.steps * 1000 // GameClock.FPS
+
+    def pause(self):
+        """Stops time until resume(); only step() moves it meanwhile."""
+        self.paused = True
+
+    def resume(self):
+        """Lets time move again from exactly where it stopped."""
+        self.paused = False
+
+    def step(self, count=1):
+        """Queues steps for the next frame, even while paused (frame-by-frame stepping)."""
+        self.manual += count
+
+    def frame(self):
+        """Returns how many simulation steps to run this displayed frame."""
+        steps, self.manual = self.manual, 0
+        if not self.paused:
+            self.carry += self.scale
+            whole = int(self.carry)
+            self.carry -= whole
+            steps += whole
+        return steps
+
+    def set_timer(self, event_type, interval):
+        """
+        Fires an event every interval of simulation time, like pygame.time.set_timer.
+
+        Args:
+            event_type (int): Event type advance() reports when the timer is due
+            interval (int): Milliseconds between events, or 0 to stop the timer
+        """
+        if interval:
+            self.timers[event_type] = [interval, self.ticks() + interval]
+        else:
+            self.timers.pop(event_type, None)
+
+    def advance(self):
+        """
+        Moves time on by one step.
+
+        Returns:
+            list: Event types of the timers that fell due, in firing order
+        """
+        self.steps += 1
+        now = self.ticks()
+        due = []
+        for event_type, timer in self.timers.items():
+            while now >= timer[1]:
+                due.append(event_type)
+                timer[1] += timer[0]
+        return due
+
+class FramePacer():
+    """
+    Ends each frame on a fixed cadence and keeps statistics on how well it does.
+    Modes: "coarse" sleeps with Clock.tick, "busy" spins with Clock.tick_busy_loop,
+    and "hybrid" sleeps until shortly before the deadline and spins the rest.
+    """
+    MODES = ("coarse", "busy", "hybrid")
+    SPIN_MARGIN = 0.002  # Seconds before the deadline at which hybrid mode stops sleeping
+    HISTORY = 120        # Frames kept for statistics
+
+    def __init__(self, clock, fps=60, mode="coarse"):
+        """
+        Args:
+            clock (pygame.time.Clock): The game clock, still ticked so get_time() works
+            fps (int): Target frame rate
+            mode (str): One of MODES
+        """
+        self.clock = clock
+        self.fps = fps
+        self.mode = mode
+        self.period = 1 / fps
+        self.frame_start = time.perf_counter()  # End of the previous frame
+        self.deadline = self.frame_start + self.period
+        self.intervals = deque(maxlen=FramePacer.HISTORY)  # Seconds between frame ends
+        self.work = deque(maxlen=FramePacer.HISTORY)       # Seconds of work per frame
+
+    def tick(self):
+        """
+        Waits out the rest of the frame.
+
+        Returns:
+            float: Milliseconds of work done this frame (excluding the wait)
+        """
+        now = time.perf_counter()
+        work = now - self.frame_start
+
+        if self.mode == "busy":
+            self.clock.tick_busy_loop(self.fps)
+        elif self.mode == "hybrid":
+            remaining = self.deadline - now
+            if remaining > FramePacer.SPIN_MARGIN:
+                time.sleep(remaining - FramePacer.SPIN_MARGIN)
+            while time.perf_counter() < self.deadline:
+                pass
+            self.clock.tick()
+        else:
+            self.clock.tick(self.fps)
+
+        end = time.perf_counter()
+        self.deadline += self.period
+        if self.deadline <= end:  # Overran a whole frame: restart the cadence
+            self.deadline = end + self.period
+        self.intervals.append(end - self.frame_start)
+        self.work.append(work)
+        self.frame_start = end
+        return work * 1000
+
+    def stats(self):
+        """
+        Returns frame interval statistics over the recent history, in milliseconds:
+        mean, jitter (standard deviation), worst, and the share of late frames.
+        """
+        if not self.intervals:
+            return {"mean": 0, "jitter": 0, "worst": 0, "late": 0}
+        count = len(self.intervals)
+        mean = sum(self.intervals) / count
+        jitter = (sum((interval - mean) ** 2 for interval in self.intervals) / count) ** 0.5
+        late = sum(1 for interval in self.intervals if interval > self.period * 1.1)
+        return {"mean": mean * 1000, "jitter": jitter * 1000,
+                "worst": max(self.intervals) * 1000, "late": late / count}
+
+    @staticmethod
+    def benchmark(frames=180, work_ms=4):
+        """
+        Paces a fixed amount of busy work in every mode.
+
+        Args:
+            frames (int): Frames per mode
+            work_ms (float): Simulated work per frame
+
+        Returns:
+            dict: Mode -> stats()
+        """
+        results = {}
+        for mode in FramePacer.MODES:
+            pacer = FramePacer(pygame.time.Clock(), mode=mode)
+            pacer.intervals = deque(maxlen=frames)
+            for _ in range(frames):
+                end = time.perf_counter() + work_ms / 1000
+                while time.perf_counter() < end:
+                    pass
+                pacer.tick()
+            results[mode] = pacer.stats()
+        return results
+
+class QualityGovernor():
+    """
+    Sheds optional work when frames run over budget and restores it when there
+    is headroom again. Work is shed in FEATURES order and restored in reverse.
+    Every decision is counted in the metrics.
+    """
+    FEATURES = ("planets", "background_scroll", "explosions", "powerup_pulse")
+    WINDOW = 30     # Frames averaged per decision, and frames between decisions
+    SHED_AT = 0.9   # Shed when average work exceeds this share of the budget...
+    RESTORE_AT = 0.5  # ...and restore when it drops below this share
+
+    def __init__(self, metrics, budget_ms=1000 / 60, enabled=True):
+        """
+        Args:
+            metrics (Metrics): Where decisions are counted
+            budget_ms (float): Frame budget
+            enabled (bool): Whether work is ever shed
+        """
+        self.metrics = metrics
+        self.budget_ms = budget_ms
+        self.enabled = enabled
+        self.active = {feature: True for feature in QualityGovernor.FEATURES}
+        self.shed = 0  # Number of features currently shed
+        self.samples = deque(maxlen=QualityGovernor.WINDOW)
+        self.cooldown = QualityGovernor.WINDOW
+
+    def update(self, work_ms):
+        """
+        Records one frame's work and sheds or restores a feature if needed.
+
+        Args:
+            work_ms (float): Milliseconds of work in the frame
+        """
+        self.samples.append(work_ms)
+        self.cooldown -= 1
+        if not self.enabled or self.cooldown > 0:
+            return
+
+        average = sum(self.samples) / len(self.samples)
+        if average > self.budget_ms * QualityGovernor.SHED_AT and self.shed < len(QualityGovernor.FEATURES):
+            feature = QualityGovernor.FEATURES[self.shed]
+            self.active[feature] = False
+            self.shed += 1
+            self.metrics.add("quality_shed")
+            self.metrics.add(f"quality_shed_{feature}")
+        elif average < self.budget_ms * QualityGovernor.RESTORE_AT and self.shed:
+            self.shed -= 1
+            feature = QualityGovernor.FEATURES[self.shed]
+            self.active[feature] = True
+            self.metrics.add("quality_restore")
+            self.metrics.add(f"quality_restore_{feature}")
+        else:
+            return
+        self.cooldown = QualityGovernor.WINDOW  # Let the change show before deciding again
+
+class InputState():
+    """
+    Immutable snapshot of keyboard and mouse input for one frame.
+    Indexing with a key constant (state[pygame.K_a]) works like pygame.key.get_pressed().
+    """
+    __slots__ = ("keys", "mouse_pos", "click")
+
+    # Keys the game reads, in bit order for packed records
+    TRACKED_KEYS = (pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s,
+                    pygame.K_SPACE, pygame.K_p, pygame.K_ESCAPE)
+    RECORD = struct.Struct("<BhhB")  # key bits, mouse x, mouse y, click
+
+    def __init__(self, keys=(), mouse_pos=(0, 0), click=False):
+        """
+        Args:
+            keys (iterable): Key constants held down this frame
+            mouse_pos (tuple): (x,y) mouse position
+            click (bool): Left mouse button pressed this frame
+        """
+        object.__setattr__(self, "keys", frozenset(keys))
+        object.__setattr__(self, "mouse_pos", tuple(mouse_pos))
+        object.__setattr__(self, "click", bool(click))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("InputState is immutable")
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+    def __eq__(self, other):
+        return (isinstance(other, InputState) and self.keys == other.keys
+                and self.mouse_pos == other.mouse_pos and self.click == other.click)
+
+    def __hash__(self):
+        return hash((self.keys, self.mouse_pos, self.click))
+
+    def pack(self):
+        """Returns the state as a fixed-size binary record."""
+        bits = 0
+        for i, key in enumerate(InputState.TRACKED_KEYS):
+            if key in self.keys:
+                bits |= 1 << i
+        return InputState.RECORD.pack(bits, self.mouse_pos[0], self.mouse_pos[1], self.click)
+
+    @staticmethod
+    def unpack(record):
+        """Builds a state from a record made by pack()."""
+        bits, x, y, click = InputState.RECORD.unpack(record)
+        keys = [key for i, key in enumerate(InputState.TRACKED_KEYS) if bits & (1 << i)]
+        return InputState(keys, (x, y), click)
+
+class InputSource():
+    """
+    Base class for anything that drives the game's input.
+    Each frame the game calls poll() for discrete events, then read() for the snapshot.
+    Non-live sources make no SDL calls; they synthesise key-down and click events from
+    changes between snapshots.
+    """
+    def __init__(self):
+        self.previous = InputState()
+
+    def poll(self):
+        """Returns this frame's events."""
+        state = self.next_state()
+        events = [pygame.event.Event(pygame.KEYDOWN, key=key)
+                  for key in state.keys - self.previous.keys]
+        if state.click:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=state.mouse_pos))
+        self.previous = state
+        return events
+
+    def read(self, click):
+        """
+        Returns the input snapshot for this frame.
+
+        Args:
+            click (bool): Whether a click was dispatched this frame
+        """
+        return self.previous
+
+    def next_state(self):
+        """Returns the next frame's state. Implemented by child classes."""
+        return InputState()
+
+class LiveInputSource(InputSource):
+    '''Reads the real keyboard and mouse through SDL.'''
+    def poll(self):
+        return pygame.event.get()
+
+    def read(self, click):
+        pressed = pygame.key.get_pressed()
+        keys = [key for key in InputState.TRACKED_KEYS if pressed[key]]
+        return InputState(keys, Game.instance.logical_pos(pygame.mouse.get_pos()), click)
+
+class ScriptedInputSource(InputSource):
+    '''Plays back a sequence of InputStates, one per frame.'''
+    def __init__(self, frames, quit_when_done=True):
+        super().__init__()
+        self.frames = iter(frames)
+        self.quit_when_done = quit_when_done
+        self.finished = False
+
+    def poll(self):
+        events = super().poll()
+        if self.finished and self.quit_when_done:
+            events.append(pygame.event.Event(pygame.QUIT))
+        return events
+
+    def next_state(self):
+        try:
+            return next(self.frames)
+        except StopIteration:
+            self.finished = True
+            return InputState()
+
+class RecordedInputSource(ScriptedInputSource):
+    '''Replays an input recording written by InputRecorder.'''
+    def __init__(self, filename, quit_when_done=True):
+        with open(filename, "rb") as file:
+            data = file.read()
+        size = InputState.RECORD.size
+        frames = [InputState.unpack(data[i:i + size]) for i in range(0, len(data), size)]
+        super().__init__(frames, quit_when_done)
+
+class InputRecorder(InputSource):
+    '''Wraps another source and records every snapshot it produces.'''
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+        self.frames = []
+
+    def poll(self):
+        return self.source.poll()
+
+    def read(self, click):
+        state = self.source.read(click)
+        self.frames.append(state)
+        return state
+
+    def save(self, filename):
+        '''Writes the recording as packed fixed-size records.'''
+        with open(filename, "wb") as file:
+            file.write(b"".join(state.pack() for state in self.frames))
+
+class ReplayRecorder(InputRecorder):
+    '''
+    Records a session for a ReplayArchive: every frame's input, plus a keyframe
+    snapshot at the start of every KEYFRAME_INTERVAL-th frame and of the first frame
+    after each completed wave.
+    '''
+    KEYFRAME_INTERVAL = 300  # Frames between keyframes (5 seconds)
+
+    def __init__(self, source):
+        super().__init__(source)
+        self.keyframes = []  # (frame, waves completed, clock carry, snapshot)
+        self.wave = None
+
+    def poll(self):
+        game = Game.instance
+        frame = len(self.frames)
+        if frame % ReplayRecorder.KEYFRAME_INTERVAL == 0 or game.total_waves_completed != self.wave:
+            self.wave = game.total_waves_completed
+            self.keyframes.append((frame, self.wave, game.game_clock.carry, GameSnapshot.capture(game)))
+        return self.source.poll()
+
+    def recording(self):
+        '''Returns the session as ReplayArchive.append() takes it.'''
+        return (b"".join(state.pack() for state in self.frames), self.keyframes, Game.instance.game_clock.scale)
+
+class NetworkInputSource(InputSource):
+    '''
+    Receives input over UDP. Each datagram is a sequence number followed by a packed
+    InputState; stale or reordered datagrams are ignored and the last state is held.
+    '''
+    HEADER = struct.Struct("<I")
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__()
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.setblocking(False)
+        self.address = self.socket.getsockname()
+        self.sequence = -1
+        self.state = InputState()
+
+    @staticmethod
+    def encode(sequence, state):
+        '''Builds a datagram for a NetworkInputSource.'''
+        return NetworkInputSource.HEADER.pack(sequence) + state.pack()
+
+    def next_state(self):
+        while True:
+            try:
+                data = self.socket.recv(64)
+            except (BlockingIOError, InterruptedError):
+                break
+            sequence, = NetworkInputSource.HEADER.unpack_from(data)
+            if sequence > self.sequence:
+                self.sequence = sequence
+                self.state = InputState.unpack(data[NetworkInputSource.HEADER.size:])
+        return self.state
+
+    def close(self):
+        self.socket.close()
+
+class LossyLink():
+    '''
+    Sends datagrams through a socket after a simulated delay, dropping a share of
+    them, so netplay can be tried on localhost under realistic conditions.
+    Delayed datagrams go out on the first pump() after they fall due.
+    '''
+    def __init__(self, sock, latency_ms=0, jitter_ms=0, loss=0.0, seed=None):
+        """
+        Args:
+            sock (socket.socket): UDP socket to send through
+            latency_ms (float): One-way delay added to every datagram
+            jitter_ms (float): Random extra delay either side of the latency
+            loss (float): Fraction of datagrams dropped (0 to 1)
+            seed (int): Seed for the drop and jitter choices (kept apart from the gameplay RNG)
+        """
+        self.socket = sock
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.loss = loss
+        self.random = random.Random(seed)
+        self.queue = []   # Heap of (due time, order, data, address)
+        self.order = 0
+        self.sent = 0     # Datagrams handed to send(), dropped ones included
+        self.dropped = 0
+
+    def send(self, data, address):
+        '''Sends a datagram now, later, or never.'''
+        self.sent += 1
+        if self.loss and self.random.random() < self.loss:
+            self.dropped += 1
+            return
+        if not self.latency and not self.jitter:
+            self.socket.sendto(data, address)
+            return
+        delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        heapq.heappush(self.queue, (time.perf_counter() + delay, self.order, data, address))
+        self.order += 1
+
+    def pump(self):
+        '''Sends every delayed datagram that has fallen due.'''
+        now = time.perf_counter()
+        while self.queue and self.queue[0][0] <= now:
+            _, _, data, address = heapq.heappop(self.queue)
+            self.socket.sendto(data, address)
+
+class NetServer(InputSource):
+    """
+    Authoritative co-op server over UDP. The server runs the Game; clients send an
+    input frame every frame and get back a snapshot of every tick (ships, enemies,
+    bullets, powerups, score, lives, ammo and waves completed).
+    Each snapshot is a delta against the last tick its client acknowledged, with
+    positions quantized to QUANTUM pixels: unchanged entities are left out, moved
+    ones cost 4 bytes, and only new ones are sent whole. Without an acknowledged
+    tick in the history the snapshot is sent whole.
+    Slot 0 plays through this input source like a local player; slot 1 flies a
+    Wingman. Entities are read from the sprite groups, so the game must use them
+    (no entity store or vector enemy engine); nothing is shown, so make the game
+    with draw=False.
+    """
+    INPUT = struct.Struct("<BII")       # slot, input sequence, newest snapshot tick received;
+                                        # followed by an InputState record
+    HEADER = struct.Struct("<IIIBBH?")  # tick, base tick (0 = whole), score, lives, ammo,
+                                        # waves completed, game over
+    SPAWN = struct.Struct("<HBBhh")     # net id, kind, asset, x, y: new or replaced entities
+    MOVE = struct.Struct("<Hbb")        # net id, x and y change since the base tick
+    REMOVE = struct.Struct("<H")        # net id
+    SHIP, SPRITE = 0, 1  # Entity kinds: asset is a ship index, or a GameSnapshot asset id
+    QUANTUM = 2          # Pixels per position unit
+    HISTORY = 64         # Ticks kept as delta baselines
+    SLOTS = 2
+
+    def __init__(self, host="127.0.0.1", port=0, wingman_ship="SHIP2",
+                 latency_ms=0, jitter_ms=0, loss=0.0, seed=None):
+        """
+        Args:
+            host (str): Address to listen on
+            port (int): UDP port (0 picks a free one; see self.address)
+            wingman_ship (str): Ship ID the slot 1 client flies
+            latency_ms, jitter_ms, loss, seed: Simulated conditions for outgoing
+                                               snapshots (see LossyLink)
+        """
+        super().__init__()
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.setblocking(False)
+        self.address = self.socket.getsockname()
+        self.link = LossyLink(self.socket, latency_ms, jitter_ms, loss, seed)
+        self.wingman_ship = wingman_ship
+        self.wingman = None
+
+        # Per slot client state
+        self.addresses = [None] * NetServer.SLOTS
+        self.sequences = [0] * NetServer.SLOTS
+        self.acked = [0] * NetServer.SLOTS         # Newest tick each client has
+        self.inputs = [InputState()] * NetServer.SLOTS
+
+        self.tick = 0
+        self.history = {}   # Tick -> {net id: (kind, asset, x, y)}
+        self.hud = None     # This tick's (score, lives, ammo, waves completed, game over)
+        self.ids = {}       # Sprite -> net id
+        self.next_id = 1
+
+        # Per tick costs
+        self.tick_ms = array("d")
+        self.encode_ms = array("d")
+        self.bytes = array("I")
+        self.snapshots = 0
+        self.whole = 0      # Snapshots sent without a baseline
+
+    def next_state(self):
+        '''Reads every waiting input frame; slot 0's latest drives the game.'''
+        S = NetServer
+        while True:
+            try:
+                data, address = self.socket.recvfrom(64)
+            except (BlockingIOError, InterruptedError):
+                break
+            if len(data) != S.INPUT.size + InputState.RECORD.size:
+                continue
+            slot, sequence, acked = S.INPUT.unpack_from(data)
+            if slot >= S.SLOTS:
+                continue
+            if address != self.addresses[slot]:  # New client takes the slot over
+                self.addresses[slot] = address
+                self.sequences[slot] = 0
+                self.acked[slot] = 0
+            self.acked[slot] = max(self.acked[slot], acked)
+            if sequence > self.sequences[slot]:
+                self.sequences[slot] = sequence
+                self.inputs[slot] = InputState.unpack(data[S.INPUT.size:])
+        return self.inputs[0]
+
+    def step(self, game):
+        '''Runs one server tick: the game's frame, then a snapshot to every client.'''
+        start = time.perf_counter()
+        game.process_events()  # Reads client input through next_state()
+        if game.current_state == "MENU":
+            game.current_state = "PLAY"  # Leaving a finished game starts a new one
+        self.join_wingman(game)
+        steps = game.game_clock.frame() if game.current_state == "PLAY" else 1
+        for _ in range(steps):
+            game.global_UI_elements()
+            game.states[game.current_state][0]()
+        simulated = time.perf_counter()
+        self.broadcast(game)
+        self.link.pump()
+        end = time.perf_counter()
+        self.tick_ms.append((end - start) * 1000)
+        self.encode_ms.append((end - simulated) * 1000)
+        game.metrics.add("net_ms", (end - simulated) * 1000)
+
+    def join_wingman(self, game):
+        '''Puts slot 1's Wingman in play once it connects, and back after a game over.'''
+        if self.addresses[1] is None:
+            return
+        if (self.wingman is None or not self.wingman.alive()) and not game.GAME_OVER:
+            self.wingman = Wingman(self.wingman_ship)
+            game.player_group.add(self.wingman)
+        if self.wingman:
+            self.wingman.input = self.inputs[1]
+
+    def serve(self, game, ticks=None):
+        '''Runs ticks at GameClock.FPS until the game quits, or for a number of ticks.'''
+        period = 1 / GameClock.FPS
+        due = time.perf_counter()
+        while game.running and (ticks is None or self.tick < ticks):
+            self.step(game)
+            due += period
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                due = time.perf_counter()  # Fell behind; don't rush to catch up
+
+    def world(self, game):
+        '''Returns this tick's entities as {net id: (kind, asset, x, y)}, positions quantized.'''
+        q = NetServer.QUANTUM
+        entities = [(NetServer.SHIP, int(ship.selected_ship[4:]) - 1, ship) for ship in game.player_group]
+        for group in (game.enemy_group, game.bullet_player_group, game.bullet_enemy_group, game.powerup_group):
+            entities.extend((NetServer.SPRITE, GameSnapshot.asset_id(sprite.image), sprite) for sprite in group)
+        world, ids = {}, {}
+        live = None  # Ids held last tick or handed out this one, built on the first new sprite
+        for kind, asset, sprite in entities:
+            net_id = self.ids.get(sprite)
+            if net_id is None:
+                if live is None:
+                    live = set(self.ids.values())
+                net_id = self.next_id
+                while net_id in live:  # After wrapping around, skip ids still in use
+                    net_id = net_id % 65535 + 1
+                self.next_id = net_id % 65535 + 1
+                live.add(net_id)
+            ids[sprite] = net_id
+            world[net_id] = (kind, asset, sprite.rect.x // q, sprite.rect.y // q)
+        self.ids = ids  # Forget sprites that are gone
+        return world
+
+    def broadcast(self, game):
+        '''Records this tick's world and sends each client its delta.'''
+        self.tick += 1
+        world = self.world(game)
+        self.history[self.tick] = world
+        self.history.pop(self.tick - NetServer.HISTORY, None)
+        player = game.player
+        self.hud = (player.score, player.lives, player.ammo, game.total_waves_completed, game.GAME_OVER)
+        sent = 0
+        for slot, address in enumerate(self.addresses):
+            if address is not None:
+                data = self.encode(self.tick, world, self.acked[slot])
+                self.link.send(data, address)
+                sent += len(data)
+                self.snapshots += 1
+                self.whole += self.acked[slot] not in self.history
+        self.bytes.append(sent)
+
+    def encode(self, tick, world, base_tick):
+        '''
+        Returns a snapshot of a recorded tick as a delta against base_tick, or whole
+        when base_tick is 0 or has left the history.
+        '''
+        S = NetServer
+        base = self.history.get(base_tick)
+        if base is None:
+            base_tick, base = 0, {}
+        spawned, moved = [], []
+        for net_id, entity in world.items():
+            old = base.get(net_id)
+            if old == entity:
+                continue
+            if old is not None and old[:2] == entity[:2]:
+                dx, dy = entity[2] - old[2], entity[3] - old[3]
+                if -128 <= dx < 128 and -128 <= dy < 128:
+                    moved.append((net_id, dx, dy))
+                    continue
+            spawned.append((net_id, *entity))
+        removed = [(net_id,) for net_id in base if net_id not in world]
+        chunks = [S.HEADER.pack(tick, base_tick, *self.hud)]
+        GameSnapshot.pack_list(chunks, S.SPAWN, spawned)
+        GameSnapshot.pack_list(chunks, S.MOVE, moved)
+        GameSnapshot.pack_list(chunks, S.REMOVE, removed)
+        return b"".join(chunks)
+
+    @staticmethod
+    def decode(data, history):
+        '''
+        Rebuilds a snapshot made by encode() on top of its base tick's world.
+
+        Args:
+            data (bytes): The snapshot datagram
+            history (dict): Tick -> world already decoded
+
+        Returns:
+            tuple: (tick, world, hud), or None when the base tick isn't in the history
+        '''
+        S = NetServer
+        view = memoryview(data)
+        offset = 0
+
+        def read_list(record):
+            nonlocal offset
+            count, = GameSnapshot.COUNT.unpack_from(view, offset)
+            offset += GameSnapshot.COUNT.size
+            rows = [record.unpack_from(view, offset + i * record.size) for i in range(count)]
+            offset += count * record.size
+            return rows
+
+        tick, base_tick, *hud = S.HEADER.unpack_from(view)
+        offset = S.HEADER.size
+        base = history.get(base_tick)
+        if base_tick and base is None:
+            return None
+        world = dict(base or {})
+        for net_id, *entity in read_list(S.SPAWN):
+            world[net_id] = tuple(entity)
+        for net_id, dx, dy in read_list(S.MOVE):
+            kind, asset, x, y = world[net_id]
+            world[net_id] = (kind, asset, x + dx, y + dy)
+        for net_id, in read_list(S.REMOVE):
+            del world[net_id]
+        return tick, world, tuple(hud)
+
+    def stats(self):
+        '''Returns per tick traffic and cost so far.'''
+        ticks = max(len(self.tick_ms), 1)
+        return {
+            "ticks": len(self.tick_ms),
+            "bytes_per_tick": sum(self.bytes) / ticks,
+            "bytes_per_snapshot": sum(self.bytes) / max(self.snapshots, 1),
+            "whole": self.whole,
+            "snapshots": self.snapshots,
+            "tick_ms": sum(self.tick_ms) / ticks,
+            "worst_tick_ms": max(self.tick_ms, default=0.0),
+            "encode_ms": sum(self.encode_ms) / ticks,
+        }
+
+    def close(self):
+        self.socket.close()
+
+    @staticmethod
+    def benchmark(conditions=((0, 0, 0.0), (50, 10, 0.05), (100, 30, 0.2)), ticks=600):
+        """
+        Plays co-op on localhost, server and two clients in one process at 60 ticks
+        per second, under each set of simulated network conditions. Both ships weave
+        and fire and are kept alive and armed so every run carries a busy game's traffic.
+
+        Args:
+            conditions (tuple): (latency ms, jitter ms, loss) per run, both directions
+            ticks (int): Server ticks per run
+
+        Returns:
+            dict: Results by condition: server stats, client stats, the average size
+                  of the same snapshots sent whole, and the share of client worlds
+                  that matched the server's exactly
+        """
+        results = {}
+        surface = pygame.Surface((400, 600))
+        LazyAsset.load_all()  # Keep first-use loading out of the tick costs
+        for latency, jitter, loss in conditions:
+            server = NetServer(latency_ms=latency, jitter_ms=jitter, loss=loss, seed=1)
+            with BenchmarkRun() as run:
+                game = run.game(server, headless=True, draw=False)
+                game.current_state = "PLAY"
+                clients = [NetClient(server.address, slot, latency, jitter, loss, seed=slot + 2)
+                           for slot in range(NetServer.SLOTS)]
+                whole_bytes = checked = exact = 0
+                due = time.perf_counter()
+                for frame in range(ticks):
+                    for client in clients:
+                        steer = pygame.K_a if (frame // 60 + client.slot) % 2 else pygame.K_d
+                        client.send(InputState([pygame.K_SPACE, steer]))
+                    server.step(game)
+                    whole_bytes += len(server.encode(server.tick, server.history[server.tick], 0))
+                    run.keep_alive(game)
+                    game.player.ammo = 30  # Keep firing, so traffic stays representative
+                    for client in clients:
+                        client.receive()
+                        view = client.view()
+                        if view:
+                            client.render(surface, *view)
+                        if client.latest in server.history:
+                            checked += 1
+                            exact += client.worlds[client.latest] == server.history[client.latest]
+                    due += 1 / GameClock.FPS
+                    time.sleep(max(0.0, due - time.perf_counter()))
+            results[latency, jitter, loss] = {
+                "server": server.stats(),
+                "clients": [client.stats() for client in clients],
+                "whole_bytes": whole_bytes / ticks,
+                "exact": exact / max(checked, 1),
+            }
+            for client in clients:
+                client.close()
+            server.close()
+        return results
+
+class NetClient():
+    """
+    Co-op client for a NetServer. Sends its input every frame, acknowledging the
+    newest snapshot it has, and draws the game INTERP_TICKS behind that snapshot,
+    interpolating between the snapshots either side of the render tick so late or
+    lost snapshots don't show as stutter. There is no local prediction: your own
+    ship moves a round trip after your keys.
+    """
+    INTERP_TICKS = 3   # Render delay behind the newest snapshot
+    MAX_LERP = 32      # Quantized distance above which an entity jumps (screen wrap)
+
+    def __init__(self, address, slot=0, latency_ms=0, jitter_ms=0, loss=0.0, seed=None):
+        """
+        Args:
+            address (tuple): Server (host, port)
+            slot (int): 0 for the lead player, 1 for the wingman
+            latency_ms, jitter_ms, loss, seed: Simulated conditions for outgoing
+                                               input (see LossyLink)
+        """
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("", 0))
+        self.socket.setblocking(False)
+        self.link = LossyLink(self.socket, latency_ms, jitter_ms, loss, seed)
+        self.server = address
+        self.slot = slot
+        self.sequence = 0
+        self.worlds = {}        # Tick -> {net id: (kind, asset, x, y)}
+        self.huds = {}          # Tick -> (score, lives, ammo, waves completed, game over)
+        self.latest = 0         # Newest tick decoded
+        self.first = 0          # First tick decoded
+        self.render_tick = None
+        self.background = None  # ScrollingBackground, made with the first frame
+
+        self.received = 0
+        self.decoded = 0
+        self.bytes = 0
+        self.unusable = 0       # Snapshots whose base tick had been dropped
+        self.stalls = 0         # Frames with no newer snapshot to move towards
+
+    def send(self, state):
+        '''Sends this frame's input (an InputState) with the newest tick received.'''
+        self.sequence += 1
+        self.link.send(NetServer.INPUT.pack(self.slot, self.sequence, self.latest) + state.pack(), self.server)
+        self.link.pump()
+
+    def receive(self):
+        '''Decodes every waiting snapshot.'''
+        while True:
+            try:
+                data = self.socket.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            self.received += 1
+            self.bytes += len(data)
+            tick, = struct.unpack_from("<I", data)
+            if tick in self.worlds or tick < self.latest - NetServer.HISTORY:
+                continue
+            decoded = NetServer.decode(data, self.worlds)
+            if decoded is None:
+                self.unusable += 1
+                continue
+            tick, self.worlds[tick], self.huds[tick] = decoded
+            self.decoded += 1
+            self.first = self.first or tick
+            if tick > self.latest:
+                self.latest = tick
+                for old in [t for t in self.worlds if t <= tick - 2 * NetServer.HISTORY]:
+                    del self.worlds[old], self.huds[old]
+
+    def view(self):
+        '''
+        Moves the render tick on one frame.
+
+        Returns:
+            tuple: (entities as (kind, asset, x, y) in pixels, hud) at the render
+                   tick, or None before the first snapshot
+        '''
+        if not self.latest:
+            return None
+        target = self.latest - NetClient.INTERP_TICKS
+        if self.render_tick is None or abs(self.render_tick + 1 - target) > 2 * NetClient.INTERP_TICKS:
+            self.render_tick = target  # First frame or far off: jump to the target delay
+        else:
+            self.render_tick += 1
+        self.render_tick = min(self.render_tick, self.latest)
+        ticks = self.worlds.keys()
+        before = max((t for t in ticks if t <= self.render_tick), default=None)
+        after = min((t for t in ticks if t > self.render_tick), default=None)
+        if before is None:
+            before, after = after, None
+        world, hud = self.worlds[before], self.huds[before]
+        if after is None:
+            self.stalls += 1
+            return self.place(world, world, 0), hud
+        return self.place(world, self.worlds[after], (self.render_tick - before) / (after - before)), hud
+
+    @staticmethod
+    def place(world, next_world, t):
+        '''Returns a world's entities in pixels, t of the way towards next_world.'''
+        q = NetServer.QUANTUM
+        entities = []
+        for net_id, (kind, asset, x, y) in world.items():
+            other = next_world.get(net_id)
+            if (other is not None and other[:2] == (kind, asset)
+                    and abs(other[2] - x) < NetClient.MAX_LERP and abs(other[3] - y) < NetClient.MAX_LERP):
+                x += (other[2] - x) * t
+                y += (other[3] - y) * t
+            entities.append((kind, asset, round(x * q), round(y * q)))
+        return entities
+
+    def render(self, surface, entities, hud):
+        '''Draws the background, entities and HUD line onto a 400x600 surface.'''
+        if self.background is None:
+            self.background = ScrollingBackground([{"image": Game.BG_IMG["BG"], "speed": 0.5}])
+        self.background.render(surface, surface.get_width())
+        self.background.scroll()
+
+        ships, assets = Player.PLAYER_SHIP_LIST, GameSnapshot.assets()
+        surface.blits([(ships[asset] if kind == NetServer.SHIP else assets[asset], (x, y))
+                       for kind, asset, x, y in entities], False)
+
+        score, lives, ammo, waves, game_over = hud
+        font = BitmapFont.get(Game.FONT_SMALL)
+        font.render_to(surface, f"SCORE {score}  LIVES {lives}  AMMO {ammo}", Game.COLORS["WHITE"], (10, 10))
+        if game_over:
+            font.render_to(surface, "GAME OVER", Game.COLORS["YELLOW"], (145, 280))
+
+    def play(self):
+        '''Runs an interactive client window until it is closed.'''
+        screen = pygame.display.set_mode((400, 600))
+        pygame.display.set_caption(f"Cosmic Conflict (player {self.slot + 1})")
+        clock = pygame.time.Clock()
+        while not any(event.type == pygame.QUIT for event in pygame.event.get()):
+            pressed = pygame.key.get_pressed()
+            self.send(InputState([key for key in InputState.TRACKED_KEYS if pressed[key]]))
+            self.receive()
+            view = self.view()
+            if view:
+                self.render(screen, *view)
+            pygame.display.flip()
+            clock.tick(GameClock.FPS)
+        self.close()
+
+    def stats(self):
+        '''Returns what arrived and how smoothly it played.'''
+        return {
+            "received": self.received,
+            "bytes": self.bytes,
+            "lost": self.latest - self.first + 1 - self.decoded if self.latest else 0,
+            "unusable": self.unusable,
+            "stalls": self.stalls,
+        }
+
+    def close(self):
+        self.socket.close()
 
 class Cursor(pygame.sprite.Sprite):
     """
@@ -64,24 +2259,231 @@ class Cursor(pygame.sprite.Sprite):
     """
     def __init__(self, picture_path):
         """
-        initialises cursor with custom image and hides default cursor.
-        
+        initialises cursor with custom image and hides default cursor.
+        
+        Args:
+            picture_path (str): Path to cursor image file
+        """
+        super().__init__()
+        self.image = pygame.image.load(picture_path)  # Load cursor image
+        self.rect = self.image.get_rect()  # Get image rectangle
+        if pygame.display.get_init():
+            pygame.mouse.set_visible(False)  # Hide default mouse cursor
+
+    def update(self):
+        """Updates cursor position to follow mouse and renders it."""
+        self.track()
+        self.render()
+
+    def track(self):
+        """Moves cursor to the sampled mouse position."""
+        self.rect.center = (Game.instance.mx, Game.instance.my)
+
+    def element(self):
+        """Returns the cursor as a (surface, pos) element for retained screens."""
+        return (self.image, self.rect.topleft)
+
+    def render(self):
+        """Draws cursor at current mouse position."""
+        Game.instance.screen.blit(self.image, self.rect)
+
+class BitmapFont():
+    """
+    Glyph strip for one font size, rasterised once from the TTF.
+    Strings are composed by blitting sub-rects of the strip at each glyph's pen
+    position, which matches font.render(message, True, color) pixel for pixel for
+    printable ASCII. Other characters fall back to TTF rendering. Recently drawn
+    strings are kept composed, so unchanged HUD text costs a single blit.
+    """
+    FONTS = {}  # pygame.font.Font -> BitmapFont
+    FIRST, LAST = 32, 126  # Printable ASCII
+    CACHE_SIZE = 64  # Composed strings kept per font
+
+    @staticmethod
+    def get(font):
+        """Returns the glyph strip for a font, building it on first use."""
+        if font not in BitmapFont.FONTS:
+            BitmapFont.FONTS[font] = BitmapFont(font)
+        return BitmapFont.FONTS[font]
+
+    def __init__(self, font):
+        """
+        Args:
+            font (pygame.Font): Font to rasterise
+        """
+        self.font = font
+        self.glyphs = {}  # char -> (box x relative to the pen, pen advance, box within the strip)
+
+        rendered = {}
+        ink = {}  # char -> (ink left, ink right) relative to the pen
+        x = 0
+        for code in range(BitmapFont.FIRST, BitmapFont.LAST + 1):
+            char = chr(code)
+            minx, maxx, _, _, advance = font.metrics(char)[0]
+            rendered[char] = font.render(char, True, (255, 255, 255))
+            self.glyphs[char] = (min(0, minx), advance, rendered[char].get_rect(topleft=(x, 0)))
+            ink[char] = (minx, maxx)
+            x += rendered[char].get_width()
+
+        # Pairs whose ink overlaps; TTF merges those differently, so they fall back to it
+        self.overlaps = {(a, b) for a in ink for b in ink if ink[a][1] > self.glyphs[a][1] + ink[b][0]}
+
+        strip = pygame.Surface((x, max(glyph.get_height() for glyph in rendered.values())), pygame.SRCALPHA)
+        for char, glyph in rendered.items():
+            strip.blit(glyph, self.glyphs[char][2], special_flags=pygame.BLEND_RGBA_MAX)  # Exact copy
+        self.white = strip
+        self.strips = {}    # Tinted strips by color
+        self.composed = {}  # (message, color) -> composed surface
+
+    def strip(self, color):
+        """Returns the strip tinted to a color (glyphs are white, so multiplying is exact)."""
+        if color not in self.strips:
+            strip = self.white.copy()
+            strip.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+            self.strips[color] = display_format(strip)
+        return self.strips[color]
+
+    def render(self, message, color):
+        """
+        Composes a string from the strip, like font.render(message, True, color).
+
+        Returns:
+            pygame.Surface: The text, or None if it has characters the strip can't compose
+        """
+        glyphs, overlaps = self.glyphs, self.overlaps
+        pen = 0
+        boxes = []
+        previous = None
+        for char in message:
+            glyph = glyphs.get(char)
+            if glyph is None or (previous, char) in overlaps:
+                return None
+            boxes.append((pen + glyph[0], glyph[2]))
+            pen += glyph[1]
+            previous = char
+
+        # A leading overhang shifts the whole string right, as TTF does
+        shift = -min(0, boxes[0][0]) if boxes else 0
+        width = max([shift + box + rect.width for box, rect in boxes] + [pen + shift])
+        surface = pygame.Surface((width, self.white.get_height()), pygame.SRCALPHA)
+        strip = self.strip(color)
+        for box, rect in boxes:
+            surface.blit(strip, (shift + box, 0), rect, special_flags=pygame.BLEND_RGBA_MAX)  # Exact copy
+        return surface
+
+    def render_to(self, surface, message, color, pos):
+        """
+        Draws a string onto a surface.
+
+        Args:
+            surface (pygame.Surface): Destination
+            message (str): Text to draw
+            color (tuple): RGB color
+            pos (tuple): (x,y) top-left, as for blitting font.render()
+        """
+        key = (message, color)
+        text = self.composed.get(key)
+        if text is None:
+            text = self.render(message, color)
+            if text is None:
+                surface.blit(self.font.render(message, True, color), pos)
+                return
+            if len(self.composed) >= BitmapFont.CACHE_SIZE:
+                self.composed.clear()
+            self.composed[key] = text = display_format(text)
+        surface.blit(text, pos)
+
+class StaticScreen():
+    """
+    Retained-mode composition for a mostly static screen.
+    The static content is rendered once into a cached surface. Each frame only the
+    regions of elements (buttons, cursor) whose appearance changed are repainted, and
+    those regions are returned as dirty rects for display.update().
+    """
+    def __init__(self, build, dependencies=lambda: (), retained=True):
+        """
+        Args:
+            build (callable): Takes (width, height), returns the static content surface
+            dependencies (callable): Returns the data objects the content is built from;
+                                     the cache is rebuilt when any of them is replaced
+            retained (bool): False if the screen has an animated background, in which
+                             case the cached surface is an overlay and every frame is full
+        """
+        self.build = build
+        self.dependencies = dependencies
+        self.retained = retained
+        self.surface = None      # Cached static content
+        self.built_from = None   # Dependencies the cache was built from
+        self.drawn = []          # (key, rect) of each element as last drawn
+
+    def invalidate(self):
+        """Forces the static content to be rebuilt on next use."""
+        self.surface = None
+
+    def compose(self, screen, elements, full):
+        """
+        Draws the screen and its elements.
+
         Args:
-            picture_path (str): Path to cursor image file
+            screen (pygame.Surface): Display surface
+            elements (list): (surface, pos) per element, or None for an absent element
+            full (bool): Whether the whole screen must be redrawn
+
+        Returns:
+            list: Dirty rects, or None if the whole screen was redrawn
         """
-        super().__init__()
-        self.image = pygame.image.load(picture_path)  # Load cursor image
-        self.rect = self.image.get_rect()  # Get image rectangle
-        pygame.mouse.set_visible(False)  # Hide default mouse cursor
+        dependencies = self.dependencies()
+        if (self.surface is None or self.surface.get_size() != screen.get_size()
+                or self.built_from is None or any(a is not b for a, b in zip(dependencies, self.built_from))):
+            self.surface = self.build(*screen.get_size())
+            self.built_from = dependencies
+            full = True
 
-    def update(self):
-        """Updates cursor position to follow mouse and renders it."""
-        self.rect.center = pygame.mouse.get_pos()  # Track mouse position
-        self.render()
+        keys, rects = [], []
+        for element in elements:
+            if element is None:
+                keys.append(None)
+                rects.append(None)
+            else:
+                surface, pos = element
+                keys.append((id(surface), surface.get_alpha(), tuple(pos)))
+                rects.append(surface.get_rect(topleft=pos))
 
-    def render(self):
-        """Draws cursor at current mouse position."""
-        Game.instance.screen.blit(self.image, self.rect)
+        if full or not self.retained or len(self.drawn) != len(elements):
+            screen.blit(self.surface, (0, 0))
+            for element in elements:
+                if element is not None:
+                    screen.blit(*element)
+            self.drawn = list(zip(keys, rects))
+            return None
+
+        # Damage from elements that changed since last frame
+        damage = []
+        for (old_key, old_rect), key, rect in zip(self.drawn, keys, rects):
+            if old_key != key:
+                damage.extend(r for r in (old_rect, rect) if r is not None)
+        if not damage:
+            return []
+
+        # Any element touching damage is repainted whole, which may widen the damage
+        repaint = set()
+        grown = True
+        while grown:
+            grown = False
+            for i, rect in enumerate(rects):
+                if rect is not None and i not in repaint and rect.collidelist(damage) != -1:
+                    repaint.add(i)
+                    damage.append(rect)
+                    grown = True
+
+        for rect in damage:
+            screen.blit(self.surface, rect, rect)
+        for i, element in enumerate(elements):
+            if i in repaint:
+                screen.blit(*element)
+
+        self.drawn = list(zip(keys, rects))
+        return damage
 
 class Game():
     """
@@ -103,16 +2505,16 @@ class Game():
         "ORANGE": (255, 180, 0)
     }
     
-    # Font assets
-    FONT_LARGE = pygame.font.Font("assets/8-BIT WONDER.TTF", 32)
-    FONT_MEDIUM = pygame.font.Font("assets/8-BIT WONDER.TTF", 28)
-    FONT_SMALL = pygame.font.Font("assets/8-BIT WONDER.TTF", 18)
+    # Font assets (loaded on first use)
+    FONT_LARGE = LazyAsset(lambda: load_font(32), "font", "MENU")
+    FONT_MEDIUM = LazyAsset(lambda: load_font(28), "font", "MENU")
+    FONT_SMALL = LazyAsset(lambda: load_font(18), "font", "MENU")
 
     # Background images
-    BG_IMG = {
-        "BG": pygame.image.load("assets/background/background.png"),
-        "OVERLAY": pygame.image.load("assets/background/bg_overlay.png")
-    }
+    BG_IMG = LazyAsset(lambda: {
+        "BG": load_image("assets/background/background.png"),
+        "OVERLAY": load_image("assets/background/bg_overlay.png")
+    }, "image", "MENU")
     
     @staticmethod
     def load_json_text(filename):
@@ -129,15 +2531,16 @@ class Game():
             return json.load(file)  
         
     # Game assets
-    SHIP_LIST = [pygame.image.load(f"assets/playerships/ship{i}.png") for i in range(1,7)]  # Player ship options
-    BULLET_LIST = {
-        "player": pygame.image.load("assets/bullets/player_bullet.png"), 
-        "enemy": pygame.image.load("assets/bullets/enemy_bullet.png")
-    }
+    SHIP_LIST = LazyAsset(lambda: load_images("assets/playerships/ship{}.png", range(1,7)), "image", "ARMOURY")  # Player ship options
+    BULLET_LIST = LazyAsset(lambda: {
+        "player": load_image("assets/bullets/player_bullet.png"), 
+        "enemy": load_image("assets/bullets/enemy_bullet.png")
+    }, "image")
+    HEART_IMG = LazyAsset(lambda: load_images("assets/misc/heart{}.png", range(1,3)), "image")  # HUD lives
     
     # Game data loaded from files
-    SHIP_DATA = load_json_text("data/ship_data.json")  # Ship attributes
-    GAME_TEXT = load_json_text("data/game_text.json")  # Help text
+    SHIP_DATA = LazyAsset(lambda: Game.load_json_text(asset_path("data/ship_data.json")), "data", "ARMOURY")  # Ship attributes
+    GAME_TEXT = LazyAsset(lambda: Game.load_json_text(asset_path("data/game_text.json")), "data", "MENU")  # Help text
     
     # Default game configuration
     CONFIG = {
@@ -160,39 +2563,128 @@ class Game():
     GROUPS = [planet_group, enemy_group, bullet_player_group, 
               bullet_enemy_group, player_group, powerup_group, effect_group]
 
-    def __init__(self):
-        """initialises game window, assets, and game state."""
+    def __init__(self, input_source=None, entity_store=False, headless=False, telemetry=None, watch_config=False,
+                 pacing="coarse", quality_scaling=True, scale=1, scale_mode="transform", vector_enemies=False,
+                 time_scale=1.0, memory_profiler=None, capture=None, draw=True, stress=None, data=None):
+        """
+        initialises game window, assets, and game state.
+
+        Args:
+            input_source (InputSource): Where input comes from (live keyboard/mouse by default)
+            entity_store (bool): Keep enemies, bullets and powerups in an EntityStore
+                                 instead of as individual sprites
+            headless (bool): Draw into an in-memory surface and make no display,
+                             event or timer calls
+            telemetry (Telemetry): Gameplay event log (disabled by default)
+            watch_config (bool): Reload ship data and game text when their files change
+            pacing (str): Frame pacing mode, one of FramePacer.MODES
+            quality_scaling (bool): Shed optional work when frames run over budget
+            scale (int): Integer window scale; the game always draws at logical size
+            scale_mode (str): "transform" scales the frame with transform.scale,
+                              "sdl" opens a pygame.SCALED window instead
+            vector_enemies (bool): Move enemies with the NumPy EnemyEngine
+            time_scale (float): Simulation steps per displayed frame (GameClock scale)
+            capture (FrameCapture): Records presented frames (disabled by default)
+            memory_profiler (MemoryProfiler): Snapshots memory at wave transitions
+                                              (disabled by default)
+            draw (bool): When headless, False draws into a 1x1 surface so every blit
+                         clips away and frames cost only the simulation
+            stress (StressMode): Replaces the waves with endless stress waves and
+                                 records frame costs (off by default)
+            data (Data): Score database and cache (the game's data/ folder by default)
+        """
         Game.instance = self  # Set singleton instance
+        self.headless = headless
+        self.draw = draw
         
-        # Window dimensions
+        # Window dimensions (logical; the window is scale times larger)
         self.width = 400
         self.height = 600
+        self.scale = 1 if headless else scale
+        self.scale_mode = scale_mode
+        self.window = None  # Real display surface when scaling with transform.scale
 
         # Screen setup
-        self.screen = pygame.display.set_mode((self.width, self.height))
+        self.open_screen()
         self.clock = pygame.time.Clock()  # For controlling frame rate
+        self.game_clock = GameClock(time_scale)  # Simulation time for gameplay systems
+        if not headless:
+            self.load_assets()  # Decode images and data in parallel behind a loading screen
+
+        # Batched effect renderer (explosions)
+        EffectSystem.register_sequence("explosion", EffectSystem.EXPLOSION_IMG,
+                                      EffectSystem.EXPLOSION_FRAME_DURATION)
+        self.effects = EffectSystem()
+
+        # Optional array-backed entity core; the adapter groups shadow the class groups
+        self.entities = None
+        if entity_store:
+            self.entities = EntityStore()
+            self.enemy_group = EntityGroup(self.entities, EntityStore.ENEMIES, self.entities.update_enemies)
+            self.bullet_player_group = EntityGroup(self.entities, (EntityStore.PLAYER_BULLET,), self.entities.update_player_bullets)
+            self.bullet_enemy_group = EntityGroup(self.entities, (EntityStore.ENEMY_BULLET,), self.entities.update_enemy_bullets)
+            self.powerup_group = EntityGroup(self.entities, (EntityStore.LIFE_POWERUP,), self.entities.update_powerups)
+            self.GROUPS = [self.planet_group, self.enemy_group, self.bullet_player_group,
+                           self.bullet_enemy_group, self.player_group, self.powerup_group, self.effect_group]
+
+        # Optional NumPy enemy engine, behind the same kind of adapter group
+        self.enemy_engine = None
+        if vector_enemies:
+            if entity_store:
+                raise ValueError("Choose either the entity store or the vector enemy engine")
+            self.enemy_engine = EnemyEngine()
+            self.enemy_group = EnemyEngineGroup(self.enemy_engine)
+            self.GROUPS = [self.planet_group, self.enemy_group, self.bullet_player_group,
+                           self.bullet_enemy_group, self.player_group, self.powerup_group, self.effect_group]
        
         # Game control attributes
         self.current_state = "MENU"  # Starting state
         self.running = True          # Main game loop flag
         self.click = False           # Mouse click state
+        self.mx, self.my = 0, 0      # Mouse position, sampled once per frame
+        self.dirty_rects = None      # Regions to present this frame (None = whole screen)
+        self.composed_state = None   # Retained screen currently on the display
+        self.input_source = input_source or (InputSource() if headless else LiveInputSource())
+        self.input = InputState()    # This frame's input snapshot
+        self.metrics = Metrics()     # Engine counters
+        self.telemetry = telemetry or Telemetry()  # Gameplay event log
+        self.telemetry.ticks = self.game_clock.ticks
+        self.memory = memory_profiler or MemoryProfiler()  # Memory snapshots per wave
+        self.capture = capture or FrameCapture()  # Frame recording
+        self.stress = stress  # Endless stress waves, if enabled
+        self.config_watcher = ConfigWatcher() if watch_config else None  # Data file hot reload
+        self.pacer = FramePacer(self.clock, 60, pacing)  # Ends frames at 60 FPS
+        self.quality = QualityGovernor(self.metrics, 1000 / 60, quality_scaling)  # Sheds work over budget
 
-        # Background positioning
-        self.BG_default_y = -self.BG_IMG["BG"].get_height()/2
-        self.BG_default_x = -self.BG_IMG["BG"].get_width()/3
-        self.BG_y = self.BG_default_y
-        self.BG_x = self.BG_default_x
+        # Scrolling background, and the part of the HUD background the window shows
+        self.background = ScrollingBackground([{"image": self.BG_IMG["BG"], "speed": 0.5}])
+        self.hud_panel = None
        
+        # Custom events
+        self.WAVE_EVENT = pygame.USEREVENT + 0  # Wave timer event
+        self.POWER_UP = pygame.USEREVENT + 1  # Powerup spawn event
+
         # Game state handlers dictionary
-        # Maps state names to their update and event handler methods
+        # Maps state names to their update method and event dispatch table (event type -> handler)
         self.states = {
-            "MENU": [self.menu, self.menu_event_handler],
-            "PLAY": [self.play, self.play_event_handler],
-            "OPTIONS": [self.options, self.options_event_handler],
-            "ARMOURY": [self.armoury, self.armoury_event_handler],
-            "HELP": [self.help, self.help_event_handler],
-            "PAUSE": [self.pause, self.pause_event_handler]
+            "MENU": [self.menu, {pygame.MOUSEBUTTONDOWN: self.mouse_click_event}],
+            "PLAY": [self.play, {
+                pygame.KEYDOWN: self.play_key_event,
+                self.WAVE_EVENT: self.wave_event,
+                self.POWER_UP: self.powerup_event}],
+            "OPTIONS": [self.options, {pygame.MOUSEBUTTONDOWN: self.mouse_click_event}],
+            "ARMOURY": [self.armoury, {pygame.MOUSEBUTTONDOWN: self.mouse_click_event}],
+            "HELP": [self.help, {pygame.MOUSEBUTTONDOWN: self.mouse_click_event}],
+            "PAUSE": [self.pause, {pygame.KEYDOWN: self.pause_key_event}]
         }
+        self.event_filter_state = None  # State whose event filter is active in SDL
+
+        # Event types the per-state filter may block
+        self.FILTERED_EVENTS = [
+            pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+            pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT, pygame.TEXTEDITING,
+            pygame.ACTIVEEVENT, pygame.VIDEOEXPOSE, pygame.WINDOWMOVED, pygame.WINDOWENTER, pygame.WINDOWLEAVE
+        ]
       
         # Text buttons organized by screen
         self.text_buttons = {
@@ -231,17 +2723,30 @@ class Game():
           
         # Initialise with first ship's description
         self.selected_ship_description = Game.instance.SHIP_DATA.get("SHIP1")
+        self.ship_descriptions = {}  # Pre-rendered descriptions by ship name
+        self.overlays = {}  # Semi-transparent screen overlays by (width, height, alpha)
+
+        # Screens whose static content is rendered once and cached
+        self.static_screens = {
+            "HELP": StaticScreen(self.build_help, lambda: (Game.GAME_TEXT,)),
+            "ARMOURY": StaticScreen(self.build_armoury, lambda: (Game.SHIP_DATA,)),
+            "OPTIONS": StaticScreen(self.build_options, retained=False)
+        }
       
         # Initialise player with default ship
         self.player = Player("SHIP1")
         self.player_group.add(self.player)
-        self.data = Data()  # High score handler
-        self.cursor = Cursor("assets/misc/cursor.png")  # Custom cursor
+        self.data = data or Data()  # Score database and cache
+        self.cursor = Cursor(asset_path("assets/misc/cursor.png"))  # Custom cursor
         
         # Initialise game objects
+        self.planets = PlanetFactory(Planet.LAYERS, seed=random.randrange(2**32))  # Prepares planets off-thread
         self.initialise_planets()
-        self.initialise_hearts()
-        self.initialise_bullets()
+
+        # HUD counters, drawn from the player's lives and ammo
+        self.lives_counter = CounterWidget(Game.HEART_IMG[0], (450, 65), (100, 100), 3)
+        # Rounds sit where the old sprite HUD put them for the default ship
+        self.ammo_counter = CounterWidget(Bullet.image_for(True), (508, 470), (40, 15), 6, vertical=True)
 
         # Wave system attributes
         self.current_wave = 0  # Current wave index
@@ -250,6 +2755,7 @@ class Game():
         self.in_wave = False   # Wave active flag
         self.enemies_spawned = False  # Enemy spawn flag
         self.total_waves_completed = 0  # Total waves completed
+        self.start_run()
         
         self.last_spawn_time = 0  # Last enemy spawn time
         self.spawn_interval = 1700  # ms between spawns
@@ -259,20 +2765,12 @@ class Game():
             self.wave_1,  # Standard enemies 
             self.wave_2   # Diagonal enemies
         ]
+        if stress:
+            self.waves = [self.wave_stress]  # One ramping wave, repeated forever
         
-        # Custom events
-        self.WAVE_EVENT = pygame.USEREVENT + 0  # Wave timer event
-        pygame.time.set_timer(self.WAVE_EVENT, 1000)  # Trigger every second
-        
-        self.POWER_UP = pygame.USEREVENT + 1  # Powerup spawn event
-        pygame.time.set_timer(self.POWER_UP, 5000)  # Trigger every 5 seconds
-
-        # Pause system attributes
-        self.pause_data = {
-            'start_time': 0,      # When pause started
-            'total_paused': 0,    # Total paused time
-            'is_paused': False    # Pause state flag
-        }
+        # Custom event timers, on simulation time
+        self.game_clock.set_timer(self.WAVE_EVENT, 1000)  # Trigger every second
+        self.game_clock.set_timer(self.POWER_UP, 5000)  # Trigger every 5 seconds
 
     # Wave definitions ----------------------------------------------------------
     def wave_1(self):        
@@ -285,7 +2783,7 @@ class Game():
             self.wave_duration = 15  # seconds
         
         # Spawning logic
-        current_time = pygame.time.get_ticks()
+        current_time = self.game_clock.ticks()
         if current_time - self.last_spawn_time >= self.spawn_interval:
             enemy = StandardEnemy()
             self.enemy_group.add(enemy)
@@ -296,6 +2794,7 @@ class Game():
             # Clean up any off-screen enemies
             for enemy in self.enemy_group:
                 if enemy.rect.y < 0:
+                    self.telemetry.record(Telemetry.DESPAWN, enemy.KIND, Telemetry.CLEARED)
                     enemy.kill()
             return True  # Wave complete
         return False
@@ -309,25 +2808,9 @@ class Game():
         if self.wave_timer == 0:
             self.wave_duration = 30  # seconds
         
-            # Formation positions
-            x, y = 30, 50    # Left group start position
-            x2, y2 = 200, -250  # Right group start position
-        
         if not self.enemies_spawned:
-            # Spawn left group (3 enemies)
-            for _ in range(3):
-                enemy = DiagonalEnemy(x, y)
-                y -= 100  # Move up for next enemy
-                x += 85  # Move right for next enemy
-                self.enemy_group.add(enemy)
-            
-            # Spawn right group (3 enemies)
-            for _ in range(3):
-                enemy = DiagonalEnemy(x2, y2)
-                y2 -= 100
-                x2 += 85
-                self.enemy_group.add(enemy)
-            
+            # Left group, then the right group further up (3 enemies each)
+            self.spawn_formation(DiagonalEnemy, Formation.diagonal(30, 50, 3) + Formation.diagonal(200, -250, 3))
             self.enemies_spawned = True
         
         # Completion conditions
@@ -335,8 +2818,38 @@ class Game():
             return True
         return False
 
+    def wave_stress(self):
+        """
+        Stress wave - spawns the StressMode ramp for the number of waves completed.
+        Runs for StressMode.WAVE_SECONDS; earlier waves' enemies stay in play.
+        """
+        if self.wave_timer == 0:
+            self.wave_duration = StressMode.WAVE_SECONDS
+            self.stress.spawn(self, self.total_waves_completed)
+        return self.wave_timer >= self.wave_duration
+
+    def spawn_formation(self, enemy_class, positions, motion=None, **params):
+        """
+        Spawns one enemy at every position of a formation in one call.
+
+        Args:
+            enemy_class (type): StandardEnemy or DiagonalEnemy
+            positions (list): (x, y) centres, e.g. from Formation
+            motion (int): EnemyEngine motion kind (vector engine only; sprites
+                          always move the way their class does)
+            **params: Motion parameters for EnemyEngine.adopt (amplitude, frequency,
+                      phase, path)
+        """
+        enemies = [enemy_class(x, y) for x, y in positions]
+        if self.enemy_engine is not None:
+            self.enemy_engine.adopt(enemies, motion, **params)
+        elif motion is not None or params:
+            raise ValueError("Custom enemy motion needs the vector enemy engine")
+        else:
+            self.enemy_group.add(*enemies)
+
     # Helper methods ------------------------------------------------------------
-    def text(self, message, font, color, pos):
+    def text(self, message, font, color, pos, bitmap=False):
         """
         Helper method to render text.
         
@@ -345,146 +2858,308 @@ class Game():
             font (pygame.Font): Font to use
             color (str): Key from COLORS dictionary
             pos (tuple): (x,y) screen position
+            bitmap (bool): Compose from the font's pre-rendered glyph strip instead of
+                           rasterising with TTF (same pixels, much cheaper per frame)
         """
+        if bitmap:
+            BitmapFont.get(font).render_to(self.screen, message, self.COLORS[color], pos)
+            return
         text_surface = font.render(message, True, self.COLORS[color])
         self.screen.blit(text_surface, pos)
 
     def set_screen_size(self, width):
         """Resizes game window while maintaining height."""
         self.width = width
-        self.screen = pygame.display.set_mode((self.width, self.height))
-    
-    def move_background(self):
-        """Animates background scrolling effect."""
-        self.BG_y += 0.5
+        self.open_screen()
+        self.composed_state = None  # New display surface needs a full redraw
+
+    def open_screen(self):
+        """
+        Creates the window, or an in-memory surface when headless, at the current size.
+        When scaled, self.screen is a logical-size surface and only presenting
+        touches the larger window.
+        """
+        if self.headless:
+            self.screen = pygame.Surface((self.width, self.height) if self.draw else (1, 1))
+            return
+        if self.scale > 1 and self.scale_mode == "sdl":
+            try:
+                self.screen = pygame.display.set_mode((self.width, self.height), pygame.SCALED)
+                # SCALED picks its own window size; make it exactly scale times the logical size
+                from pygame._sdl2.video import Window
+                Window.from_display_module().size = (self.width * self.scale, self.height * self.scale)
+                return
+            except (pygame.error, ImportError):  # No renderer for this video driver, or no window API
+                self.scale_mode = "transform"
+        if self.scale == 1:
+            self.screen = pygame.display.set_mode((self.width, self.height))
+        else:
+            self.window = pygame.display.set_mode((self.width * self.scale, self.height * self.scale))
+            self.screen = display_format(pygame.Surface((self.width, self.height)), alpha=False)
+
+    def load_assets(self, workers=4):
+        """
+        Loads every pending asset behind a progress bar.
+        Images and data are decoded on a thread pool (pygame releases the GIL while
+        decoding), MENU assets first, then ARMOURY, then PLAY. Each is converted to
+        the display format here on the main thread as it completes, and events keep
+        being pumped so the window stays responsive.
+
+        Args:
+            workers (int): Decoder threads
+        """
+        LazyAsset.load_all("font")  # The loading screen needs them first
+        with ThreadPoolExecutor(workers, thread_name_prefix="asset-loader") as pool:
+            pending = LazyAsset.preload(pool)
+            total = len(pending)
+            while pending:
+                if pygame.event.get(pygame.QUIT):
+                    for asset in pending:
+                        asset.future.cancel()
+                    raise SystemExit
+
+                # Finish whatever has been decoded, in priority order
+                for asset in [asset for asset in pending if asset.future.done()]:
+                    getattr(asset.owner, asset.name)
+                    pending.remove(asset)
+
+                # Progress bar
+                self.screen.fill(self.COLORS["bg_color"])
+                self.text("LOADING", self.FONT_SMALL, "WHITE", (self.width // 2 - 60, self.height // 2 - 40))
+                bar = pygame.Rect(50, self.height // 2, self.width - 100, 16)
+                pygame.draw.rect(self.screen, self.COLORS["WHITE"], bar, 2)
+                bar.width = round(bar.width * (total - len(pending)) / max(total, 1))
+                pygame.draw.rect(self.screen, self.COLORS["WHITE"], bar)
+                self.dirty_rects = None
+                self.present()
+
+                if pending:
+                    wait([asset.future for asset in pending], timeout=1 / 60, return_when=FIRST_COMPLETED)
+
+    def logical_pos(self, pos):
+        """Maps a window position to the logical surface (SCALED windows do this in SDL)."""
+        if self.window is None:
+            return pos
+        return pos[0] // self.scale, pos[1] // self.scale
+
+    def present(self):
+        """Shows this frame's dirty regions (or the whole frame), scaling them up if needed."""
+        if self.window is not None:
+            scale = self.scale
+            if self.dirty_rects is None:
+                pygame.transform.scale(self.screen, self.window.get_size(), self.window)
+            else:
+                rects = [pygame.Rect(rect).clip(self.screen.get_rect()) for rect in self.dirty_rects]
+                self.dirty_rects = []
+                for rect in rects:
+                    if rect:
+                        scaled = pygame.Rect(rect.x * scale, rect.y * scale, rect.width * scale, rect.height * scale)
+                        pygame.transform.scale(self.screen.subsurface(rect), scaled.size, self.window.subsurface(scaled))
+                        self.dirty_rects.append(scaled)
+
+        if self.dirty_rects is None:
+            pygame.display.update()
+        elif self.dirty_rects:
+            pygame.display.update(self.dirty_rects)
+        self.dirty_rects = None
+
+    def invalidate_screens(self):
+        """Drops every cached static screen so they are rebuilt on next use."""
+        for screen in self.static_screens.values():
+            screen.invalidate()
+        self.ship_descriptions = {}
+        self.composed_state = None
+
+    def present_static_screen(self, state, elements):
+        """
+        Composes a cached screen and records the regions to present.
 
-        # Reset background position when scrolled off screen
-        if self.BG_y >= 0:
-            self.BG_y = self.BG_default_y
+        Args:
+            state (str): Screen name in static_screens
+            elements (list): (surface, pos) per element, or None for an absent element
+        """
+        full = self.composed_state != state
+        self.dirty_rects = self.static_screens[state].compose(self.screen, elements, full)
+        self.composed_state = state
     
     def global_UI_elements(self):
         """Renders UI elements common to all screens."""
+        static = self.static_screens.get(self.current_state)
+        if static is None:
+            self.composed_state = None  # Immediate-mode screen overwrites the display
+
         # Background handling
-        if self.current_state != "ARMOURY" and self.current_state != "HELP":
-            self.screen.blit(self.BG_IMG["BG"], (self.BG_x, self.BG_y))
-            self.move_background()       
+        if static is not None and static.retained:
+            return  # Background and title come from the screen cache
+        elif self.current_state != "ARMOURY" and self.current_state != "HELP":
+            # Only the 400 pixel playfield; the HUD panel covers the rest of a wider screen
+            self.background.render(self.screen, 400)
+            if self.quality.active["background_scroll"]:
+                self.background.scroll()
         else:
             self.screen.fill(self.COLORS["bg_color"])  # Solid bg for some screens
         
         # Screen title
-        if self.current_state != "MENU" and self.current_state != "PLAY" and self.current_state != "PAUSE":
+        if static is None and self.current_state != "MENU" and self.current_state != "PLAY" and self.current_state != "PAUSE":
             self.text(self.current_state, self.FONT_LARGE, "WHITE", (10, 20))
     
     def initialise_planets(self):
         """Creates initial planet objects."""
-        num_planets = 1
-        for _ in range(num_planets):
-            planet = Planet()
+        for layer in range(len(Planet.LAYERS)):  # Back to front
+            planet = Planet(layer)
             self.planet_group.add(planet)
     
-    def initialise_hearts(self): 
-        """Creates heart UI elements based on player lives."""
-        num_hearts = self.player.lives  
-        x_initial, y_initial = 450, 65  # Starting position
-        
-        pos_x, pos_y = x_initial, y_initial
-
-        # Arrange hearts in grid
-        for i in range(num_hearts):
-            heart = Heart(pos_x, pos_y)  
-            self.player.heart_stack.append(heart)  
-
-            pos_x += 100  # Move right
-            
-            # New row after every 3 hearts
-            if (i + 1) % 3 == 0:
-                pos_x = x_initial
-                pos_y += 100
-    
-    def initialise_bullets(self): 
-        """Creates bullet UI elements based on player ammo."""
-        num_bullets = self.player.ammo  
-        x_initial, y_initial = 465, 470  # Starting position
-        x_spacing, y_spacing = 40, 15  # Spacing between bullets
-
-        pos_x, pos_y = x_initial, y_initial
-
-        # Arrange bullets in columns
-        for i in range(num_bullets):
-            bullet = Bullet(pos_x, pos_y, 0)  # 0 speed for UI bullets
-            self.player.bullet_stack.append(bullet) 
-            self.bullet_player_group.add(bullet)
-            pos_y += y_spacing  # Move down
-
-            # New column after every 6 bullets
-            if (i + 1) % 6 == 0:
-                pos_y = y_initial
-                pos_x += x_spacing
-
     # Core game loop ------------------------------------------------------------
     def run(self):
         """Main game loop."""
         while self.running:
-            self.process_events()  # Handle input/events
-            self.global_UI_elements()  # Render common UI
-            self.states[self.current_state][0]()  # Update current state
+            if self.config_watcher:
+                self.config_watcher.apply(self)  # Swap in edited data files between frames
+            self.simulate_frame()
             self.global_render()  # Update display
             
+        self.end_run()
+        self.data.close()  # Write any queued scores
+        self.telemetry.close()  # Write any buffered events
+        self.memory.close()
+        self.capture.close()  # Encode any frames still in the ring
+        if self.config_watcher:
+            self.config_watcher.close()
+        self.planets.close()
         pygame.quit()  # Clean up on exit
         
+    def simulate_frame(self):
+        """Handles this frame's input and runs its updates, without presenting."""
+        self.process_events()  # Handle input/events
+        # Gameplay runs as many simulation steps as the clock allows this frame
+        steps = self.game_clock.frame() if self.current_state == "PLAY" else 1
+        for _ in range(steps):
+            self.global_UI_elements()  # Render common UI
+            self.states[self.current_state][0]()  # Update current state
+
     def process_events(self):
         """Processes events for current game state."""
-        for event in pygame.event.get():
+        # Only let the current state's event types through to the queue
+        if self.event_filter_state != self.current_state and not self.headless:
+            self.set_event_filter(self.current_state)
+
+        self.click = False
+
+        start = time.perf_counter()
+        events = self.input_source.poll()
+        for event in events:
             # Global event handling
             if event.type == pygame.QUIT:
                 self.running = False
+                continue
 
             # State-specific event handling
-            self.states[self.current_state][1](event)
+            handler = self.states[self.current_state][1].get(event.type)
+            if handler:
+                handler(event)
+
+        # Per-frame input snapshot
+        self.input = self.input_source.read(self.click)
+        self.mx, self.my = self.input.mouse_pos
+
+        self.metrics.add("events", len(events))
+        self.metrics.add("event_dispatch_ms", (time.perf_counter() - start) * 1000)
+        self.metrics.tick()
+
+    def set_event_filter(self, state):
+        """
+        Blocks every event type the state has no handler for, at the SDL level.
+
+        Args:
+            state (str): Game state name
+        """
+        allowed = self.states[state][1]
+        # Allowed types are never blocked in between, so queued events survive a state change
+        pygame.event.set_allowed([pygame.QUIT, *allowed])
+        pygame.event.set_blocked([t for t in self.FILTERED_EVENTS if t not in allowed])
+        self.event_filter_state = state
 
     def global_render(self):
         """Updates display and controls frame rate."""
-        pygame.display.update()
-        self.clock.tick(60)  # 60 FPS
+        if self.capture.enabled:
+            start = time.perf_counter()
+            self.capture.frame(self.screen)
+            self.metrics.add("capture_ms", (time.perf_counter() - start) * 1000)
+        if self.headless:
+            self.dirty_rects = None
+            return  # Nothing to present; run as fast as possible
+        self.present()
+        work_ms = self.pacer.tick()  # 60 FPS
+        self.quality.update(work_ms)
+        if self.stress:
+            self.stress.record(self, work_ms)
 
     # Input handling ------------------------------------------------------------
     def mouse_click_event(self, event):
         """Handles mouse click events."""
-        self.get_mouse_pos()
-        
         # Check for left mouse button press
-        self.click = False
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        if event.button == 1:
             self.click = True
 
-    def get_mouse_pos(self):
-        """Gets current mouse position."""
-        self.mx, self.my = pygame.mouse.get_pos()
-
     # Game screens --------------------------------------------------------------
     def display_HUD(self):
         """Displays heads-up display during gameplay."""
         if Game.CONFIG["HUD"] and self.width != 700:
             self.set_screen_size(700)  # Expand screen for HUD
         
-        self.screen.blit(Game.BG_IMG["OVERLAY"], (400, 0))  # HUD background
+        # HUD background, cut from the much larger overlay image once
+        if self.hud_panel is None:
+            self.hud_panel = display_format(Game.BG_IMG["OVERLAY"].subsurface((0, 0, 300, self.height)).copy(), alpha=False)
+        self.screen.blit(self.hud_panel, (400, 0))
         
         # Render HUD elements
-        self.text("LIVES", self.FONT_SMALL, "WHITE", (512, 15))
-        self.text("HI SCORE", self.FONT_SMALL, "WHITE", (485, 215))
-        self.text(str(self.data.highscore), self.FONT_LARGE, "ORANGE", (567, 260))
-        self.text(str(self.player.score), self.FONT_SMALL, "WHITE", (575, 330))
-        self.text("AMMO", self.FONT_SMALL, "WHITE", (500, 420))
-        
-        # Update UI elements
-        for bullet in self.player.bullet_stack:
-            bullet.update()
+        self.text("LIVES", self.FONT_SMALL, "WHITE", (512, 15), bitmap=True)
+        self.text("HI SCORE", self.FONT_SMALL, "WHITE", (485, 215), bitmap=True)
+        self.text(str(self.data.highscore), self.FONT_LARGE, "ORANGE", (567, 260), bitmap=True)
+        self.text(str(self.player.score), self.FONT_SMALL, "WHITE", (575, 330), bitmap=True)
+        self.text("AMMO", self.FONT_SMALL, "WHITE", (500, 420), bitmap=True)
         
-        for heart in self.player.heart_stack:
-            heart.update()
+        # Ammo and lives
+        self.ammo_counter.render(self.screen, self.player.ammo)
+        self.lives_counter.render(self.screen, self.player.lives)
+
+    def snapshot(self):
+        """
+        Captures the complete simulation state.
+
+        Returns:
+            bytes: Versioned binary blob for restore()
+        """
+        return GameSnapshot.capture(self)
+
+    def restore(self, blob):
+        """
+        Replaces the simulation state with one captured by snapshot().
+
+        Args:
+            blob (bytes): Snapshot data
+        """
+        GameSnapshot.apply(self, blob)
+
+    def start_run(self):
+        """Starts tracking a new run, with its own random seed."""
+        self.seed = random.randrange(2**32)
+        random.seed(self.seed)
+        self.run_time = 0  # Seconds spent in PLAY
+        self.run_waves_start = self.total_waves_completed
+
+    def end_run(self):
+        """Records the current run in the score database if it was played."""
+        if self.run_time > 0 or self.player.score > 0:
+            self.data.record_run(self.player.selected_ship, self.player.score,
+                                 self.total_waves_completed - self.run_waves_start,
+                                 self.run_time, self.seed)
+        self.run_time = 0
+        self.telemetry.submit(self.game_clock.ticks())
 
     def reset_game_state(self):
         """Resets all game state for new game."""
+        self.end_run()
         self.GAME_OVER = False
         self.current_wave = 0
         self.wave_timer = 0
@@ -494,15 +3169,15 @@ class Game():
         # Clear all sprite groups
         for group in self.GROUPS:
             group.empty()
+        self.effects.clear()
         
         # Reinitialise player
         self.player = Player(self.player.selected_ship)  # Keep selected ship
         self.player_group.add(self.player)
         
-        # Reinitialise UI
-        self.initialise_hearts()
-        self.initialise_bullets()
+        # Reinitialise background
         self.initialise_planets()
+        self.start_run()
 
     def menu(self):
         """Renders main menu screen."""
@@ -510,8 +3185,8 @@ class Game():
             self.set_screen_size(400)  # Ensure correct size
             
         # Menu text
-        self.text("COSMIC CONFLICT", self.FONT_MEDIUM, "YELLOW", (8, 30))
-        self.text(f"HIGH SCORE {self.data.highscore}", self.FONT_SMALL, "WHITE", (100, 100))
+        self.text("COSMIC CONFLICT", self.FONT_MEDIUM, "YELLOW", (8, 30), bitmap=True)
+        self.text(f"HIGH SCORE {self.data.highscore}", self.FONT_SMALL, "WHITE", (100, 100), bitmap=True)
 
         # Menu buttons
         for button in self.text_buttons["MENU"]:
@@ -523,9 +3198,7 @@ class Game():
         """Displays game over screen."""
         self.player.kill()
         # Semi-transparent overlay
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 90))  
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.overlay(90), (0, 0))
         
         # Game over text
         self.text("GAME OVER", self.FONT_LARGE, "YELLOW", (55, 80))
@@ -533,10 +3206,27 @@ class Game():
         self.text("Exit ( ESC )", self.FONT_SMALL, "WHITE", (115, 185))   
    
     def play(self):
-        """Main gameplay update method."""
+        """Main gameplay update method; runs one simulation step."""
+        for event_type in self.game_clock.advance():  # Wave and powerup timers
+            self.states["PLAY"][1][event_type](pygame.event.Event(event_type))
+        self.run_time += GameClock.STEP_MS / 1000
         # Update all sprite groups
         for group in self.GROUPS:
-            group.update()
+            if group is self.player_group:
+                group.update(self.input)  # Player is driven by this frame's input
+            elif group is not self.planet_group or self.quality.active["planets"]:
+                group.update()
+
+        # Draw every active effect in one pass
+        if self.quality.active["explosions"]:
+            self.effects.render(self.screen, self.game_clock.ticks())
+        else:
+            self.effects.clear()
+
+        # Hand gameplay events to the telemetry writer
+        start = time.perf_counter()
+        self.telemetry.end_frame(self.game_clock.ticks())
+        self.metrics.add("telemetry_ms", (time.perf_counter() - start) * 1000)
        
         self.display_HUD()  # Render HUD
         
@@ -547,154 +3237,189 @@ class Game():
     def options(self):
         """Renders options screen."""
         # Options buttons
-        for button in self.text_buttons["OPTIONS"]:
-            button.update()
-            
-        self.text_buttons["BACK"].update()  # Back button
-        self.cursor.update()  # Render cursor
+        buttons = self.text_buttons["OPTIONS"] + [self.text_buttons["BACK"]]
+        for button in buttons:
+            button.handle_button_press()
+
+        self.cursor.track()
+        self.present_static_screen("OPTIONS", [button.element() for button in buttons] + [self.cursor.element()])
 
     def armoury(self):
         """Renders ship selection screen."""
-        self.text("select ship", self.FONT_SMALL, "WHITE", (10, 80))
-        self.text_buttons["BACK"].update()
-        
-        # Ship selection buttons
-        for ship in self.image_buttons["ARMOURY"]:
-            ship.update()
-            
         # Adjust screen size for armoury
         if self.current_state == "ARMOURY" and self.width != 800:
             self.set_screen_size(800)
         elif self.current_state != "ARMOURY" and self.width != 400:
             self.set_screen_size(400)
-            
-        self.cursor.update()
+
+        # Back and ship selection buttons
+        buttons = [self.text_buttons["BACK"]] + self.image_buttons["ARMOURY"]
+        for button in buttons:
+            button.handle_button_press()
+
+        # Description of the hovered ship
+        description = None
+        for ship in self.image_buttons["ARMOURY"]:
+            if ship.hovered:
+                description = (self.ship_description(ship.button_name), (10, 300))
+
+        self.cursor.track()
+        self.present_static_screen("ARMOURY", [button.element() for button in buttons] + [description, self.cursor.element()])
 
     def help(self):
         """Renders help/instructions screen."""
-        self.text_buttons["BACK"].update()
-        
         # Adjust screen size for help
         if self.current_state == "HELP" and self.width != 610:
             self.set_screen_size(610)
         elif self.current_state != "HELP" and self.width != 400:
             self.set_screen_size(400) 
-       
-        # Display help text from JSON
-        help_data = self.GAME_TEXT["help_text"]
+
+        self.text_buttons["BACK"].handle_button_press()
+        self.cursor.track()
+        self.present_static_screen("HELP", [self.text_buttons["BACK"].element(), self.cursor.element()])
+
+    # Static screen content -----------------------------------------------------
+    def static_surface(self, width, height, title):
+        """Creates a solid background surface with a screen title."""
+        surface = display_format(pygame.Surface((width, height)), alpha=False)
+        surface.fill(self.COLORS["bg_color"])
+        surface.blit(self.FONT_LARGE.render(title, True, self.COLORS["WHITE"]), (10, 20))
+        return surface
+
+    def build_help(self, width, height):
+        """Renders the help screen's title and text from GAME_TEXT."""
+        surface = self.static_surface(width, height, "HELP")
         y_offset = 65  # Starting Y position
         
         # Render each section
-        for section in help_data:
+        for section in self.GAME_TEXT["help_text"]:
             # Section title
-            self.text(section["title"], self.FONT_MEDIUM, "YELLOW", (10, y_offset))
+            surface.blit(self.FONT_MEDIUM.render(section["title"], True, self.COLORS["YELLOW"]), (10, y_offset))
             y_offset += 40
             
             # Section content
             for line in section["content"]:
-                self.text(line, self.FONT_SMALL, "GREEN", (20, y_offset))
+                surface.blit(self.FONT_SMALL.render(line, True, self.COLORS["GREEN"]), (20, y_offset))
                 y_offset += 30
             
             y_offset += 20  # Section spacing
+        return surface
+
+    def build_armoury(self, width, height):
+        """Renders the armoury's title and caption."""
+        surface = self.static_surface(width, height, "ARMOURY")
+        surface.blit(self.FONT_SMALL.render("select ship", True, self.COLORS["WHITE"]), (10, 80))
+        self.ship_descriptions = {}  # Ship data may have changed
+        return surface
+
+    def build_options(self, width, height):
+        """Renders the options title as an overlay for the scrolling background."""
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        # Copy the text's pixels as-is so the overlay blends exactly like direct rendering
+        surface.blit(self.FONT_LARGE.render("OPTIONS", True, self.COLORS["WHITE"]), (10, 20),
+                     special_flags=pygame.BLEND_RGBA_MAX)
+        return surface
+
+    def ship_description(self, ship):
+        """
+        Returns a ship's attributes pre-rendered on the armoury background.
 
-        self.cursor.update()
+        Args:
+            ship (str): Ship ID (e.g. "SHIP1")
+        """
+        if ship not in self.ship_descriptions:
+            lines = [self.FONT_SMALL.render(f"{key}  {value}", True, self.COLORS["WHITE"])
+                     for key, value in self.SHIP_DATA[ship].items()]
+            surface = display_format(pygame.Surface((max(line.get_width() for line in lines), 30 * len(lines))), alpha=False)
+            surface.fill(self.COLORS["bg_color"])
+            for i, line in enumerate(lines):
+                surface.blit(line, (0, i * 30))
+            self.ship_descriptions[ship] = surface
+        return self.ship_descriptions[ship]
     
+    def overlay(self, alpha):
+        """Returns a black screen-sized overlay of the given opacity, made once per size."""
+        key = (self.width, self.height, alpha)
+        if key not in self.overlays:
+            overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, alpha))
+            self.overlays[key] = overlay
+        return self.overlays[key]
+
     def pause(self):
         """Handles pause screen functionality."""
-        # Record pause start time
-        if not self.pause_data['is_paused']:
-            self.pause_data['start_time'] = pygame.time.get_ticks()
-            self.pause_data['is_paused'] = True
-       
         if self.width != 400:
             self.set_screen_size(400)
        
         # Semi-transparent overlay
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))  
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.overlay(150), (0, 0))
         
         # Pause screen buttons
         for button in self.text_buttons["PAUSE"]:
             button.update()
 
     # Event handlers ------------------------------------------------------------
-    def menu_event_handler(self, event):
-        """Handles events for menu screen."""
-        self.mouse_click_event(event)
-    
-    def play_event_handler(self, event):
-        """Handles events for gameplay screen."""
-        if event.type == pygame.KEYDOWN:
-            # Game over controls
-            if event.key == pygame.K_ESCAPE and self.GAME_OVER:
-                self.reset_game_state()
-                self.current_state = "MENU"
-           
-            if event.key == pygame.K_SPACE and self.GAME_OVER:
-                self.reset_game_state()
-
-            # Pause game
-            elif event.key == pygame.K_p and not self.GAME_OVER:
-                self.current_state = "PAUSE"
-                return
+    def play_key_event(self, event):
+        """Handles key presses during gameplay."""
+        # Game over controls
+        if event.key == pygame.K_ESCAPE and self.GAME_OVER:
+            self.reset_game_state()
+            self.current_state = "MENU"
+       
+        if event.key == pygame.K_SPACE and self.GAME_OVER:
+            self.reset_game_state()
 
-        # Wave system events
-        if event.type == self.WAVE_EVENT:
-            self.wave_timer += 1
-    
-            # Start new wave if none active
-            if not self.in_wave:
-                if self.current_wave < len(self.waves):
-                    self.in_wave = True
-                    self.wave_timer = 0
-                    self.enemies_spawned = False
-                    self.last_spawn_time = pygame.time.get_ticks()
-                   
-            # Process current wave
-            if self.in_wave:
-                wave_completed = self.waves[self.current_wave]()
+        # Pause game
+        elif event.key == pygame.K_p and not self.GAME_OVER:
+            self.current_state = "PAUSE"
+            self.game_clock.pause()
+
+    def wave_event(self, event):
+        """Advances the wave system, once per second."""
+        self.wave_timer += 1
+
+        # Start new wave if none active
+        if not self.in_wave:
+            if self.current_wave < len(self.waves):
+                self.in_wave = True
+                self.wave_timer = 0
+                self.enemies_spawned = False
+                self.last_spawn_time = self.game_clock.ticks()
+                self.telemetry.record(Telemetry.WAVE_START, self.current_wave, self.total_waves_completed)
+               
+        # Process current wave
+        if self.in_wave:
+            wave_completed = self.waves[self.current_wave]()
+            
+            if wave_completed:
+                self.telemetry.record(Telemetry.WAVE_END, self.current_wave, self.total_waves_completed + 1)
+                self.in_wave = False
+                self.current_wave += 1
+                self.total_waves_completed += 1
                 
-                if wave_completed:
-                    self.in_wave = False
-                    self.current_wave += 1
-                    self.total_waves_completed += 1
-                    
-                    # Loop waves
-                    if self.current_wave >= len(self.waves):
-                        self.current_wave = 0
-        
-        # Powerup spawn event
-        if event.type == self.POWER_UP and not self.GAME_OVER:
-            if self.player.lives < 3:
-                life = LifePowerUp()
-                self.powerup_group.add(life)
-
-    def options_event_handler(self, event):
-        """Handles events for options screen."""
-        self.mouse_click_event(event)
-
-    def armoury_event_handler(self, event):
-        """Handles events for armoury screen."""
-        self.mouse_click_event(event)
-
-    def help_event_handler(self, event):
-        """Handles events for help screen."""
-        self.mouse_click_event(event)
+                # Loop waves
+                if self.current_wave >= len(self.waves):
+                    self.current_wave = 0
+                self.memory.wave(self)
+
+    def powerup_event(self, event):
+        """Spawns a life powerup when the player is low on lives."""
+        if not self.GAME_OVER and self.player.lives < 3:
+            life = LifePowerUp()
+            self.powerup_group.add(life)
     
-    def pause_event_handler(self, event):
-        """Handles events for pause screen."""
+    def pause_key_event(self, event):
+        """Handles key presses on the pause screen."""
         # Resume game
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+        if event.key == pygame.K_p:
             self.current_state = "PLAY"
-            self.pause_data['total_paused'] = pygame.time.get_ticks() - self.pause_data['start_time']
-            self.pause_data['is_paused'] = False
+            self.game_clock.resume()
 
         # Exit to menu
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+        if event.key == pygame.K_ESCAPE:
             self.reset_game_state()
             self.current_state = "MENU"
-            self.pause_data['is_paused'] = False
+            self.game_clock.resume()
 
 # Player class ------------------------------------------------------------------
 class Player(pygame.sprite.Sprite):
@@ -704,7 +3429,7 @@ class Player(pygame.sprite.Sprite):
     """
     
     # Player ship images with proper hitboxes
-    PLAYER_SHIP_LIST = [pygame.image.load(f"assets/playerships/player{i}.png") for i in range(1,7)] 
+    PLAYER_SHIP_LIST = LazyAsset(lambda: load_images("assets/playerships/player{}.png", range(1,7)), "image")
 
     # Bullet firing patterns for each ship type
     BULLET_PATTERNS = {
@@ -726,13 +3451,9 @@ class Player(pygame.sprite.Sprite):
         super().__init__()
         # Load ship stats from data
         self.selected_ship = selected_ship
-        self.speed = Game.instance.selected_ship_description["speed"] // 10
+        self.load_stats(Game.instance.selected_ship_description)
         self.ammo = Game.instance.selected_ship_description["ammo"]
         self.lives = Game.instance.selected_ship_description["lives"]
-        self.type = Game.instance.selected_ship_description["type"]
-        self.fire_rate = Game.instance.selected_ship_description["fire rate"] * 10
-        self.bullet_speed = Game.instance.selected_ship_description["bullet speed"]
-        self.max_lives = self.lives
         self.score = 0
         
         # Get correct ship image
@@ -743,20 +3464,34 @@ class Player(pygame.sprite.Sprite):
         default_pos = (200, 500)
         self.rect = self.image.get_rect(center=default_pos)
     
-        self.previous_time = pygame.time.get_ticks()  # For firing cooldown
-        
-        self.heart_stack = []  # Life UI elements
-        self.bullet_stack = []  # Ammo UI elements
+        self.previous_time = Game.instance.game_clock.ticks()  # For firing cooldown
 
-    def update(self):
-        """Updates player state each frame."""
-        key = pygame.key.get_pressed()  # Get keyboard state
-        self.handle_movement(key)
-        self.shoot_bullet(key)
+    def load_stats(self, description):
+        """
+        Sets the ship's fixed stats; ammo and lives in play are left alone.
+
+        Args:
+            description (dict): The ship's SHIP_DATA entry
+        """
+        self.speed = description["speed"] // 10
+        self.type = description["type"]
+        self.fire_rate = description["fire rate"] * 10
+        self.bullet_speed = description["bullet speed"]
+        self.max_lives = description["lives"]
+
+    def update(self, input_state):
+        """
+        Updates player state each frame.
+
+        Args:
+            input_state (InputState): This frame's input snapshot
+        """
+        self.handle_movement(input_state)
+        self.shoot_bullet(input_state)
         self.render()
 
     def handle_movement(self, key):
-        """Handles player movement based on input."""
+        """Handles player movement based on input (an InputState)."""
         # Left movement
         if key[pygame.K_a]:  
             self.rect.x -= self.speed  
@@ -792,78 +3527,44 @@ class Player(pygame.sprite.Sprite):
             self.rect.y += self.speed
 
     def shoot_bullet(self, key):       
-        """Handles bullet firing logic."""
+        """Handles bullet firing logic based on input (an InputState)."""
         if key[pygame.K_SPACE] and self.ammo > 0:
-            current_time = pygame.time.get_ticks()
+            current_time = Game.instance.game_clock.ticks()
 
             # Check fire rate cooldown
             if current_time - self.previous_time > self.fire_rate:
                 self.previous_time = current_time
                
                 # Create bullets based on ship's pattern
-                for pattern in Player.BULLET_PATTERNS[self.selected_ship]:
+                for i, pattern in enumerate(Player.BULLET_PATTERNS[self.selected_ship]):
                     x, y, *direction = pattern  # Unpack position and optional direction
-                    bullet = Bullet(self.rect.x + x, self.rect.y + y, 
+                    bullet = Bullet(self.rect, self.rect.x + x, self.rect.y + y,
                                   self.bullet_speed, True, *direction)
                     Game.instance.bullet_player_group.add(bullet)
+                    Game.instance.telemetry.record(Telemetry.SHOT, int(self.selected_ship[4:]), i, self.ammo - 1)
                 
                 self.lose_bullet()  # Deduct ammo
 
     def gain_bullet(self):
-        """Adds bullet to ammo count and UI."""
+        """Adds a bullet to the ammo count (shown by the HUD ammo counter)."""
         if self.ammo < 30:
             self.ammo += 1
-            # Calculate position for new bullet UI element
-            x_initial, y_initial = 465, 470
-            bullets_per_column = 6
-            x_spacing, y_spacing = 40, 15
-            
-            bullet_count = len(self.bullet_stack)
-            col = bullet_count // bullets_per_column
-            row = bullet_count % bullets_per_column
-
-            x_new = x_initial + col * x_spacing
-            y_new = y_initial + row * y_spacing
-
-            # Add new bullet
-            bullet = Bullet(x_new, y_new, 0)
-            self.bullet_stack.append(bullet)
 
     def lose_bullet(self):
-        """Removes bullet from ammo count and UI."""
-        if self.bullet_stack:
-            self.bullet_stack.pop()  # Remove from stack
+        """Removes a bullet from the ammo count."""
+        if self.ammo > 0:
             self.ammo -= 1
 
     def gain_life(self):
-        """Adds life and updates UI."""
+        """Adds a life, up to the ship's maximum."""
         if self.lives < self.max_lives:
             self.lives += 1
-            
-            # Clear and rebuild heart UI for proper positioning
-            self.heart_stack = []  
-            
-            # Grid layout parameters
-            x_initial, y_initial = 450, 65  
-            hearts_per_row = 3  
-            x_spacing, y_spacing = 100, 30  
-            
-            # Recreate all hearts
-            for i in range(self.lives):
-                row = i // hearts_per_row
-                col = i % hearts_per_row
-                
-                x_new = x_initial + col * x_spacing
-                y_new = y_initial + row * y_spacing
-                
-                heart = Heart(x_new, y_new)
-                self.heart_stack.append(heart)
 
     def lose_life(self):
         """Removes life and checks for game over."""
-        if self.heart_stack:
-            self.heart_stack.pop()  # Remove heart from UI
+        if self.lives > 0:
             self.lives -= 1
+            Game.instance.telemetry.record(Telemetry.HIT, self.lives)
         
         if self.lives == 0:
             Game.instance.GAME_OVER = True
@@ -872,7 +3573,123 @@ class Player(pygame.sprite.Sprite):
         """Draws player sprite."""
         Game.instance.screen.blit(self.image, self.rect)  
 
+class Wingman(Player):
+    '''
+    Second co-op ship, flown by a NetServer client. Ammo is shared with the lead
+    player; hits, kills and powerups already count against Game.instance.player.
+    '''
+    def __init__(self, selected_ship):
+        lead = Game.instance.player
+        ammo = lead.ammo
+        super().__init__(selected_ship)
+        lead.ammo = ammo  # Joining doesn't refill the team's ammo
+        self.load_stats(Game.SHIP_DATA[selected_ship])
+        self.rect.center = (300, 500)
+        self.input = InputState()  # Set by the server each tick
+
+    @property
+    def ammo(self):
+        return Game.instance.player.ammo
+
+    @ammo.setter
+    def ammo(self, value):
+        Game.instance.player.ammo = value
+
+    def update(self, input_state):
+        '''Flies on the client's input rather than the local one.'''
+        super().update(self.input)
+
 # UI Elements -------------------------------------------------------------------
+class CounterWidget():
+    """
+    Draws a count as a repeated icon, e.g. the HUD's lives and ammo.
+    Icons fill lines of per_line (rows, or columns when vertical), and the
+    positions are computed once and reused.
+    """
+    def __init__(self, image, origin, spacing, per_line, vertical=False):
+        """
+        Args:
+            image (pygame.Surface): Icon
+            origin (tuple): Centre of the first icon
+            spacing (tuple): (x, y) distance between icons
+            per_line (int): Icons per row (or per column when vertical)
+            vertical (bool): Fill columns top to bottom instead of rows left to right
+        """
+        self.image = image
+        self.origin = origin
+        self.spacing = spacing
+        self.per_line = per_line
+        self.vertical = vertical
+        self.positions = []  # Top-left of each icon so far
+
+    def position(self, i):
+        """Returns the top-left of the i-th icon."""
+        line, place = divmod(i, self.per_line)
+        col, row = (line, place) if self.vertical else (place, line)
+        center = (self.origin[0] + col * self.spacing[0], self.origin[1] + row * self.spacing[1])
+        return self.image.get_rect(center=center).topleft
+
+    def render(self, surface, count):
+        """Draws count icons in one blits() call."""
+        while len(self.positions) < count:
+            self.positions.append(self.position(len(self.positions)))
+        surface.blits([(self.image, pos) for pos in self.positions[:count]], False)
+
+class ScrollingBackground():
+    """
+    Vertically scrolling background drawn from pre-composited tiles.
+    Each layer's visible columns are cut from its source once per width into an
+    opaque (first layer) or per-pixel alpha (later layers) display-format tile,
+    and the scroll position wraps around the tile's height. A frame blits only the
+    one or two tile slices that cover the screen, at a whole-pixel offset, so its
+    cost doesn't depend on the size of the source and the scroll never jumps back.
+    Sources must be at least as tall as the screen and tile vertically; "mirror"
+    stacks a flipped copy under a source that doesn't, so its ends always meet.
+    Later layers draw over earlier ones at their own speeds, for parallax.
+    """
+    def __init__(self, layers):
+        """
+        Args:
+            layers (list): Back to front, {"image": surface, "speed": pixels per step,
+                           "mirror": bool (optional)} per layer
+        """
+        self.layers = layers
+        self.periods = [layer["image"].get_height() * (2 if layer.get("mirror") else 1) for layer in layers]
+        self.offsets = [-layer["image"].get_height() / 2 for layer in layers]  # Starts mid-image
+        self.tiles = {}  # (layer, width) -> tile surface
+
+    def tile(self, i, width):
+        '''Returns layer i's tile for a screen width, cutting it on first use.'''
+        key = (i, width)
+        if key not in self.tiles:
+            source = self.layers[i]["image"]
+            width = min(width, source.get_width())
+            strip = source.subsurface(((source.get_width() - width) // 2, 0, width, source.get_height()))
+            tile = pygame.Surface((width, self.periods[i]), pygame.SRCALPHA if i else 0)
+            tile.blit(strip, (0, 0))
+            if self.layers[i].get("mirror"):
+                tile.blit(pygame.transform.flip(strip, False, True), (0, source.get_height()))
+            self.tiles[key] = display_format(tile, alpha=i > 0)
+        return self.tiles[key]
+
+    def scroll(self):
+        '''Moves every layer on by one step.'''
+        for i, layer in enumerate(self.layers):
+            self.offsets[i] = (self.offsets[i] + layer["speed"]) % self.periods[i]
+
+    def render(self, surface, width):
+        '''Draws the layers over the leftmost width columns of a surface.'''
+        height = surface.get_height()
+        for i in range(len(self.layers)):
+            tile = self.tile(i, width)
+            period = self.periods[i]
+            y = int(self.offsets[i]) % period  # Screen row the tile's first row lands on
+            if y >= height:
+                surface.blit(tile, (0, 0), (0, period - y, width, height))
+            else:
+                surface.blits([(tile, (0, 0), (0, period - y, width, y)),
+                               (tile, (0, y), (0, 0, width, height - y))], False)
+
 class Button():
     """
     Base button class with hover/click functionality.
@@ -886,6 +3703,7 @@ class Button():
             pos (tuple): (x,y) screen position
         """
         self.pos = pos  # Button position
+        self.hovered = False  # Mouse over button this frame
 
     def update(self):
         """Handles button state and rendering."""
@@ -897,7 +3715,8 @@ class Button():
         self.on_unhover()  # Default state
         
         # Check for mouse hover
-        if self.button_rect.collidepoint(Game.instance.mx, Game.instance.my):
+        self.hovered = self.button_rect.collidepoint(Game.instance.mx, Game.instance.my)
+        if self.hovered:
             self.on_hover()  # Hover state
             
             # Check for click
@@ -908,34 +3727,30 @@ class Button():
         """Draws button on screen."""
         Game.instance.screen.blit(self.button_surface, self.pos)
 
+    def element(self):
+        """Returns the button as a (surface, pos) element for retained screens."""
+        return (self.button_surface, self.pos)
+
 
 class ImageButton(Button):
     '''Creates a button using an image.'''
     def __init__(self, img, button_name, pos, on_click_action=None):
         super().__init__(pos)
+        self.image = img
         self.button_surface = img
         self.button_rect = self.button_surface.get_rect(topleft=pos)
         self.button_name = button_name
         self.on_click_action = on_click_action
 
     def on_hover(self):
-        '''Slightly fades the button and shows ship info if applicable.'''
-        self.button_surface.set_alpha(100)
+        '''Slightly fades the button and selects the ship's info if applicable.'''
+        self.button_surface = AlphaRamp.of(self.image).variant(100)
         if self.on_click_action == "ship":
             Game.instance.selected_ship_description = Game.instance.SHIP_DATA.get(self.button_name)
-            self.draw_ship_description()
 
     def on_unhover(self):
         '''Returns the button to full visibility.'''
-        self.button_surface.set_alpha(255)
-
-    def draw_ship_description(self):
-        '''Displays the selected ship's attributes on screen.'''
-        x,y = 10, 300
-        for key, value in Game.instance.selected_ship_description.items():
-            ship_text = f"{key}  {value}"
-            Game.instance.text(ship_text, Game.instance.FONT_SMALL, "WHITE", (x, y))
-            y += 30
+        self.button_surface = self.image
 
     def on_click(self):
         '''Handles what happens when the button is clicked (ship selection).'''
@@ -943,8 +3758,6 @@ class ImageButton(Button):
             Game.instance.player_group.empty()
             Game.instance.player = Player(self.button_name)
             Game.instance.player_group.add(Game.instance.player)
-            Game.instance.initialise_hearts()
-            Game.instance.initialise_bullets()
 
 class TextButton(Button):
     '''Creates a button using text.'''
@@ -953,9 +3766,17 @@ class TextButton(Button):
         self.message = message
         self.font = font
         self.color = color
-        self.button_surface = self.font.render(self.message,False,(Game.instance.COLORS["WHITE"]))
+        self.surfaces = {}  # Rendered text by (message, color)
+        self.button_surface = self.render_text(Game.instance.COLORS["WHITE"])
         self.button_rect = self.button_surface.get_rect(topleft=(pos))
 
+    def render_text(self, color):
+        '''Returns the message rendered in a color, rendering it only once.'''
+        key = (self.message, color)
+        if key not in self.surfaces:
+            self.surfaces[key] = self.font.render(self.message,False,(color))
+        return self.surfaces[key]
+
     def on_click(self):
         '''Handles what happens when the button is clicked (state changes, options).'''
         if self.message in Game.instance.states:
@@ -968,47 +3789,63 @@ class TextButton(Button):
                     Game.instance.CONFIG[setting] = False
                     self.color = Game.instance.COLORS["RED"]
                     self.message = f"{setting} disabled"
+            Game.instance.invalidate_screens()
         elif 'disabled' in self.message:
             for setting in Game.instance.CONFIG:
                 if setting in self.message:
                     Game.instance.CONFIG[setting] = True
                     self.color = Game.instance.COLORS["GREEN"]
                     self.message = f"{setting} enabled"
+            Game.instance.invalidate_screens()
         Game.instance.click = False
 
     def on_hover(self):
         '''Highlights the button when the mouse is over it.'''
-        self.button_surface = self.font.render(self.message,False,(Game.instance.COLORS["YELLOW"]))
+        self.button_surface = self.render_text(Game.instance.COLORS["YELLOW"])
 
     def on_unhover(self):
         '''Returns the button to its normal appearance.'''
-        self.button_surface = self.font.render(self.message,False,(self.color))
+        self.button_surface = self.render_text(self.color)
 
 class Bullet(pygame.sprite.Sprite):
     '''Represents a projectile in the game.'''
-    def __init__(self, x, y, speed, is_player=True, direction=None):
+    ROTATED = {}  # Shared angled player bullet images by direction
+
+    @staticmethod
+    def image_for(is_player, direction=None):
+        '''Returns the shared image for a bullet type and direction.'''
+        if not is_player:
+            return Game.BULLET_LIST["enemy"]
+        if direction not in ("NW", "NE"):
+            return Game.BULLET_LIST["player"]
+        if direction not in Bullet.ROTATED:
+            angle = 15 if direction == "NW" else -15
+            Bullet.ROTATED[direction] = pygame.transform.rotate(Game.BULLET_LIST["player"], angle)
+        return Bullet.ROTATED[direction]
+
+    def __init__(self, shooter, x, y, speed, is_player=True, direction=None):
+        '''
+        Args:
+            shooter (pygame.Rect): Rect of the ship firing; the bullet is centred half its width right of x
+            x, y (int): Where the bullet leaves the ship
+            speed (int): Pixels per frame, up for the player and down for enemies
+            is_player (bool): Fired by a player ship
+            direction (str): "NW" or "NE" for angled shots, None for straight
+        '''
         super().__init__()
+        self.place(shooter, x, y, speed, is_player, direction)
+
+    def place(self, shooter, x, y, speed, is_player=True, direction=None):
+        '''Sets the bullet off from a ship; also refires a bullet that has left play.'''
         self.x = x
         self.y = y
         self.direction = direction
         self.speed = speed
         self.is_player = is_player
-        if not is_player:
-            self.image = Game.instance.BULLET_LIST["enemy"]
-        else:
-            self.image = Game.instance.BULLET_LIST["player"]
-            if self.direction == "NW":
-                self.image = pygame.transform.rotate(self.image, 15)
-            elif self.direction == "NE":
-                self.image = pygame.transform.rotate(self.image, -15)
-        if self.speed != 0:
-            self.rect = self.image.get_rect(
-                center = ((x + Game.instance.player.rect.width//2), y)
-                )
-        else:
-            self.rect = self.image.get_rect(
-                center = (x, y)
-                )
+        self.image = Bullet.image_for(is_player, direction)
+        self.rect = self.image.get_rect(
+            center = ((x + shooter.width//2), y)
+            )
 
     def update(self):
         '''Moves the bullet, checks for collisions, and renders it.'''
@@ -1022,8 +3859,8 @@ class Bullet(pygame.sprite.Sprite):
             self.rect.y -= self.speed
         else:
             self.rect.y += self.speed
-        if self.rect.y < 0:
-            self.kill()
+        if self.rect.y < 0 or self.rect.y >= Game.instance.height + 10:
+            self.kill()  # Enemy bullets leave through the bottom
         if self.direction == "NW":
             self.rect.x -= 2
         elif self.direction == "NE":
@@ -1031,7 +3868,11 @@ class Bullet(pygame.sprite.Sprite):
 
     def handle_collision(self):
         '''Checks if the bullet has hit anything.'''
-        if pygame.sprite.groupcollide(Game.instance.bullet_player_group, Game.instance.enemy_group, True, True):
+        hits = pygame.sprite.groupcollide(Game.instance.bullet_player_group, Game.instance.enemy_group, True, True)
+        if hits:
+            for enemies in hits.values():
+                for enemy in enemies:
+                    Game.instance.telemetry.record(Telemetry.KILL, enemy.KIND, *enemy.rect.center)
             Game.instance.player.score += 1
             Game.instance.data.write_highscore()
             Game.instance.player.gain_bullet()
@@ -1044,25 +3885,28 @@ class Bullet(pygame.sprite.Sprite):
         Game.instance.screen.blit(self.image, self.rect)
 
 class Planet(pygame.sprite.Sprite):
-    '''Represents a background planet.'''
-    PLANET_LIST = [pygame.image.load(f"assets/planets/planet_{i}.png")
-                   for i in range(1, 5)]
+    '''Represents a background planet on one parallax layer.'''
+    PLANET_LIST = LazyAsset(lambda: load_images("assets/planets/planet_{}.png", range(1, 5)), "image")
 
-    def __init__(self):
+    # Parallax layers, drawn back to front: scroll speed and scale range
+    LAYERS = ({"speed": 0.35, "scale": (0.3, 0.5)},
+              {"speed": 0.6, "scale": (0.6, 0.9)},
+              {"speed": 1, "scale": (1.15, 1.8)})
+
+    def __init__(self, layer=len(LAYERS) - 1):
         super().__init__()
-        self.counter = 0
+        self.layer = layer
+        self.speed = Planet.LAYERS[layer]["speed"]
         self.generate_planet()
 
+    @staticmethod
+    def render_image(counter, angle, scale):
+        '''Rotates and scales a planet image; the slow part of making a planet.'''
+        return display_format(pygame.transform.rotozoom(Planet.PLANET_LIST[counter], angle, scale))
+
     def generate_planet(self):
-        '''Creates the planet with random attributes.'''
-        self.angle = random.randint(0, 360)
-        self.speed = 1
-        lower_scale, max_scale = 1.15, 1.8
-        self.scale = random.uniform(lower_scale, max_scale)
-        self.image = pygame.transform.rotozoom(
-            Planet.PLANET_LIST[self.counter], self.angle, self.scale
-        ).convert_alpha()
-        self.pos_x = random.randint(-50, 400 - (self.image.get_width()))
+        '''Swaps in the next prepared planet for this layer, just above the screen.'''
+        self.counter, self.angle, self.scale, self.pos_x, self.image = Game.instance.planets.take(self.layer)
         self.pos_y = -self.image.get_height()
         self.rect = self.image.get_rect(center=(self.pos_x, self.pos_y))
 
@@ -1079,11 +3923,80 @@ class Planet(pygame.sprite.Sprite):
         '''Moves the planet downwards and regenerates it off-screen.'''
         self.pos_y += self.speed
         if self.pos_y > Game.instance.height + self.rect.height:
-            self.counter += 1
-            if self.counter == len(Planet.PLANET_LIST):
-                self.counter = 0
             self.generate_planet()
 
+class PlanetFactory():
+    """
+    Prepares planets on a background thread so a planet leaving the screen is
+    replaced without any rotozoom or conversion mid-frame.
+    Each parallax layer has a small bounded queue of ready planets that the
+    producer keeps topped up; take() never waits, and only if a queue has run
+    dry does it make the planet on the calling thread.
+    """
+    def __init__(self, layers, depth=2, seed=None):
+        """
+        initialises the queues and starts the producer thread.
+
+        Args:
+            layers (tuple): Planet.LAYERS-style layer settings
+            depth (int): Ready planets kept per layer
+            seed (int): Seed for planet choices (kept apart from the gameplay RNG)
+        """
+        self.layers = layers
+        self.ready = [queue.Queue(maxsize=depth) for _ in layers]
+        self.counters = list(range(len(layers)))  # Next image per layer, staggered
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()  # Guards counters and random
+        self.wanted = threading.Event()  # Set when a queue may have room
+        self.wanted.set()
+        self.stopped = False
+        self.synchronous = 0  # Planets made on the game thread because a queue was empty
+
+        self.producer = threading.Thread(target=self.produce, name="planet-producer", daemon=True)
+        self.producer.start()
+
+    def make(self, layer):
+        """Makes the next planet for a layer: (image index, angle, scale, x, surface)."""
+        with self.lock:
+            counter = self.counters[layer]
+            self.counters[layer] = (counter + 1) % len(Planet.PLANET_LIST)
+            angle = self.random.randint(0, 360)
+            scale = self.random.uniform(*self.layers[layer]["scale"])
+            position = self.random.random()
+        image = Planet.render_image(counter, angle, scale)
+        pos_x = -50 + round(position * (450 - image.get_width()))  # randint(-50, 400 - width)
+        return counter, angle, scale, pos_x, image
+
+    def produce(self):
+        """Producer thread: refills every layer's queue whenever one has room."""
+        while not self.stopped:
+            self.wanted.wait()
+            self.wanted.clear()
+            for layer, ready in enumerate(self.ready):
+                while not ready.full() and not self.stopped:
+                    ready.put(self.make(layer))  # Only this thread puts, so this can't block
+
+    def take(self, layer):
+        """
+        Returns a prepared planet for a layer without waiting.
+
+        Args:
+            layer (int): Index into the layers
+        """
+        try:
+            planet = self.ready[layer].get_nowait()
+        except queue.Empty:
+            planet = self.make(layer)
+            self.synchronous += 1
+        self.wanted.set()
+        return planet
+
+    def close(self):
+        """Stops the producer thread."""
+        self.stopped = True
+        self.wanted.set()
+        self.producer.join()
+
 class Enemy(pygame.sprite.Sprite):
     '''Base class for all enemy types.'''
     def __init__(self, image_list, speed, bullet_speed, shoot_interval, pos_x, pos_y):
@@ -1092,7 +4005,7 @@ class Enemy(pygame.sprite.Sprite):
         self.speed = speed + self.speed_increase
         self.bullet_speed = bullet_speed + self.speed_increase
         self.shoot_interval = shoot_interval
-        self.next_shot_time = pygame.time.get_ticks() + self.shoot_interval
+        self.next_shot_time = Game.instance.game_clock.ticks() + self.shoot_interval
         self.image_list = image_list
         self.image = random.choice(self.image_list)
         self.rect = self.image.get_rect(center=(pos_x, pos_y))
@@ -1111,29 +4024,29 @@ class Enemy(pygame.sprite.Sprite):
 
     def collision_with_player(self):
         '''Checks if the enemy has collided with the player.'''
-        if pygame.sprite.groupcollide(Game.instance.player_group, Game.instance.enemy_group, True, True):
+        collisions = pygame.sprite.groupcollide(Game.instance.player_group, Game.instance.enemy_group, True, True)
+        for enemies in collisions.values():
+            for enemy in enemies:
+                Game.instance.telemetry.record(Telemetry.DESPAWN, enemy.KIND, Telemetry.RAMMED)
             Game.instance.GAME_OVER = True
 
     def despawn_if_offscreen(self):
         '''Removes the enemy if it goes off the bottom of the screen.'''
         if self.rect.y >= Game.instance.height + 10:
+            Game.instance.telemetry.record(Telemetry.DESPAWN, self.KIND, Telemetry.OFFSCREEN)
             self.kill()
 
     def shoot_bullet(self):
         '''Makes the enemy fire a bullet.'''
-        current_time = pygame.time.get_ticks()
-        if Game.instance.pause_data['total_paused'] > 0:
-            self.next_shot_time += Game.instance.pause_data['total_paused']
-            Game.instance.pause_data['total_paused'] = 0
+        current_time = Game.instance.game_clock.ticks()
         if current_time >= self.next_shot_time and not Game.instance.GAME_OVER:
-            enemy_bullet = Bullet(self.rect.x-5, self.rect.bottom, self.bullet_speed, False)
+            enemy_bullet = Bullet(self.rect, self.rect.x-5, self.rect.bottom, self.bullet_speed, False)
             Game.instance.bullet_enemy_group.add(enemy_bullet)
             self.next_shot_time = current_time + self.shoot_interval
 
     def kill(self):
         '''Removes the enemy and creates an explosion.'''
-        explosion = Explosion(self.rect.center)
-        Game.instance.effect_group.add(explosion)
+        Game.instance.effects.spawn("explosion", self.rect.center, Game.instance.game_clock.ticks())
         super().kill()
 
     def render(self):
@@ -1142,12 +4055,13 @@ class Enemy(pygame.sprite.Sprite):
 
 class StandardEnemy(Enemy):
     '''A basic enemy that moves straight down.'''
-    ENEMY_IMG = [pygame.image.load(f"assets/enemy/standard/alien{i}.png") for i in range(1,7)]
+    KIND = 0  # EntityStore.STANDARD_ENEMY
+    ENEMY_IMG = LazyAsset(lambda: load_images("assets/enemy/standard/alien{}.png", range(1,7)), "image")
 
-    def __init__(self):
+    def __init__(self, x=None, y=-500):
         speed = random.randint(2, 4)
-        pos_x = random.randint(30, 370)
-        pos_y = -500
+        pos_x = random.randint(30, 370) if x is None else x
+        pos_y = y
         bullet_speed = 6
         shoot_interval = random.randint(850, 1100)
         super().__init__(StandardEnemy.ENEMY_IMG, speed, bullet_speed, shoot_interval, pos_x, pos_y)
@@ -1159,7 +4073,8 @@ class StandardEnemy(Enemy):
 
 class DiagonalEnemy(Enemy):
     '''An enemy that moves diagonally.'''
-    ENEMY_IMG = [pygame.image.load(f"assets/enemy/diagonal/diagonal_alien{i}.png") for i in range(1, 2)]
+    KIND = 1  # EntityStore.DIAGONAL_ENEMY
+    ENEMY_IMG = LazyAsset(lambda: load_images("assets/enemy/diagonal/diagonal_alien{}.png", range(1, 2)), "image")
 
     def __init__(self, x, y):
         speed = 2
@@ -1172,30 +4087,12 @@ class DiagonalEnemy(Enemy):
         '''Moves the diagonal enemy diagonally and bounces off walls.'''
         super().handle_behavior()
         self.rect.y += self.speed
-        self.rect.x -= self.speed_x
-        if self.rect.x < 390:
-            if self.rect.x  < 0:
-                self.speed_x *= -1
-            if self.rect.x + self.rect.width > 400:
-                self.speed_x *= -1
-
-class Heart(pygame.sprite.Sprite):
-    '''Represents a life indicator on the screen.'''
-    HEART_IMG = [pygame.image.load(f"assets/misc/heart{i}.png") for i in range(1,3)]
-    def __init__(self, x, y):
-        super().__init__()
-        self.pos_x = x
-        self.pos_y = y
-        self.image = Heart.HEART_IMG[0]
-        self.rect = self.image.get_rect(center = ((self.pos_x, self.pos_y)))
-
-    def update(self):
-        '''Draws the heart on the screen.'''
-        self.render()
-
-    def render(self):
-        '''Draws the heart at its position.'''
-        Game.instance.screen.blit(self.image, self.rect)
+        self.rect.x -= self.speed_x
+        if self.rect.x < 390:
+            if self.rect.x  < 0:
+                self.speed_x *= -1
+            if self.rect.x + self.rect.width > 400:
+                self.speed_x *= -1
 
 class PowerUp(pygame.sprite.Sprite): 
     def __init__(self, image):
@@ -1241,19 +4138,19 @@ class PowerUp(pygame.sprite.Sprite):
             self.alpha += 10  # Fade in
             if self.alpha >= 255:  # Fully visible
                 self.pulsing_down = True
-        
-        self.image.set_alpha(self.alpha)
 
     def render(self):
-        self.pulse()
-        Game.instance.screen.blit(self.image, self.rect)
+        if Game.instance.quality.active["powerup_pulse"]:
+            self.pulse()
+        # This powerup's opacity, without touching the shared image
+        Game.instance.screen.blit(AlphaRamp.of(self.image).variant(self.alpha), self.rect)
         
     def apply_effect(self):
         """To be implemented by child classes"""
         pass
 
 class LifePowerUp(PowerUp):
-    POWERUP_IMG = pygame.image.load(f"assets/misc/heart1.png")
+    POWERUP_IMG = LazyAsset(lambda: load_image("assets/misc/heart1.png"), "image")
 
     def __init__(self):
         super().__init__(LifePowerUp.POWERUP_IMG)
@@ -1261,46 +4158,1725 @@ class LifePowerUp(PowerUp):
     '''Give the player an extra life when this power-up is collected.'''
     def apply_effect(self):
         Game.instance.player.gain_life()
+        Game.instance.telemetry.record(Telemetry.POWERUP, 0, Game.instance.player.lives)
 
     '''Update the power-up (which it inherits from the PowerUp class).'''
     def update(self):
         super().update()
 
-class Animation(pygame.sprite.Sprite):
-    def __init__(self, frames, pos):
+class EffectSystem():
+    '''
+    Batched renderer for short-lived effects such as explosions.
+    Active effects are rows in a compact table (start time, position, sequence id);
+    each frame the image index is looked up from the clock and everything is drawn
+    with a single blits() call.
+    '''
+    MAX_EFFECTS = 64  # cap on simultaneous effects
+    EXPLOSION_IMG = LazyAsset(lambda: load_images("assets/explosion/exp{}.png", range (1,9)), "image")
+    EXPLOSION_FRAME_DURATION = 83  # ms per frame (~5 frames at 60 FPS)
+
+    # Shared, pre-converted frame sequences
+    SEQUENCES = []        # list of {"frames", "offsets", "frame_duration"}
+    SEQUENCE_IDS = {}     # sequence name -> index in SEQUENCES
+
+    @staticmethod
+    def register_sequence(name, frames, frame_duration):
+        '''Converts a frame list once and shares it under the given name.'''
+        frames = [display_format(frame) for frame in frames]
+        sequence = {
+            "frames": frames,
+            "offsets": [(frame.get_width() // 2, frame.get_height() // 2) for frame in frames],
+            "frame_duration": frame_duration
+        }
+        if name in EffectSystem.SEQUENCE_IDS:
+            EffectSystem.SEQUENCES[EffectSystem.SEQUENCE_IDS[name]] = sequence
+        else:
+            EffectSystem.SEQUENCE_IDS[name] = len(EffectSystem.SEQUENCES)
+            EffectSystem.SEQUENCES.append(sequence)
+
+    def __init__(self, max_effects=MAX_EFFECTS):
+        self.max_effects = max_effects
+        # One row per active effect, oldest first
+        self.start_time = array("q")
+        self.pos_x = array("i")
+        self.pos_y = array("i")
+        self.sequence = array("H")
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def spawn(self, name, pos, now):
+        '''Adds an effect centred on pos; drops the oldest one when the cap is reached.'''
+        if len(self.sequence) >= self.max_effects:
+            for column in (self.start_time, self.pos_x, self.pos_y, self.sequence):
+                del column[0]
+        self.start_time.append(now)
+        self.pos_x.append(int(pos[0]))
+        self.pos_y.append(int(pos[1]))
+        self.sequence.append(EffectSystem.SEQUENCE_IDS[name])
+
+    def clear(self):
+        '''Removes all active effects.'''
+        for column in (self.start_time, self.pos_x, self.pos_y, self.sequence):
+            del column[:]
+
+    def render(self, surface, now):
+        '''Draws every live effect at its current frame and drops finished ones.'''
+        sequences = EffectSystem.SEQUENCES
+        start_time, pos_x, pos_y, sequence = self.start_time, self.pos_x, self.pos_y, self.sequence
+        blit_list = []
+        live = 0
+
+        for i in range(len(sequence)):
+            seq = sequences[sequence[i]]
+            index = (now - start_time[i]) // seq["frame_duration"]
+            if index >= len(seq["frames"]):
+                continue  # finished
+
+            offset_x, offset_y = seq["offsets"][index]
+            blit_list.append((seq["frames"][index], (pos_x[i] - offset_x, pos_y[i] - offset_y)))
+
+            # Compact the table in place, keeping spawn order
+            if live != i:
+                start_time[live] = start_time[i]
+                pos_x[live] = pos_x[i]
+                pos_y[live] = pos_y[i]
+                sequence[live] = sequence[i]
+            live += 1
+
+        for column in (start_time, pos_x, pos_y, sequence):
+            del column[live:]
+
+        if blit_list:
+            surface.blits(blit_list, False)
+      
+class EntityStore():
+    """
+    Optional entity-component core.
+    Enemies, bullets and powerups are rows in parallel typed arrays (one array per
+    component) instead of Sprite objects, and each frame a few systems (movement,
+    firing, collision, rendering) run over the rows. Explosions go to the EffectSystem
+    table. Existing classes still work through EntityGroup, which adopts any sprite
+    added to it as a row.
+    """
+    # Entity kinds
+    STANDARD_ENEMY, DIAGONAL_ENEMY, PLAYER_BULLET, ENEMY_BULLET, LIFE_POWERUP = range(5)
+    ENEMIES = (STANDARD_ENEMY, DIAGONAL_ENEMY)
+    FREE = -1  # kind of an unused slot
+
+    # Component columns and their array typecodes
+    COLUMNS = {
+        "kind": "b",
+        "x": "i", "y": "i",        # rect top-left
+        "vx": "i", "vy": "i",      # velocity per frame
+        "w": "H", "h": "H",        # rect size
+        "sprite": "H",             # index into sprites
+        "health": "h",
+        "timer": "q",              # next shot time (ms)
+        "interval": "i",           # shot interval (ms)
+        "bullet_speed": "h",
+        "alpha": "h",              # powerup opacity
+        "fade": "b"                # powerup pulse direction (-1 out, 1 in)
+    }
+
+    def __init__(self):
+        for name, typecode in EntityStore.COLUMNS.items():
+            setattr(self, name, array(typecode))
+        self.free = []          # reusable slots
+        self.sprites = []       # shared surfaces, indexed by the sprite column
+        self.sprite_ids = {}    # id(surface) -> sprite index
+
+    # Rows ----------------------------------------------------------------------
+    def spawn(self, kind, rect, vx, vy, sprite, timer=0, interval=0, bullet_speed=0, alpha=255, fade=-1):
+        '''Adds a row and returns its index, reusing a free slot if there is one.'''
+        row = (kind, rect.x, rect.y, vx, vy, rect.width, rect.height, sprite, 1,
+               timer, interval, bullet_speed, alpha, fade)
+        columns = [getattr(self, name) for name in EntityStore.COLUMNS]
+        if self.free:
+            index = self.free.pop()
+            for column, value in zip(columns, row):
+                column[index] = value
+        else:
+            index = len(self.kind)
+            for column, value in zip(columns, row):
+                column.append(value)
+        return index
+
+    def kill(self, index):
+        '''Frees a row; enemies leave an explosion behind like Enemy.kill.'''
+        if self.kind[index] in EntityStore.ENEMIES:
+            center = (self.x[index] + self.w[index] // 2, self.y[index] + self.h[index] // 2)
+            Game.instance.effects.spawn("explosion", center, Game.instance.game_clock.ticks())
+        self.kind[index] = EntityStore.FREE
+        self.free.append(index)
+
+    def indices(self, kinds):
+        '''Returns the indices of live rows of the given kinds.'''
+        return [i for i, kind in enumerate(self.kind) if kind in kinds]
+
+    def count(self, kinds):
+        '''Returns the number of live rows of the given kinds.'''
+        return sum(1 for kind in self.kind if kind in kinds)
+
+    def clear(self, kinds):
+        '''Frees every row of the given kinds without side effects.'''
+        for i in self.indices(kinds):
+            self.kind[i] = EntityStore.FREE
+            self.free.append(i)
+
+    def rect(self, index):
+        '''Returns a row's rect.'''
+        return pygame.Rect(self.x[index], self.y[index], self.w[index], self.h[index])
+
+    def sprite_id(self, key, image):
+        '''Returns the sprite index for an image (keyed by id), registering it on first use.'''
+        if key not in self.sprite_ids:
+            self.sprite_ids[key] = len(self.sprites)
+            self.sprites.append(image)
+        return self.sprite_ids[key]
+
+    def adopt(self, sprite):
+        '''Converts one of the game's sprites into a row.'''
+        if isinstance(sprite, Enemy):
+            diagonal = isinstance(sprite, DiagonalEnemy)
+            return self.spawn(
+                EntityStore.DIAGONAL_ENEMY if diagonal else EntityStore.STANDARD_ENEMY,
+                sprite.rect, -sprite.speed_x if diagonal else 0, sprite.speed,
+                self.sprite_id(id(sprite.image), sprite.image),
+                sprite.next_shot_time, sprite.shoot_interval, sprite.bullet_speed)
+        if isinstance(sprite, Bullet):
+            return self.spawn(
+                EntityStore.PLAYER_BULLET if sprite.is_player else EntityStore.ENEMY_BULLET,
+                sprite.rect, {"NW": -2, "NE": 2}.get(sprite.direction, 0),
+                -sprite.speed if sprite.is_player else sprite.speed,
+                self.sprite_id(id(sprite.image), sprite.image))
+        if isinstance(sprite, LifePowerUp):
+            return self.spawn(
+                EntityStore.LIFE_POWERUP, sprite.rect, 0, sprite.speed,
+                self.sprite_id(id(sprite.image), sprite.image),
+                alpha=sprite.alpha, fade=-1 if sprite.pulsing_down else 1)
+        raise TypeError(f"EntityStore can't hold {type(sprite).__name__}")
+
+    # Systems -------------------------------------------------------------------
+    @staticmethod
+    def overlap(ax, ay, aw, ah, rect):
+        '''Rect.colliderect for a row against a rect.'''
+        return ax < rect.right and rect.x < ax + aw and ay < rect.bottom and rect.y < ay + ah
+
+    def render(self, rows):
+        '''Draws rows in one blits() call.'''
+        sprites, sprite, x, y = self.sprites, self.sprite, self.x, self.y
+        Game.instance.screen.blits([(sprites[sprite[i]], (x[i], y[i])) for i in rows], False)
+
+    def update_enemies(self):
+        '''Collision with the player, despawning, firing and movement for enemies.'''
+        game = Game.instance
+        now = game.game_clock.ticks()
+        player = game.player
+        rows = self.indices(EntityStore.ENEMIES)
+        self.render(rows)
+
+        x, y, w, h, vx = self.x, self.y, self.w, self.h, self.vx
+        for i in rows:
+            if player.alive() and self.overlap(x[i], y[i], w[i], h[i], player.rect):
+                game.telemetry.record(Telemetry.DESPAWN, self.kind[i], Telemetry.RAMMED)
+                player.kill()
+                self.kill(i)
+                game.GAME_OVER = True
+                continue
+
+            if y[i] >= game.height + 10:
+                game.telemetry.record(Telemetry.DESPAWN, self.kind[i], Telemetry.OFFSCREEN)
+                self.kill(i)
+                continue
+
+            if now >= self.timer[i] and not game.GAME_OVER:
+                self.spawn_bullet(pygame.Rect(x[i], y[i], w[i], h[i]), x[i] - 5, y[i] + h[i], self.bullet_speed[i], False)
+                self.timer[i] = now + self.interval[i]
+
+            y[i] += self.vy[i]
+            x[i] += vx[i]
+            if self.kind[i] == EntityStore.DIAGONAL_ENEMY and x[i] < 390:
+                if x[i] < 0:
+                    vx[i] *= -1
+                if x[i] + w[i] > 400:
+                    vx[i] *= -1
+
+    def spawn_bullet(self, shooter, x, y, speed, is_player=True, direction=None):
+        '''Adds a bullet row positioned the way the Bullet class positions it.'''
+        image = Bullet.image_for(is_player, direction)
+        x += shooter.width // 2
+        return self.spawn(
+            EntityStore.PLAYER_BULLET if is_player else EntityStore.ENEMY_BULLET,
+            image.get_rect(center=(x, y)), {"NW": -2, "NE": 2}.get(direction, 0),
+            -speed if is_player else speed, self.sprite_id(id(image), image))
+
+    def move_bullets(self, kind):
+        '''Moves bullets of one kind, dropping any above (or far below) the screen.'''
+        rows = self.indices((kind,))
+        limit = Game.instance.height + 10
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        live = []
+        for i in rows:
+            y[i] += vy[i]
+            if y[i] < 0 or y[i] >= limit:
+                self.kill(i)
+                continue
+            x[i] += vx[i]
+            live.append(i)
+        return live
+
+    def collide_bullets(self):
+        '''Bullet hits, with the same outcome per frame as Bullet.handle_collision.'''
+        game = Game.instance
+        x, y, w, h = self.x, self.y, self.w, self.h
+        enemies = [(i, self.rect(i)) for i in self.indices(EntityStore.ENEMIES)]
+        hit = False
+        for b in self.indices((EntityStore.PLAYER_BULLET,)):
+            for e, rect in enemies:
+                if self.kind[e] != EntityStore.FREE and self.overlap(x[b], y[b], w[b], h[b], rect):
+                    game.telemetry.record(Telemetry.KILL, self.kind[e], *rect.center)
+                    self.kill(b)
+                    self.kill(e)
+                    hit = True
+                    break
+
+        if hit:
+            game.player.score += 1
+            game.data.write_highscore()
+            game.player.gain_bullet()
+            game.player.gain_bullet()
+        elif game.player.alive():
+            hits = [b for b in self.indices((EntityStore.ENEMY_BULLET,))
+                    if self.overlap(x[b], y[b], w[b], h[b], game.player.rect)]
+            for b in hits:
+                self.kill(b)
+            if hits:
+                game.player.lose_life()
+
+    def update_player_bullets(self):
+        '''Moves, collides and draws the player's bullets.'''
+        rows = self.move_bullets(EntityStore.PLAYER_BULLET)
+        if rows:
+            self.collide_bullets()
+        self.render([i for i in rows if self.kind[i] != EntityStore.FREE])
+
+    def update_enemy_bullets(self):
+        '''Moves, collides and draws enemy bullets.'''
+        rows = self.move_bullets(EntityStore.ENEMY_BULLET)
+        if rows:
+            self.collide_bullets()
+        self.render([i for i in rows if self.kind[i] != EntityStore.FREE])
+
+    def update_powerups(self):
+        '''Pulses, draws, collects, despawns and moves powerups.'''
+        game = Game.instance
+        x, y, alpha, fade = self.x, self.y, self.alpha, self.fade
+        for i in self.indices((EntityStore.LIFE_POWERUP,)):
+            # Pulse between 85 and 255 opacity, as PowerUp.pulse does
+            if game.quality.active["powerup_pulse"]:
+                alpha[i] += 10 * fade[i]
+                if alpha[i] <= 85:
+                    fade[i] = 1
+                elif alpha[i] >= 255:
+                    fade[i] = -1
+            image = AlphaRamp.of(self.sprites[self.sprite[i]]).variant(alpha[i])
+            game.screen.blit(image, (x[i], y[i]))
+
+            if game.player.alive() and self.overlap(x[i], y[i], self.w[i], self.h[i], game.player.rect):
+                game.player.gain_life()
+                game.telemetry.record(Telemetry.POWERUP, 0, game.player.lives)
+                self.kill(i)
+            elif y[i] >= game.height + 10:
+                self.kill(i)
+            else:
+                y[i] += self.vy[i]
+
+    # Benchmark -----------------------------------------------------------------
+    @staticmethod
+    def benchmark_memory(count=1000):
+        '''
+        Measures bytes per entity for StandardEnemy sprites in a group versus store rows.
+        Needs a Game instance.
+
+        Returns:
+            dict: {"sprite": bytes per sprite, "store": bytes per row}
+        '''
+        started = not tracemalloc.is_tracing()  # Leave a trace someone else started running
+        if started:
+            tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        group = pygame.sprite.Group(*[StandardEnemy() for _ in range(count)])
+        sprite_bytes = tracemalloc.get_traced_memory()[0] - start
+
+        start = tracemalloc.get_traced_memory()[0]
+        store = EntityStore()
+        for enemy in group:
+            store.adopt(enemy)
+        store_bytes = tracemalloc.get_traced_memory()[0] - start
+        if started:
+            tracemalloc.stop()
+        return {"sprite": sprite_bytes / count, "store": store_bytes / count}
+
+class EntityView():
+    '''Sprite-like handle on an EntityStore row (rect and kill), used by EntityGroup.'''
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+        self.rect = store.rect(index)
+
+    def kill(self):
+        if self.store.kind[self.index] != EntityStore.FREE:
+            self.store.kill(self.index)
+
+    def alive(self):
+        return self.store.kind[self.index] != EntityStore.FREE
+
+    KIND = property(lambda self: self.store.kind[self.index])  # Enemy kind, as on the sprite classes
+
+class EntityGroup(pygame.sprite.Group):
+    '''
+    Adapter that looks like a sprite group but keeps its members in an EntityStore.
+    Added sprites are converted to rows, iteration yields EntityViews, and update()
+    runs the store's system for these kinds.
+    '''
+    def __init__(self, store, kinds, system):
         super().__init__()
-        self.frames = frames  # list of images
-        self.frame_duration = 5  # time per frame (ms)
-        self.current_frame = 0 # index to access
-        self.image = self.frames[self.current_frame]
-        self.rect = self.image.get_rect()
-        self.rect.center = pos
-        self.timer = 0  # track time elapsed
-
-    '''Advance the animation frame by frame.'''
+        self.store = store
+        self.kinds = kinds
+        self.system = system
+
+    def add(self, *sprites):
+        for sprite in sprites:
+            self.store.adopt(sprite)
+
+    def sprites(self):
+        return [EntityView(self.store, i) for i in self.store.indices(self.kinds)]
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def __len__(self):
+        return self.store.count(self.kinds)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def empty(self):
+        self.store.clear(self.kinds)
+
+    def update(self, *args):
+        self.system()
+
+class Formation():
+    '''Parametric enemy formations; each returns the (x, y) centre of every member.'''
+    @staticmethod
+    def line(x, y, count, dx, dy):
+        '''Members in a straight line from (x, y), each offset by (dx, dy).'''
+        return [(x + i * dx, y + i * dy) for i in range(count)]
+
+    @staticmethod
+    def column(x, y, count, spacing=80):
+        '''A vertical column, leader at the bottom.'''
+        return Formation.line(x, y, count, 0, -spacing)
+
+    @staticmethod
+    def diagonal(x, y, count, dx=85, dy=-100):
+        '''A diagonal line climbing to the right, as in wave 2.'''
+        return Formation.line(x, y, count, dx, dy)
+
+    @staticmethod
+    def v(x, y, count, dx=50, dy=-50):
+        '''A V with its point at (x, y), members alternating left and right behind it.'''
+        return [(x + (i + 1) // 2 * dx * (-1 if i % 2 else 1), y + (i + 1) // 2 * dy) for i in range(count)]
+
+class EnemyEngine():
+    """
+    Vectorized enemy core (needs NumPy).
+    Every enemy's position, velocity and motion parameters are NumPy columns, and
+    each frame every motion kind (straight, wall-bounce, sine, path) is stepped
+    with one array expression over its rows instead of per-sprite rect arithmetic.
+    Collision with the player, despawning, firing and drawing work on the same
+    arrays, and drawing blits run-length encoded copies of the enemy images, which
+    skip their transparent pixels. EnemyEngineGroup lets the waves keep adding
+    ordinary enemy sprites.
+    """
+    STRAIGHT, BOUNCE, SINE, PATH = range(4)  # Motion kinds
+
+    # Columns and their dtypes
+    COLUMNS = {
+        "alive": "?",
+        "kind": "i1",              # EntityStore enemy kind (standard/diagonal)
+        "motion": "i1",
+        "sprite": "i2",            # index into sprites
+        "x": "f8", "y": "f8",      # top-left
+        "vx": "f8", "vy": "f8",    # per frame; vy is the speed along the path for PATH
+        "w": "i2", "h": "i2",
+        "base_x": "f8", "base_y": "f8",  # origin for SINE and PATH
+        "amplitude": "f8", "frequency": "f8", "phase": "f8",
+        "path": "i2",              # index into paths
+        "progress": "f8",          # frames (SINE) or pixels along the path (PATH)
+        "timer": "i8",             # next shot time (ms)
+        "interval": "i4",          # shot interval (ms)
+        "bullet_speed": "i2",
+        "speed_increase": "i2"
+    }
+
+    def __init__(self, capacity=64):
+        if load_numpy() is None:
+            raise RuntimeError("The vector enemy engine needs NumPy")
+        for name, dtype in EnemyEngine.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype))
+        self.size = 0           # rows in use, live or not
+        self.sprites = []       # shared surfaces, indexed by the sprite column
+        self.images = []        # RLE-accelerated copies of sprites, for drawing
+        self.sprite_ids = {}    # id(surface) -> sprite index
+        self.paths = []         # (cumulative length, xs, ys) per path
+        self.bullets = []       # Bullet sprites fired so far, refired once they leave play
+
+    # Rows ----------------------------------------------------------------------
+    def sprite_id(self, image):
+        '''Returns the sprite index of a surface, registering it once.'''
+        key = id(image)
+        if key not in self.sprite_ids:
+            self.sprite_ids[key] = len(self.sprites)
+            self.sprites.append(image)
+            rle = image.copy()
+            rle.set_alpha(255, pygame.RLEACCEL)  # Same pixels, far cheaper alpha blits
+            self.images.append(rle)
+        return self.sprite_ids[key]
+
+    def add_path(self, points):
+        '''
+        Registers a path for PATH motion and returns its index.
+
+        Args:
+            points (list): (x, y) offsets from each follower's spawn position
+        '''
+        xs, ys = np.array(points, dtype="f8").T
+        length = np.concatenate(([0], np.cumsum(np.hypot(np.diff(xs), np.diff(ys)))))
+        self.paths.append((length, xs, ys))
+        return len(self.paths) - 1
+
+    def allocate(self, count):
+        '''Returns count free row indices, reusing dead rows and growing the columns if needed.'''
+        rows = np.flatnonzero(~self.alive[:self.size])[:count]
+        extra = count - len(rows)
+        if extra:
+            if self.size + extra > len(self.alive):
+                capacity = max(len(self.alive) * 2, self.size + extra)
+                for name in EnemyEngine.COLUMNS:
+                    column = getattr(self, name)
+                    grown = np.zeros(capacity, column.dtype)
+                    grown[:self.size] = column[:self.size]
+                    setattr(self, name, grown)
+            rows = np.concatenate((rows, np.arange(self.size, self.size + extra)))
+            self.size += extra
+        return rows
+
+    def adopt(self, enemies, motion=None, amplitude=0, frequency=0, phase=0, path=-1):
+        '''
+        Converts enemy sprites into rows in one vectorized assignment.
+
+        Args:
+            enemies (list): StandardEnemy/DiagonalEnemy sprites
+            motion (int): Motion kind for all of them; by default each keeps its
+                          class's movement (STRAIGHT or BOUNCE)
+            amplitude, frequency, phase: SINE parameters (pixels, radians per frame, radians);
+                                         for PATH, phase is the starting progress
+            path (int): Path index for PATH motion
+        '''
+        if not enemies:
+            return np.zeros(0, "i8")
+        rows = self.allocate(len(enemies))
+        diagonal = np.array([enemy.KIND == DiagonalEnemy.KIND for enemy in enemies])
+        columns = {
+            "kind": diagonal * EntityStore.DIAGONAL_ENEMY,
+            "motion": np.where(diagonal, EnemyEngine.BOUNCE, EnemyEngine.STRAIGHT) if motion is None else motion,
+            "sprite": [self.sprite_id(enemy.image) for enemy in enemies],
+            "x": [enemy.rect.x for enemy in enemies], "y": [enemy.rect.y for enemy in enemies],
+            "w": [enemy.rect.width for enemy in enemies], "h": [enemy.rect.height for enemy in enemies],
+            "vx": [-getattr(enemy, "speed_x", 0) for enemy in enemies],
+            "vy": [enemy.speed for enemy in enemies],
+            "amplitude": amplitude, "frequency": frequency, "phase": phase, "path": path,
+            "timer": [enemy.next_shot_time for enemy in enemies],
+            "interval": [enemy.shoot_interval for enemy in enemies],
+            "bullet_speed": [enemy.bullet_speed for enemy in enemies],
+            "speed_increase": [enemy.speed_increase for enemy in enemies]
+        }
+        for name, values in columns.items():
+            getattr(self, name)[rows] = values
+        self.base_x[rows] = self.x[rows]
+        self.base_y[rows] = self.y[rows]
+        self.progress[rows] = self.phase[rows] if motion == EnemyEngine.PATH else 0
+        self.alive[rows] = True
+        return rows
+
+    def kill(self, index):
+        '''Removes a row, leaving an explosion like Enemy.kill.'''
+        center = (int(self.x[index]) + self.w[index] // 2, int(self.y[index]) + self.h[index] // 2)
+        Game.instance.effects.spawn("explosion", center, Game.instance.game_clock.ticks())
+        self.alive[index] = False
+
+    def fire(self, rows):
+        '''Fires a bullet from below each row, as Enemy.shoot_bullet does, reusing spent bullet sprites.'''
+        spent = [bullet for bullet in self.bullets if not bullet.alive()]
+        for x, y, w, h, speed in zip(self.x[rows].astype("i8").tolist(), self.y[rows].astype("i8").tolist(),
+                                     self.w[rows].tolist(), self.h[rows].tolist(), self.bullet_speed[rows].tolist()):
+            shooter = pygame.Rect(x, y, w, h)
+            if spent:
+                bullet = spent.pop()
+                bullet.place(shooter, x - 5, shooter.bottom, speed, False)
+            else:
+                bullet = Bullet(shooter, x - 5, shooter.bottom, speed, False)
+                self.bullets.append(bullet)
+            Game.instance.bullet_enemy_group.add(bullet)
+
+    def rows(self):
+        '''Returns the indices of live rows.'''
+        return np.flatnonzero(self.alive[:self.size])
+
+    def clear(self):
+        '''Removes every row without side effects.'''
+        self.alive[:] = False
+        self.size = 0
+
+    # Systems -------------------------------------------------------------------
+    def overlapping(self, rows, rect):
+        '''Returns the rows whose rects overlap a rect (Rect.colliderect, vectorized).'''
+        x, y = self.x[rows].astype("i8"), self.y[rows].astype("i8")
+        hit = (x < rect.right) & (rect.x < x + self.w[rows]) & (y < rect.bottom) & (rect.y < y + self.h[rows])
+        return rows[hit]
+
+    def step(self, rows):
+        '''Moves rows by one frame, one array expression per motion kind.'''
+        motion = self.motion[rows]
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+
+        moving = rows[motion != EnemyEngine.PATH]
+        y[moving] += vy[moving]
+
+        bounce = rows[motion == EnemyEngine.BOUNCE]
+        x[bounce] += vx[bounce]
+        # Same wall test as DiagonalEnemy: only while left of x=390
+        flip = bounce[(x[bounce] < 390) & ((x[bounce] < 0) | (x[bounce] + self.w[bounce] > 400))]
+        vx[flip] *= -1
+
+        sine = rows[motion == EnemyEngine.SINE]
+        self.progress[sine] += 1
+        x[sine] = self.base_x[sine] + self.amplitude[sine] * np.sin(self.frequency[sine] * self.progress[sine] + self.phase[sine])
+
+        followers = rows[motion == EnemyEngine.PATH]
+        self.progress[followers] += vy[followers]
+        for path in np.unique(self.path[followers]):
+            group = followers[self.path[followers] == path]
+            length, xs, ys = self.paths[path]
+            progress = self.progress[group]
+            x[group] = self.base_x[group] + np.interp(progress, length, xs)
+            # Past the end of the path, carry on straight down
+            y[group] = self.base_y[group] + np.interp(progress, length, ys) + np.maximum(progress - length[-1], 0)
+
     def update(self):
-        self.timer += 1
+        '''Draws, collides, despawns, fires and moves every enemy, in Enemy.update's order.'''
+        game = Game.instance
+        now = game.game_clock.ticks()
+        rows = self.rows()
+        if not len(rows):
+            return
+        game.screen.blits([(self.images[s], (x, y)) for s, x, y in
+                           zip(self.sprite[rows].tolist(), self.x[rows].astype("i8").tolist(),
+                               self.y[rows].astype("i8").tolist())], False)
+
+        # Collision with the player
+        if game.player.alive():
+            hits = self.overlapping(rows, game.player.rect)
+            if len(hits):
+                game.player.kill()
+                for i in hits:
+                    game.telemetry.record(Telemetry.DESPAWN, int(self.kind[i]), Telemetry.RAMMED)
+                    self.kill(i)
+                game.GAME_OVER = True
+
+        # Despawn below the screen
+        for i in rows[self.alive[rows] & (self.y[rows] >= game.height + 10)]:
+            game.telemetry.record(Telemetry.DESPAWN, int(self.kind[i]), Telemetry.OFFSCREEN)
+            self.kill(i)
+        rows = rows[self.alive[rows]]
+
+        # Fire
+        if not game.GAME_OVER:
+            due = rows[self.timer[rows] <= now]
+            if len(due):
+                self.fire(due)
+            self.timer[due] = now + self.interval[due]
+
+        self.step(rows)
+
+    # Benchmark -----------------------------------------------------------------
+    @staticmethod
+    def benchmark(counts=(100, 300, 1000), frames=60):
+        '''
+        Times enemy updates per frame for sprites and for the engine, with the player
+        out of the way: once drawing to the screen, and once to a 1x1 surface so
+        only the simulation cost remains. Drawing dominates the sprite frame; the
+        engine's RLE-accelerated blits cut it along with the simulation. Needs a
+        Game instance.
+
+        Returns:
+            dict: Count -> {(backend, "frame" or "logic"): ms per frame}
+        '''
+        game = Game.instance
+        game.player.kill()
+        screen, enemy_group = game.screen, game.enemy_group
+        results = {}
+        try:
+            for count in counts:
+                random.seed(count)
+                positions = [(random.randint(30, 370), random.randint(-400, 100)) for _ in range(count)]
+                timings = {}
+                for name in ("sprites", "engine"):
+                    for part, target in (("frame", screen), ("logic", pygame.Surface((1, 1)))):
+                        enemies = [DiagonalEnemy(x, y) if i % 2 else StandardEnemy(x, y)
+                                   for i, (x, y) in enumerate(positions)]
+                        if name == "sprites":
+                            group = pygame.sprite.Group(*enemies)
+                            game.enemy_group = group  # Enemy.collision_with_player reads it
+                            update = group.update
+                        else:
+                            engine = EnemyEngine()
+                            engine.adopt(enemies)
+                            update = engine.update
+                        game.screen = target
+                        start = time.perf_counter()
+                        for _ in range(frames):
+                            update()
+                            game.bullet_enemy_group.empty()
+                        timings[name, part] = (time.perf_counter() - start) * 1000 / frames
+                        game.screen = screen
+                        game.effects.clear()
+                results[count] = timings
+        finally:
+            # Hand the game back its own screen and enemy group, even if a run fails
+            game.screen, game.enemy_group = screen, enemy_group
+        return results
+
+class EnemyEngineView():
+    '''Sprite-like handle on an EnemyEngine row, used by EnemyEngineGroup and snapshots.'''
+    def __init__(self, engine, index):
+        self.engine = engine
+        self.index = index
+        self.rect = pygame.Rect(int(engine.x[index]), int(engine.y[index]), engine.w[index], engine.h[index])
+
+    def kill(self):
+        if self.engine.alive[self.index]:
+            self.engine.kill(self.index)
+
+    def alive(self):
+        return bool(self.engine.alive[self.index])
+
+    # Enemy attributes read by GameSnapshot
+    KIND = property(lambda self: int(self.engine.kind[self.index]))
+    image = property(lambda self: self.engine.sprites[self.engine.sprite[self.index]])
+    speed = property(lambda self: int(self.engine.vy[self.index]))
+    speed_x = property(lambda self: -int(self.engine.vx[self.index]))
+    bullet_speed = property(lambda self: int(self.engine.bullet_speed[self.index]))
+    speed_increase = property(lambda self: int(self.engine.speed_increase[self.index]))
+    shoot_interval = property(lambda self: int(self.engine.interval[self.index]))
+    next_shot_time = property(lambda self: int(self.engine.timer[self.index]))
+
+class EnemyEngineGroup(pygame.sprite.Group):
+    '''
+    Adapter that looks like a sprite group but keeps its enemies in an EnemyEngine.
+    Added sprites are adopted as rows, iteration yields EnemyEngineViews, and
+    update() runs the engine.
+    '''
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+
+    def add(self, *sprites):
+        if sprites:
+            self.engine.adopt(list(sprites))
+
+    def sprites(self):
+        return [EnemyEngineView(self.engine, i) for i in self.engine.rows().tolist()]
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def __len__(self):
+        return int(np.count_nonzero(self.engine.alive[:self.engine.size]))
 
-        if self.timer >= self.frame_duration:
-            self.timer = 0
-            self.current_frame += 1
-            if self.current_frame < len(self.frames):
-                self.image = self.frames[self.current_frame]
+    def __bool__(self):
+        return len(self) > 0
+
+    def empty(self):
+        self.engine.clear()
+
+    def update(self, *args):
+        self.engine.update()
+
+class GameSnapshot():
+    """
+    Compact binary snapshots of the simulation.
+    Fixed-size struct records per sprite; surfaces are stored as asset ids and times
+    as GameClock ticks, which stay valid because the clock is restored with them.
+    """
+    MAGIC = b"CCSN"
+    VERSION = 5
+
+    SPRITES, STORE, ENGINE = range(3)            # Entity backends
+
+    HEADER = struct.Struct("<4sBq?")             # magic, version, clock steps, clock paused
+    GAME = struct.Struct("<B?Bhh??IqHH")         # state, game over, wave, timer, duration, in wave,
+                                                 # spawned, waves done, last spawn, spawn interval, width
+    PLAYER = struct.Struct("<B?hhhhhhhhiq")      # ship, alive, x, y, speed, ammo, lives, max lives,
+                                                 # fire rate, bullet speed, score, last shot
+    COUNT = struct.Struct("<H")
+    TIMER = struct.Struct("<Hqq")                # event type after USEREVENT, interval, next due
+    ENEMY = struct.Struct("<BHhhhhhhHq")         # diagonal, asset, x, y, speed, speed x, bullet speed,
+                                                 # speed increase, shoot interval, next shot
+    BULLET = struct.Struct("<hhh?B")             # x, y, speed, is player, direction
+    POWERUP = struct.Struct("<hhhh?")            # x, y, speed, alpha, pulsing down
+    PLANET = struct.Struct("<Bhfhfb")            # counter, angle, scale, x, y, layer
+    EFFECT = struct.Struct("<qhhH")              # start, x, y, sequence
+    RNG = struct.Struct("<B625I?d")              # version, state, has gauss, gauss
+    DIRECTIONS = [None, "NW", "NE"]
+
+    ASSETS = []      # Shared surfaces by asset id
+    ASSET_IDS = {}   # id(surface) -> asset id
+
+    @staticmethod
+    def assets():
+        '''Returns the shared surfaces by asset id, building the table on first use.'''
+        if not GameSnapshot.ASSETS:
+            GameSnapshot.ASSETS = [
+                *StandardEnemy.ENEMY_IMG, *DiagonalEnemy.ENEMY_IMG,
+                Bullet.image_for(True), Bullet.image_for(True, "NW"), Bullet.image_for(True, "NE"),
+                Bullet.image_for(False), LifePowerUp.POWERUP_IMG, *Game.HEART_IMG
+            ]
+            GameSnapshot.ASSET_IDS = {id(asset): i for i, asset in enumerate(GameSnapshot.ASSETS)}
+        return GameSnapshot.ASSETS
+
+    @staticmethod
+    def asset_id(surface):
+        '''Returns the asset id of a shared surface.'''
+        GameSnapshot.assets()
+        return GameSnapshot.ASSET_IDS[id(surface)]
+
+    @staticmethod
+    def backend(game):
+        '''Returns which entity backend a game runs on.'''
+        if game.entities is not None:
+            return GameSnapshot.STORE
+        return GameSnapshot.SPRITES if game.enemy_engine is None else GameSnapshot.ENGINE
+
+    @staticmethod
+    def pack_list(chunks, record, rows):
+        chunks.append(GameSnapshot.COUNT.pack(len(rows)))
+        chunks.extend(record.pack(*row) for row in rows)
+
+    @staticmethod
+    def capture(game):
+        '''Returns the game's simulation state as bytes.'''
+        S = GameSnapshot
+        clock = game.game_clock
+        player = game.player
+        states = list(game.states)
+        chunks = [
+            S.HEADER.pack(S.MAGIC, S.VERSION, clock.steps, clock.paused),
+            S.GAME.pack(states.index(game.current_state), game.GAME_OVER, game.current_wave,
+                        game.wave_timer, game.wave_duration, game.in_wave, game.enemies_spawned,
+                        game.total_waves_completed, game.last_spawn_time, game.spawn_interval,
+                        game.width),
+            S.PLAYER.pack(list(game.SHIP_DATA).index(player.selected_ship), player.alive(),
+                          player.rect.x, player.rect.y, player.speed, player.ammo, player.lives,
+                          player.max_lives, player.fire_rate, player.bullet_speed, player.score,
+                          player.previous_time)
+        ]
+
+        # Wave and powerup timers
+        S.pack_list(chunks, S.TIMER, [(event_type - pygame.USEREVENT, interval, due)
+                                      for event_type, (interval, due) in clock.timers.items()])
+
+        # Planets and effects
+        S.pack_list(chunks, S.PLANET, [
+            (planet.counter, planet.angle, planet.scale, planet.pos_x, planet.pos_y, planet.layer)
+            for planet in game.planet_group])
+        effects = game.effects
+        S.pack_list(chunks, S.EFFECT, list(zip(effects.start_time, effects.pos_x, effects.pos_y, effects.sequence)))
+
+        # Gameplay entities
+        backend = S.backend(game)
+        chunks.append(struct.pack("<B", backend))
+        if backend == S.ENGINE:
+            # Whole columns, so motion kinds and their parameters survive
+            engine = game.enemy_engine
+            chunks.append(struct.pack("<I", engine.size))
+            for name in EnemyEngine.COLUMNS:
+                chunks.append(getattr(engine, name)[:engine.size].tobytes())
+            S.pack_list(chunks, S.COUNT, [(S.asset_id(sprite),) for sprite in engine.sprites])
+            chunks.append(S.COUNT.pack(len(engine.paths)))
+            for _, xs, ys in engine.paths:
+                chunks.append(struct.pack("<I", len(xs)))
+                chunks.append(np.stack((xs, ys)).tobytes())
+        elif backend == S.SPRITES:
+            S.pack_list(chunks, S.ENEMY, [
+                (enemy.KIND == DiagonalEnemy.KIND, S.asset_id(enemy.image), enemy.rect.x, enemy.rect.y,
+                 enemy.speed, getattr(enemy, "speed_x", 0), enemy.bullet_speed, enemy.speed_increase,
+                 enemy.shoot_interval, enemy.next_shot_time)
+                for enemy in game.enemy_group])
+        if backend != S.STORE:
+            for group in (game.bullet_player_group, game.bullet_enemy_group):
+                S.pack_list(chunks, S.BULLET, [
+                    (*bullet.rect.topleft, bullet.speed, bullet.is_player, S.DIRECTIONS.index(bullet.direction))
+                    for bullet in group])
+            S.pack_list(chunks, S.POWERUP, [
+                (*powerup.rect.topleft, powerup.speed, powerup.alpha, powerup.pulsing_down)
+                for powerup in game.powerup_group])
+        else:
+            store = game.entities
+            for name in EntityStore.COLUMNS:
+                data = getattr(store, name).tobytes()
+                chunks.append(struct.pack("<I", len(data)))
+                chunks.append(data)
+            S.pack_list(chunks, S.COUNT, [(i,) for i in store.free])
+            S.pack_list(chunks, S.COUNT, [(S.asset_id(sprite),) for sprite in store.sprites])
+
+        # Random number generator
+        version, state, gauss = random.getstate()
+        chunks.append(S.RNG.pack(version, *state, gauss is not None, gauss or 0.0))
+        return b"".join(chunks)
+
+    @staticmethod
+    def apply(game, blob):
+        '''Restores a state captured by capture() into the game.'''
+        S = GameSnapshot
+        assets = S.assets()
+        view = memoryview(blob)
+        offset = 0
+
+        def read(record):
+            nonlocal offset
+            values = record.unpack_from(view, offset)
+            offset += record.size
+            return values
+
+        def read_list(record):
+            count, = read(S.COUNT)
+            return [read(record) for _ in range(count)]
+
+        magic, version, steps, paused = read(S.HEADER)
+        if magic != S.MAGIC or version != S.VERSION:
+            raise ValueError(f"Unsupported snapshot (magic {magic!r}, version {version})")
+        clock = game.game_clock
+        clock.steps, clock.paused = steps, paused
+
+        # Game and wave state
+        (state, game.GAME_OVER, game.current_wave, game.wave_timer, game.wave_duration, game.in_wave,
+         game.enemies_spawned, game.total_waves_completed, game.last_spawn_time, game.spawn_interval,
+         width) = read(S.GAME)
+        game.current_state = list(game.states)[state]
+        if game.width != width:
+            game.set_screen_size(width)
+
+        # Player
+        (ship, alive, x, y, speed, ammo, lives, max_lives, fire_rate, bullet_speed,
+         score, previous_time) = read(S.PLAYER)
+        ship = list(game.SHIP_DATA)[ship]
+        player = Player.__new__(Player)
+        pygame.sprite.Sprite.__init__(player)
+        player.selected_ship = ship
+        player.speed, player.ammo, player.lives, player.max_lives = speed, ammo, lives, max_lives
+        player.fire_rate, player.bullet_speed, player.score = fire_rate, bullet_speed, score
+        player.type = game.SHIP_DATA[ship]["type"]
+        player.image = Player.PLAYER_SHIP_LIST[list(game.SHIP_DATA).index(ship)]
+        player.rect = player.image.get_rect(topleft=(x, y))
+        player.previous_time = previous_time
+        game.player = player
+        game.player_group.empty()
+        if alive:
+            game.player_group.add(player)
+
+        # Wave and powerup timers
+        clock.timers = {pygame.USEREVENT + event_type: [interval, due]
+                        for event_type, interval, due in read_list(S.TIMER)}
+
+        # Planets, reusing current surfaces when the generation matches
+        current = {(planet.counter, planet.angle, planet.scale): planet.image for planet in game.planet_group}
+        game.planet_group.empty()
+        for counter, angle, scale, pos_x, pos_y, layer in read_list(S.PLANET):
+            planet = Planet.__new__(Planet)
+            pygame.sprite.Sprite.__init__(planet)
+            planet.counter, planet.angle, planet.scale, planet.layer = counter, angle, scale, layer
+            planet.speed = Planet.LAYERS[layer]["speed"]
+            planet.image = current.get((counter, angle, scale)) or Planet.render_image(counter, angle, scale)
+            planet.pos_x, planet.pos_y = pos_x, pos_y
+            planet.rect = planet.image.get_rect(center=(pos_x, -planet.image.get_height()))
+            game.planet_group.add(planet)
+
+        game.effects.clear()
+        for start, x, y, sequence in read_list(S.EFFECT):
+            game.effects.start_time.append(start)
+            game.effects.pos_x.append(x)
+            game.effects.pos_y.append(y)
+            game.effects.sequence.append(sequence)
+
+        # Gameplay entities
+        backend, = read(struct.Struct("<B"))
+        if backend != S.backend(game):
+            raise ValueError("Snapshot and game use different entity backends")
+
+        if backend != S.STORE:
+            for group in (game.enemy_group, game.bullet_player_group, game.bullet_enemy_group, game.powerup_group):
+                group.empty()
+
+        if backend == S.ENGINE:
+            engine = game.enemy_engine
+            size, = read(struct.Struct("<I"))
+            engine.allocate(size)
+            for name, dtype in EnemyEngine.COLUMNS.items():
+                length = size * np.dtype(dtype).itemsize
+                getattr(engine, name)[:size] = np.frombuffer(view[offset:offset + length], dtype)
+                offset += length
+            engine.sprites, engine.images, engine.sprite_ids = [], [], {}
+            for asset, in read_list(S.COUNT):
+                engine.sprite_id(assets[asset])
+            engine.paths = []
+            for _ in range(read(S.COUNT)[0]):
+                points, = read(struct.Struct("<I"))
+                length = 2 * points * 8
+                engine.add_path(np.frombuffer(view[offset:offset + length], "f8").reshape(2, points).T)
+                offset += length
+        elif backend == S.SPRITES:
+            for (diagonal, asset, x, y, speed, speed_x, bullet_speed, speed_increase,
+                 interval, next_shot) in read_list(S.ENEMY):
+                enemy_class = DiagonalEnemy if diagonal else StandardEnemy
+                enemy = enemy_class.__new__(enemy_class)
+                pygame.sprite.Sprite.__init__(enemy)
+                enemy.image_list = enemy_class.ENEMY_IMG
+                enemy.image = assets[asset]
+                enemy.rect = enemy.image.get_rect(topleft=(x, y))
+                enemy.speed, enemy.bullet_speed, enemy.speed_increase = speed, bullet_speed, speed_increase
+                enemy.shoot_interval, enemy.next_shot_time = interval, next_shot
+                if diagonal:
+                    enemy.speed_x = speed_x
+                game.enemy_group.add(enemy)
+        elif backend == S.STORE:
+            store = game.entities
+            for name, typecode in EntityStore.COLUMNS.items():
+                size, = read(struct.Struct("<I"))
+                column = array(typecode)
+                column.frombytes(view[offset:offset + size])
+                offset += size
+                setattr(store, name, column)
+            store.free = [i for i, in read_list(S.COUNT)]
+            store.sprites = [assets[asset] for asset, in read_list(S.COUNT)]
+            store.sprite_ids = {id(sprite): i for i, sprite in enumerate(store.sprites)}
+
+        if backend != S.STORE:
+            for group in (game.bullet_player_group, game.bullet_enemy_group):
+                for x, y, speed, is_player, direction in read_list(S.BULLET):
+                    bullet = Bullet.__new__(Bullet)
+                    pygame.sprite.Sprite.__init__(bullet)
+                    bullet.speed, bullet.is_player = speed, is_player
+                    bullet.direction = S.DIRECTIONS[direction]
+                    bullet.image = Bullet.image_for(is_player, bullet.direction)
+                    bullet.rect = bullet.image.get_rect(topleft=(x, y))
+                    bullet.x, bullet.y = bullet.rect.center
+                    group.add(bullet)
+
+            for x, y, speed, alpha, pulsing_down in read_list(S.POWERUP):
+                powerup = LifePowerUp.__new__(LifePowerUp)
+                pygame.sprite.Sprite.__init__(powerup)
+                powerup.image = LifePowerUp.POWERUP_IMG
+                powerup.rect = powerup.image.get_rect(topleft=(x, y))
+                powerup.pos_x, powerup.pos_y = powerup.rect.center
+                powerup.speed, powerup.alpha, powerup.pulsing_down = speed, alpha, pulsing_down
+                game.powerup_group.add(powerup)
+
+        version, *state, has_gauss, gauss = read(S.RNG)
+        random.setstate((version, tuple(state), gauss if has_gauss else None))
+
+class ReplayArchive():
+    """
+    Append-only file of recorded sessions, read through mmap.
+    A session is its per-frame InputState records back to back plus keyframe
+    snapshots (GameSnapshot); a fixed header points at an index of sessions and of
+    keyframes by (session, frame, waves completed). Appending writes the sessions
+    and a fresh index after everything already in the file, then repoints the
+    header, so a failed append leaves the previous index in place. Each append
+    rewrites the index, so batch sessions into one append where possible.
+    Seeking to frame N of session K binary-searches the keyframe index in place,
+    restores the nearest keyframe at or before N and resimulates at most
+    ReplayRecorder.KEYFRAME_INTERVAL frames; the rest of the file is never read.
+    """
+    MAGIC = b"CCRA"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBxxxQ")   # magic, version, index offset (0 = no sessions yet)
+    INDEX = struct.Struct("<II")         # sessions, keyframes
+    SESSION = struct.Struct("<QId")      # input records offset, frames, time scale
+    KEYFRAME = struct.Struct("<IIIdQI")  # session, frame, waves completed, clock carry, offset, size
+
+    def __init__(self, filename):
+        """
+        Args:
+            filename (str): Archive file; created by the first append()
+        """
+        self.filename = filename
+        self.file = None
+        self.map = None
+        self.reload()
+
+    def reload(self):
+        '''Maps the file as it is now, including sessions appended since it was opened.'''
+        self.close()
+        self.index = self.sessions = self.keyframes = 0
+        if not path.exists(self.filename) or path.getsize(self.filename) < ReplayArchive.HEADER.size:
+            return
+        self.file = open(self.filename, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.index = ReplayArchive.HEADER.unpack_from(self.map)
+        if magic != ReplayArchive.MAGIC or version != ReplayArchive.VERSION:
+            raise ValueError(f"Unsupported replay archive (magic {magic!r}, version {version})")
+        if self.index:
+            self.sessions, self.keyframes = ReplayArchive.INDEX.unpack_from(self.map, self.index)
+
+    def append(self, recordings):
+        """
+        Adds sessions to the end of the archive.
+
+        Args:
+            recordings (list): (input records, keyframes, time scale) per session,
+                               as ReplayRecorder.recording() returns them
+
+        Returns:
+            range: The new sessions' numbers
+        """
+        A = ReplayArchive
+        self.reload()  # Another process may have appended since
+        first = self.sessions
+        with open(self.filename, "r+b" if self.map else "w+b") as file:
+            if not self.map:
+                file.write(A.HEADER.pack(A.MAGIC, A.VERSION, 0))
+            file.seek(0, os.SEEK_END)
+            sessions, keyframes = [], []
+            for session, (inputs, session_keyframes, time_scale) in enumerate(recordings, first):
+                sessions.append(A.SESSION.pack(file.tell(), len(inputs) // InputState.RECORD.size, time_scale))
+                file.write(inputs)
+                for frame, wave, carry, snapshot in session_keyframes:
+                    keyframes.append(A.KEYFRAME.pack(session, frame, wave, carry, file.tell(), len(snapshot)))
+                    file.write(snapshot)
+
+            # New index: the old tables with the new rows after them
+            index = file.tell()
+            start = self.index + A.INDEX.size
+            middle = start + self.sessions * A.SESSION.size
+            end = middle + self.keyframes * A.KEYFRAME.size
+            file.write(A.INDEX.pack(self.sessions + len(sessions), self.keyframes + len(keyframes)))
+            if self.index:
+                file.write(self.map[start:middle])
+            file.write(b"".join(sessions))
+            if self.index:
+                file.write(self.map[middle:end])
+            file.write(b"".join(keyframes))
+            file.flush()
+            os.fsync(file.fileno())
+
+            # Repoint the header only once the index is on disk
+            file.seek(0)
+            file.write(A.HEADER.pack(A.MAGIC, A.VERSION, index))
+        self.reload()
+        return range(first, self.sessions)
+
+    def session(self, session):
+        '''Returns a session's (input records offset, frames, time scale).'''
+        if not 0 <= session < self.sessions:
+            raise IndexError(f"No session {session} (archive has {self.sessions})")
+        return ReplayArchive.SESSION.unpack_from(
+            self.map, self.index + ReplayArchive.INDEX.size + session * ReplayArchive.SESSION.size)
+
+    def keyframe(self, i):
+        '''Returns keyframe index row i: (session, frame, waves completed, clock carry, offset, size).'''
+        A = ReplayArchive
+        return A.KEYFRAME.unpack_from(
+            self.map, self.index + A.INDEX.size + self.sessions * A.SESSION.size + i * A.KEYFRAME.size)
+
+    def search(self, key):
+        '''Returns how many keyframe rows sort before key, a (session, frame) or (session, wave) test.'''
+        low, high = 0, self.keyframes
+        while low < high:
+            middle = (low + high) // 2
+            if key(self.keyframe(middle)):
+                low = middle + 1
             else:
-                self.kill()  # remove the animation when it's done
+                high = middle
+        return low
 
-        '''Draw the current frame of the animation.'''
-        self.render()
+    def keyframe_before(self, session, frame):
+        '''Returns the index row of a session's last keyframe at or before frame.'''
+        i = self.search(lambda row: row[:2] <= (session, frame)) - 1
+        row = self.keyframe(i) if i >= 0 else None
+        if row is None or row[0] != session:
+            raise IndexError(f"No keyframe for session {session}")
+        return row
 
-    '''Draw the current image of the animation on the screen.'''
-    def render(self):
-        Game.instance.screen.blit(self.image, self.rect)
+    def wave_start(self, session, wave):
+        '''Returns the first frame of a session with wave waves completed.'''
+        i = self.search(lambda row: (row[0], row[2]) < (session, wave))
+        row = self.keyframe(i) if i < self.keyframes else None
+        if row is None or row[0] != session or row[2] != wave:
+            raise IndexError(f"Session {session} never completed {wave} waves")
+        return row[1]
 
-class Explosion(Animation):
-    EXP_IMG = [pygame.image.load(f"assets/explosion/exp{i}.png") for i in range (1,9)]
+    def inputs(self, session, start=0):
+        '''Yields a session's InputStates from frame start, read straight from the map.'''
+        offset, frames, _ = self.session(session)
+        size = InputState.RECORD.size
+        for frame in range(start, frames):
+            yield InputState.unpack(self.map[offset + frame * size:offset + (frame + 1) * size])
 
-    def __init__(self, pos):
-        super().__init__(Explosion.EXP_IMG, pos)
-      
-game = Game()
-game.run()
+    def seek(self, game, session, frame, quit_when_done=True):
+        """
+        Puts a game at the start of a recorded frame: restores the nearest keyframe,
+        resimulates the frames since, and leaves the session's remaining input as
+        the game's input source.
+
+        Args:
+            game (Game): Game to restore into (same entity backend as the recording)
+            session (int): Session number
+            frame (int): Frame to stop before
+            quit_when_done (bool): Quit the game when the recorded input runs out
+
+        Returns:
+            int: Frames resimulated
+        """
+        _, frames, time_scale = self.session(session)
+        if not 0 <= frame <= frames:
+            raise IndexError(f"Session {session} has {frames} frames")
+        _, key_frame, _, carry, offset, size = self.keyframe_before(session, frame)
+        GameSnapshot.apply(game, self.map[offset:offset + size])
+        game.game_clock.scale, game.game_clock.carry = time_scale, carry
+        source = ScriptedInputSource(self.inputs(session, key_frame), quit_when_done)
+        if key_frame:
+            source.previous = next(self.inputs(session, key_frame - 1))  # Key changes are relative to it
+        game.input_source = source
+        for _ in range(frame - key_frame):
+            game.simulate_frame()
+        return frame - key_frame
+
+    def close(self):
+        if self.map:
+            self.map.close()
+            self.file.close()
+        self.map = self.file = None
+
+    @staticmethod
+    def benchmark(sessions=8, frames=3600, seeks=5):
+        """
+        Records headless sessions into a scratch archive, then jumps to frames in
+        them with seek() and, for comparison, by replaying each session from its
+        first frame, checking both land on the state seen while recording.
+
+        Args:
+            sessions (int): Sessions to record
+            frames (int): Frames per session
+            seeks (int): Frames checked per session
+
+        Returns:
+            dict: Archive size, mean ms per seek and per replay from the start,
+                  mean frames resimulated by seek, and the share of seeks that
+                  matched the recording
+        """
+        def steer(seed):
+            rng = random.Random(seed)
+            frame = 0
+            while True:
+                keys = [pygame.K_a if frame // rng.randint(30, 90) % 2 else pygame.K_d]
+                if frame % 20 < 10:
+                    keys.append(pygame.K_SPACE)  # Fires, and restarts after a game over
+                yield InputState(keys)
+                frame += 1
+
+        def fingerprint(game):
+            return (game.game_clock.steps, game.current_state, game.GAME_OVER, game.player.score,
+                    game.player.lives, game.player.ammo, tuple(game.player.rect),
+                    sorted(tuple(sprite.rect) for group in (game.enemy_group, game.bullet_player_group,
+                                                            game.bullet_enemy_group, game.powerup_group)
+                           for sprite in group))
+
+        with BenchmarkRun() as run:
+            directory = tempfile.mkdtemp(prefix="cosmic-replays-")
+            archive = ReplayArchive(path.join(directory, "replays.ccra"))
+            rng = random.Random(0)
+            recordings, checks = [], []
+            for session in range(sessions):
+                random.seed(session)
+                recorder = ReplayRecorder(ScriptedInputSource(steer(session), quit_when_done=False))
+                game = run.game(recorder, headless=True, draw=False)
+                game.current_state = "PLAY"
+                targets = set(rng.sample(range(frames), seeks))
+                for frame in range(frames):
+                    if frame in targets:
+                        checks.append((session, frame, fingerprint(game)))
+                    game.simulate_frame()
+                recordings.append(recorder.recording())
+            archive.append(recordings)
+
+            seek_ms = replay_ms = resimulated = exact = 0
+            for session, frame, expected in checks:
+                game = run.game(InputSource(), headless=True, draw=False)
+                start = time.perf_counter()
+                resimulated += archive.seek(game, session, frame)
+                seek_ms += (time.perf_counter() - start) * 1000
+                exact += fingerprint(game) == expected
+
+                game = run.game(InputSource(), headless=True, draw=False)
+                start = time.perf_counter()
+                key_frame = archive.keyframe_before(session, 0)
+                GameSnapshot.apply(game, archive.map[key_frame[4]:key_frame[4] + key_frame[5]])
+                game.input_source = ScriptedInputSource(archive.inputs(session))
+                for _ in range(frame):
+                    game.simulate_frame()
+                replay_ms += (time.perf_counter() - start) * 1000
+                exact += fingerprint(game) == expected
+
+        results = {
+            "size": path.getsize(archive.filename),
+            "keyframes": archive.keyframes,
+            "seek_ms": seek_ms / len(checks),
+            "replay_ms": replay_ms / len(checks),
+            "resimulated": resimulated / len(checks),
+            "exact": exact / (2 * len(checks)),
+        }
+        archive.close()
+        shutil.rmtree(directory)
+        return results
+
+# Entry point -------------------------------------------------------------------
+class BenchmarkRun():
+    """
+    Shared setup for headless benchmarks and soaks. Games are built on emptied
+    sprite groups and record their runs in a score database in a temporary
+    directory, so benchmark restarts never reach the real leaderboard. Use as a
+    context manager; the database is removed on exit.
+    Each new game replaces the previous one, whose planet producer thread is
+    stopped then, and the last game's on exit.
+    """
+    def __enter__(self):
+        self.data = Data(tempfile.mkdtemp(prefix="cosmic-scores-"))
+        self.current = None
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.current:
+            self.current.planets.close()
+        self.data.close()
+        shutil.rmtree(self.data.data_dir)
+
+    def game(self, input_source=None, **options):
+        """Returns a new Game on empty groups, using the scratch score database."""
+        if self.current:
+            self.current.planets.close()
+        for group in Game.GROUPS:
+            group.empty()
+        self.current = Game(input_source, data=self.data, **options)
+        return self.current
+
+    @staticmethod
+    def weave():
+        """Scripted input that fires while weaving left and right every second."""
+        frame = 0
+        while True:
+            yield InputState([pygame.K_SPACE, pygame.K_a if frame // 60 % 2 else pygame.K_d])
+            frame += 1
+
+    @staticmethod
+    def keep_alive(game):
+        """Survives hits and collisions so the game keeps playing and the load keeps building."""
+        game.player.lives = game.player.max_lives
+        if game.GAME_OVER:
+            game.GAME_OVER = False
+            game.player_group.add(game.player)
+
+def measure_startup():
+    """
+    Times each cold start phase after import, in this process.
+
+    Returns:
+        dict: Phase name -> milliseconds
+    """
+    marks = [("imports", STARTUP_MARKS["start"], STARTUP_MARKS["imports"]),
+             ("module body", STARTUP_MARKS["imports"], STARTUP_MARKS["module body"])]
+
+    def phase(name, action):
+        start = time.perf_counter()
+        result = action()
+        marks.append((name, start, time.perf_counter()))
+        return result
+
+    phase("init subsystems", lambda: init_pygame("play"))
+    phase("open display", lambda: pygame.display.set_mode((400, 600)))
+    phase("load fonts", lambda: LazyAsset.load_all("font"))
+    phase("load images", lambda: LazyAsset.load_all("image"))
+    phase("load data", lambda: LazyAsset.load_all("data"))
+    game = phase("construct game", Game)
+
+    def first_frame():
+        game.process_events()
+        game.global_UI_elements()
+        game.states[game.current_state][0]()
+        pygame.display.update()
+    phase("first frame", first_frame)
+    pygame.quit()
+    return {name: (end - start) * 1000 for name, start, end in marks}
+
+def benchmark_startup(runs=5):
+    """
+    Measures cold start by phase, each run in a fresh interpreter.
+    "interpreter" is the process time not covered by the measured phases.
+
+    Returns:
+        dict: Phase name -> mean milliseconds
+    """
+    totals = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, path.abspath(__file__), "--measure-startup"],
+                                capture_output=True, text=True, check=True).stdout
+        wall = (time.perf_counter() - start) * 1000
+        phases = json.loads(output.strip().splitlines()[-1])
+        phases["interpreter"] = wall - sum(phases.values())
+        for name, ms in phases.items():
+            totals[name] = totals.get(name, 0) + ms
+    return {name: ms / runs for name, ms in totals.items()}
+
+def benchmark_scaling(scales=(1, 2, 3), frames=120):
+    """
+    Measures gameplay frame cost (update, draw and present) at each window scale.
+    The game always draws at logical size, so only presenting should grow.
+
+    Returns:
+        dict: Scale -> (mean ms per frame, mean ms presenting)
+    """
+    results = {}
+    with BenchmarkRun() as run:
+        for scale in scales:
+            game = run.game(scale=scale, quality_scaling=False)
+            game.current_state = "PLAY"
+            random.seed(0)
+            total = present = 0
+            for _ in range(frames):
+                start = time.perf_counter()
+                game.process_events()
+                game.global_UI_elements()
+                game.play()
+                presented = time.perf_counter()
+                game.present()
+                end = time.perf_counter()
+                total += end - start
+                present += end - presented
+            results[scale] = (total * 1000 / frames, present * 1000 / frames)
+    return results
+
+def benchmark_background(sizes=(1200, 2400, 4800), frames=300):
+    """
+    Times drawing the scrolling background each frame: blitting the whole source
+    image at a fractional offset, as the game used to, against ScrollingBackground
+    tiles, for sources of several sizes cut from the game's background.
+
+    Returns:
+        dict: Source size -> (whole image ms/frame, tiled ms/frame)
+    """
+    screen = pygame.display.set_mode((400, 600))
+    results = {}
+    for size in sizes:
+        source = pygame.Surface((size, size), pygame.SRCALPHA)
+        for x in range(0, size, Game.BG_IMG["BG"].get_width()):
+            for y in range(0, size, Game.BG_IMG["BG"].get_height()):
+                source.blit(Game.BG_IMG["BG"], (x, y))
+        source = display_format(source)
+        y = -size / 2
+        start = time.perf_counter()
+        for _ in range(frames):
+            screen.blit(source, (-size / 3, y))
+            y = y + 0.5 if y < 0 else -size / 2
+        whole = (time.perf_counter() - start) * 1000 / frames
+
+        background = ScrollingBackground([{"image": source, "speed": 0.5}])
+        background.render(screen, 400)  # Cut the tile outside the timing
+        start = time.perf_counter()
+        for _ in range(frames):
+            background.render(screen, 400)
+            background.scroll()
+        results[size] = (whole, (time.perf_counter() - start) * 1000 / frames)
+    return results
+
+def benchmark_hud(ammo_counts=(0, 10, 30), frames=600):
+    """
+    Plays gameplay frames with the ammo held at several counts, shown by the HUD
+    counter and, for comparison, the way the HUD used to show it: one zero-speed
+    Bullet per round in bullet_player_group, so every player bullet's collision
+    check also tested the HUD rounds. The player doesn't fire, so only the old
+    HUD puts anything in that group. Drawing is clipped away (draw=False) so the
+    frame times are the simulation's.
+    The counter passes if its cost stays flat, rising from the fewest to the most
+    rounds by under a quarter of what the old HUD's does with nothing added to the
+    group, and if it draws the same pixels as the old HUD's rounds at every count.
+
+    Returns:
+        tuple: (HUD, ammo) -> (mean player bullet group size, mean ms per frame),
+               whether the counter stays flat, ammo counts whose pixels differ
+    """
+    results = {}
+    with BenchmarkRun() as run:
+        for hud in ("counter", "sprites"):
+            for ammo in ammo_counts:
+                random.seed(0)
+                game = run.game(InputSource(), headless=True, draw=False, quality_scaling=False)
+                game.current_state = "PLAY"
+                for x in range(50, 400, 70):
+                    game.enemy_group.add(StandardEnemy(x, 100))
+                if hud == "sprites":
+                    for i in range(ammo):  # Laid out as the old initialise_bullets did
+                        game.bullet_player_group.add(Bullet(game.player.rect, 465 + i // 6 * 40, 470 + i % 6 * 15, 0))
+                group_size = elapsed = 0
+                for _ in range(frames):
+                    game.player.ammo = ammo
+                    start = time.perf_counter()
+                    game.simulate_frame()
+                    elapsed += time.perf_counter() - start
+                    group_size += len(game.bullet_player_group)
+                    run.keep_alive(game)
+                results[hud, ammo] = (group_size / frames, elapsed * 1000 / frames)
+
+        # Pixels, at every count the HUD shows (ammo tops out at 30)
+        game = run.game(headless=True, draw=False)
+        mismatched = []
+        for ammo in range(31):
+            old, new = pygame.Surface((700, 600)), pygame.Surface((700, 600))
+            rounds = [Bullet(game.player.rect, 465 + i // 6 * 40, 470 + i % 6 * 15, 0) for i in range(ammo)]
+            old.blits([(bullet.image, bullet.rect) for bullet in rounds], False)
+            game.ammo_counter.render(new, ammo)
+            if pygame.image.tobytes(old, "RGB") != pygame.image.tobytes(new, "RGB"):
+                mismatched.append(ammo)
+
+    low, high = min(ammo_counts), max(ammo_counts)
+    growth = {hud: results[hud, high][1] - results[hud, low][1] for hud in ("counter", "sprites")}
+    flat = (all(results["counter", ammo][0] == 0 for ammo in ammo_counts)
+            and growth["counter"] < growth["sprites"] / 4)
+    return results, flat, mismatched
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Cosmic Conflict")
+    parser.add_argument("--benchmark", choices=["startup", "memory", "telemetry", "pacing", "scaling", "enemies", "hud", "capture", "netplay", "replay", "background", "stress"], help="run a benchmark and print the results")
+    parser.add_argument("--telemetry", metavar="DIR", help="log gameplay events to DIR")
+    parser.add_argument("--capture", metavar="DIR", help="record presented frames to DIR")
+    parser.add_argument("--capture-encoder", choices=["auto", "png", "pipe"], default="auto",
+                        help="PNG sequence, or raw frames piped to ffmpeg")
+    parser.add_argument("--capture-policy", choices=["drop", "block"], default="drop",
+                        help="drop frames or wait when encoding falls behind")
+    parser.add_argument("--memory-profile", metavar="DIR",
+                        help="write tracemalloc reports at wave transitions to DIR/memory.txt")
+    parser.add_argument("--soak", type=int, metavar="WAVES",
+                        help="play WAVES waves headless with memory profiling and check memory stays bounded")
+    parser.add_argument("--stress", action="store_true",
+                        help="play endless stress waves and print frame costs and capacity on exit")
+    parser.add_argument("--stress-curve", action="append", default=[], metavar="NAME=SHAPE:START:RATE:LIMIT",
+                        help="override a stress curve (enemies, shoot_interval, bullet_speed, enemy_speed)")
+    parser.add_argument("--record-replay", metavar="ARCHIVE",
+                        help="append this session to the replay archive ARCHIVE on exit")
+    parser.add_argument("--replay", metavar="ARCHIVE", help="watch a session from a replay archive")
+    parser.add_argument("--session", type=int, default=-1,
+                        help="session to replay (negative counts back from the newest)")
+    parser.add_argument("--frame", type=int, default=0, help="frame to start the replay at")
+    parser.add_argument("--wave", type=int, help="start the replay when this many waves are completed")
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="run a headless co-op server on UDP PORT")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="join a co-op server")
+    parser.add_argument("--slot", type=int, choices=range(NetServer.SLOTS), default=0,
+                        help="co-op slot to play (0 lead, 1 wingman)")
+    parser.add_argument("--host", default="127.0.0.1", help="address the co-op server listens on")
+    parser.add_argument("--net-latency", type=float, default=0, metavar="MS",
+                        help="simulated one-way delay on sent datagrams")
+    parser.add_argument("--net-jitter", type=float, default=0, metavar="MS",
+                        help="simulated random delay either side of the latency")
+    parser.add_argument("--net-loss", type=float, default=0, metavar="FRACTION",
+                        help="simulated share of sent datagrams dropped")
+    parser.add_argument("--watch-config", action="store_true",
+                        help="reload ship data and game text when their files change")
+    parser.add_argument("--vector-enemies", action="store_true", help="move enemies with the NumPy engine")
+    parser.add_argument("--entity-store", action="store_true",
+                        help="keep enemies, bullets and powerups in the array-backed entity store")
+    parser.add_argument("--scale", type=int, default=1, help="integer window scale")
+    parser.add_argument("--scale-mode", choices=["transform", "sdl"], default="transform",
+                        help="scale with transform.scale or a pygame.SCALED window")
+    parser.add_argument("--pacing", choices=FramePacer.MODES, default="coarse", help="frame pacing mode")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="simulation speed (0.5 slow motion, 4 fast-forward)")
+    parser.add_argument("--no-quality-scaling", action="store_true",
+                        help="never shed optional work when frames run over budget")
+    parser.add_argument("--telemetry-format", choices=list(Telemetry.EXTENSIONS), default="jsonl",
+                        help="telemetry file format")
+    parser.add_argument("--measure-startup", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    try:
+        curves = dict(StressMode.parse_curve(text) for text in args.stress_curve)
+        stress = StressMode(curves) if args.stress else None
+    except ValueError as error:
+        parser.error(str(error))
+    if args.entity_store and args.vector_enemies:
+        parser.error("choose either --entity-store or --vector-enemies")
+    if stress and (args.vector_enemies or args.entity_store):
+        parser.error("--stress counts the sprite groups' collision checks; drop --vector-enemies and --entity-store")
+
+    if args.measure_startup:
+        print(json.dumps(measure_startup()))
+    elif args.soak:
+        init_pygame("headless")
+        directory = args.memory_profile or tempfile.mkdtemp(prefix="cosmic-soak-")
+        profiler = MemoryProfiler.soak(directory, args.soak)
+        ok, growth, growing = profiler.bounded()
+        print(f"{len(profiler.traced)} waves  traced {profiler.traced[0] / 1024:.1f} -> {profiler.traced[-1] / 1024:.1f} KiB  "
+              f"growth after warmup {growth / 1024:.1f} KiB (limit {MemoryProfiler.LIMIT / 1024:.0f} KiB)")
+        print("final groups: " + "  ".join(f"{name} {counts[-1]}" for name, counts in profiler.counts.items()))
+        if growing:
+            print("still growing: " + ", ".join(growing))
+        print(f"report: {profiler.filename}")
+        sys.exit(0 if ok else 1)
+    elif args.replay:
+        init_pygame("play")
+        archive = ReplayArchive(args.replay)
+        if not archive.sessions:
+            parser.error(f"{args.replay} holds no sessions")
+        session = args.session % archive.sessions
+        frame = args.frame if args.wave is None else archive.wave_start(session, args.wave)
+        game = Game(pacing=args.pacing, scale=args.scale, scale_mode=args.scale_mode)
+        archive.seek(game, session, frame)
+        game.run()
+        archive.close()
+    elif args.serve is not None:
+        init_pygame("headless")
+        server = NetServer(args.host, args.serve, latency_ms=args.net_latency,
+                           jitter_ms=args.net_jitter, loss=args.net_loss)
+        game = Game(server, headless=True, time_scale=args.time_scale, draw=False)
+        game.current_state = "PLAY"
+        print(f"serving on {server.address[0]}:{server.address[1]}")
+        try:
+            server.serve(game)
+        except KeyboardInterrupt:
+            pass
+        stats = server.stats()
+        print(f"{stats['ticks']} ticks  {stats['bytes_per_tick']:.1f} bytes/tick  "
+              f"{stats['tick_ms']:.3f} ms/tick (worst {stats['worst_tick_ms']:.3f}, encoding {stats['encode_ms']:.3f})")
+        server.close()
+    elif args.connect:
+        init_pygame("play")
+        host, port = args.connect.rsplit(":", 1)
+        NetClient((host, int(port)), args.slot, latency_ms=args.net_latency,
+                  jitter_ms=args.net_jitter, loss=args.net_loss).play()
+        pygame.quit()
+    elif args.benchmark == "startup":
+        for name, ms in benchmark_startup().items():
+            print(f"{name:<16} {ms:8.2f} ms")
+    elif args.benchmark == "memory":
+        init_pygame("headless")
+        with BenchmarkRun() as run:
+            run.game(headless=True)
+            for name, size in EntityStore.benchmark_memory().items():
+                print(f"{name:<16} {size:8.1f} bytes/entity")
+    elif args.benchmark == "telemetry":
+        init_pygame("headless")
+        for format, (ms, size) in Telemetry.benchmark().items():
+            verdict = "within" if ms <= Telemetry.BUDGET_MS else "OVER"
+            print(f"{format:<16} {ms:8.4f} ms/frame ({verdict} {Telemetry.BUDGET_MS} ms budget) {size:6.2f} bytes/event")
+    elif args.benchmark == "pacing":
+        init_pygame("headless")
+        for mode, stats in FramePacer.benchmark().items():
+            print(f"{mode:<16} mean {stats['mean']:6.2f} ms  jitter {stats['jitter']:5.2f} ms  "
+                  f"worst {stats['worst']:6.2f} ms  late {stats['late']:5.1%}")
+    elif args.benchmark == "enemies":
+        init_pygame("headless")
+        with BenchmarkRun() as run:
+            run.game(headless=True)
+            for count, t in EnemyEngine.benchmark().items():
+                print(f"{count:<5} enemies  sprites {t['sprites', 'frame']:7.2f} ms/frame ({t['sprites', 'logic']:6.2f} logic)"
+                      f"  engine {t['engine', 'frame']:7.2f} ms/frame ({t['engine', 'logic']:6.2f} logic)"
+                      f"  speedup {t['sprites', 'frame'] / t['engine', 'frame']:.2f}x frame, "
+                      f"{t['sprites', 'logic'] / t['engine', 'logic']:.2f}x logic")
+    elif args.benchmark == "hud":
+        init_pygame("headless")
+        results, flat, mismatched = benchmark_hud()
+        for (hud, ammo), (group_size, ms) in results.items():
+            print(f"{hud:<8} ammo {ammo:<3} {ms:8.3f} ms/frame ({group_size:.0f} player bullets)")
+        print(f"counter cost {'flat' if flat else 'GROWS'} as ammo grows; pixels "
+              + (f"DIFFER from the old HUD at ammo {mismatched}" if mismatched else "match the old HUD at every count"))
+        sys.exit(0 if flat and not mismatched else 1)
+    elif args.benchmark == "capture":
+        init_pygame("headless")
+        with BenchmarkRun() as run:
+            run.game(headless=True).current_state = "PLAY"
+            for method, stats in FrameCapture.benchmark().items():
+                line = f"{method:<16} {stats['frame_ms']:8.3f} ms/frame on the game thread"
+                if "frames" in stats:
+                    line += (f"  (copy {stats['mean_ms']:.3f} ms, worst {stats['worst_ms']:.3f} ms, "
+                             f"{stats['dropped']}/{stats['frames']} dropped)")
+                print(line)
+    elif args.benchmark == "netplay":
+        init_pygame("headless")
+        for (latency, jitter, loss), result in NetServer.benchmark().items():
+            server = result["server"]
+            lost = sum(client["lost"] for client in result["clients"])
+            stalls = sum(client["stalls"] for client in result["clients"])
+            print(f"{latency:>3}±{jitter:<3}ms {loss:4.0%} loss  {server['bytes_per_snapshot']:6.1f} bytes/snapshot "
+                  f"({result['whole_bytes']:.1f} whole, {server['whole']} sent whole)  "
+                  f"{server['bytes_per_tick']:6.1f} bytes/tick  {server['tick_ms']:.3f} ms/tick "
+                  f"({server['encode_ms']:.3f} encoding)  lost {lost}  stalls {stalls}  exact {result['exact']:.0%}")
+    elif args.benchmark == "replay":
+        init_pygame("headless")
+        results = ReplayArchive.benchmark()
+        print(f"archive {results['size'] / 1024:.1f} KiB, {results['keyframes']} keyframes")
+        print(f"seek               {results['seek_ms']:8.2f} ms ({results['resimulated']:.0f} frames resimulated)")
+        print(f"replay from start  {results['replay_ms']:8.2f} ms")
+        print(f"matched the recording {results['exact']:.0%}")
+    elif args.benchmark == "background":
+        init_pygame("play")
+        for size, (whole, tiled) in benchmark_background().items():
+            print(f"{size}x{size} source  whole image {whole:7.3f} ms/frame  tiles {tiled:7.3f} ms/frame")
+    elif args.benchmark == "stress":
+        init_pygame("play")
+        for line in StressMode.benchmark(curves).report():
+            print(line)
+    elif args.benchmark == "scaling":
+        init_pygame("play")
+        for scale, (frame_ms, present_ms) in benchmark_scaling().items():
+            print(f"{scale}x{'':<14} {frame_ms:8.2f} ms/frame  ({present_ms:.2f} ms presenting)")
+    else:
+        init_pygame("play")
+        telemetry = Telemetry(args.telemetry, args.telemetry_format) if args.telemetry else None
+        memory_profiler = MemoryProfiler(args.memory_profile) if args.memory_profile else None
+        capture = FrameCapture(args.capture, args.capture_encoder, args.capture_policy) if args.capture else None
+        recorder = ReplayRecorder(LiveInputSource()) if args.record_replay else None
+        Game(recorder, telemetry=telemetry, memory_profiler=memory_profiler, capture=capture, watch_config=args.watch_config,
+             pacing=args.pacing, quality_scaling=not args.no_quality_scaling,
+             scale=args.scale, scale_mode=args.scale_mode, vector_enemies=args.vector_enemies,
+             entity_store=args.entity_store, time_scale=args.time_scale, stress=stress).run()
+        if stress:
+            for line in stress.report():
+                print(line)
+        if recorder:
+            archive = ReplayArchive(args.record_replay)
+            session, = archive.append([recorder.recording()])
+            archive.close()
+            print(f"recorded session {session} ({len(recorder.frames)} frames) in {args.record_replay}")
+        if capture:
+            stats = capture.stats()
+            print(f"captured {stats['written']} of {stats['frames']} frames ({stats['dropped']} dropped, "
+                  f"{stats['failed']} failed), "
+                  f"{stats['mean_ms']:.3f} ms/frame overhead (worst {stats['worst_ms']:.3f} ms)")
+
+STARTUP_MARKS["module body"] = time.perf_counter()
+
+if __name__ == "__main__":
+    main()